@@ -5,6 +5,7 @@ from sqlalchemy import engine_from_config, pool
 
 import app.models.customer  # noqa: F401
 import app.models.import_job  # noqa: F401
+import app.models.task_outbox  # noqa: F401
 import app.models.user  # noqa: F401
 from app.core.config import settings
 from app.db.base import Base
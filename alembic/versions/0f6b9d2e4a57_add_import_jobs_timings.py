@@ -0,0 +1,27 @@
+"""add import_jobs timings
+
+Revision ID: 0f6b9d2e4a57
+Revises: b8e05f3a1d96
+Create Date: 2026-10-19 19:44:58.210377
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = '0f6b9d2e4a57'
+down_revision = 'b8e05f3a1d96'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "import_jobs",
+        sa.Column("timings",
+                  postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("import_jobs", "timings")
@@ -0,0 +1,48 @@
+"""add export_jobs
+
+Revision ID: 2f7c4a9e1b68
+Revises: 8b2e5c1f7a93
+Create Date: 2026-10-20 12:41:05.873216
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = '2f7c4a9e1b68'
+down_revision = '8b2e5c1f7a93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    job_status = postgresql.ENUM(name='job_status', create_type=False)
+    op.create_table(
+        'export_jobs',
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('user_id', sa.Uuid(), nullable=False),
+        sa.Column('status', job_status, nullable=False),
+        sa.Column('filters', postgresql.JSONB(astext_type=sa.Text()),
+                  nullable=False),
+        sa.Column('gzip', sa.Boolean(), nullable=False,
+                  server_default=sa.false()),
+        sa.Column('object_key', sa.String(length=1024), nullable=True),
+        sa.Column('exported_rows', sa.BigInteger(), nullable=False,
+                  server_default='0'),
+        sa.Column('bytes_written', sa.BigInteger(), nullable=False,
+                  server_default='0'),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True),
+                  server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'],
+                                ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_export_jobs_user_id_created_at_id', 'export_jobs',
+                    ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_export_jobs_user_id_created_at_id',
+                  table_name='export_jobs')
+    op.drop_table('export_jobs')
@@ -0,0 +1,60 @@
+"""uuid v7 primary keys
+
+Revision ID: 3d0c8be41f72
+Revises: 9374cd5419cf
+Create Date: 2026-10-19 11:40:27.905113
+
+Новые строки customers/import_jobs получают time-ordered UUIDv7.
+Существующие uuid4 ключи не переписываются (тип колонки тот же, FK не
+трогаем): они остаются "слева" в индексе, а все новые вставки идут в его
+правый край. Для уплотнения старого индекса достаточно REINDEX.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '3d0c8be41f72'
+down_revision = '9374cd5419cf'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # uuid v4 от gen_random_uuid() + 48 бит unix ms в начале;
+    # биты 52/53 превращают версию 0100 в 0111.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION uuid_generate_v7() RETURNS uuid AS $$
+          SELECT encode(
+            set_bit(
+              set_bit(
+                overlay(uuid_send(gen_random_uuid())
+                        placing substring(int8send(floor(
+                          extract(epoch from clock_timestamp()) * 1000
+                        )::bigint) from 3)
+                        from 1 for 6),
+                52, 1),
+              53, 1),
+            'hex')::uuid
+        $$ LANGUAGE sql VOLATILE PARALLEL SAFE;
+        """
+    )
+    op.alter_column(
+        "customers",
+        "id",
+        server_default=sa.text("uuid_generate_v7()"),
+    )
+    op.alter_column(
+        "import_jobs",
+        "id",
+        server_default=sa.text("uuid_generate_v7()"),
+    )
+
+
+def downgrade() -> None:
+    op.alter_column("import_jobs", "id", server_default=None)
+    op.alter_column(
+        "customers",
+        "id",
+        server_default=sa.text("gen_random_uuid()"),
+    )
+    op.execute("DROP FUNCTION IF EXISTS uuid_generate_v7()")
@@ -0,0 +1,25 @@
+"""add import_jobs file_size
+
+Revision ID: 4c8a1e7f9b20
+Revises: 0f6b9d2e4a57
+Create Date: 2026-10-19 21:07:36.918244
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '4c8a1e7f9b20'
+down_revision = '0f6b9d2e4a57'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "import_jobs",
+        sa.Column("file_size", sa.BigInteger(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("import_jobs", "file_size")
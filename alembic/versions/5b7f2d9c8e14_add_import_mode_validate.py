@@ -0,0 +1,32 @@
+"""add import_mode validate
+
+Revision ID: 5b7f2d9c8e14
+Revises: c41e9a07d5b3
+Create Date: 2026-10-19 14:21:09.187342
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '5b7f2d9c8e14'
+down_revision = 'c41e9a07d5b3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TYPE import_mode ADD VALUE IF NOT EXISTS 'validate'")
+    op.add_column(
+        "import_jobs",
+        sa.Column("would_insert_rows", sa.Integer(), nullable=True),
+    )
+    op.add_column(
+        "import_jobs",
+        sa.Column("would_update_rows", sa.Integer(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    # значение enum в Postgres удалить нельзя, оставляем 'validate'
+    op.drop_column("import_jobs", "would_update_rows")
+    op.drop_column("import_jobs", "would_insert_rows")
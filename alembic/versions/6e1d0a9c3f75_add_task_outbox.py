@@ -0,0 +1,41 @@
+"""add task_outbox
+
+Revision ID: 6e1d0a9c3f75
+Revises: 4c8a1e7f9b20
+Create Date: 2026-10-19 21:52:13.406128
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = '6e1d0a9c3f75'
+down_revision = '4c8a1e7f9b20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'task_outbox',
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('task_name', sa.String(length=255), nullable=False),
+        sa.Column('args', postgresql.JSONB(astext_type=sa.Text()),
+                  nullable=False),
+        sa.Column('queue', sa.String(length=255), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True),
+                  server_default=sa.text('now()'), nullable=False),
+        sa.Column('available_at', sa.DateTime(timezone=True),
+                  server_default=sa.text('now()'), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False,
+                  server_default='0'),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_task_outbox_available_at_id', 'task_outbox',
+                    ['available_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_task_outbox_available_at_id', table_name='task_outbox')
+    op.drop_table('task_outbox')
@@ -0,0 +1,51 @@
+"""add import_jobs content_sha256
+
+Revision ID: 7ad3c15e62f8
+Revises: e2a6f47b90c1
+Create Date: 2026-10-19 17:02:44.730915
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '7ad3c15e62f8'
+down_revision = 'e2a6f47b90c1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "import_jobs",
+        sa.Column("content_sha256", sa.String(length=64), nullable=True),
+    )
+    op.add_column(
+        "import_jobs",
+        sa.Column("duplicate_of_id", sa.Uuid(), nullable=True),
+    )
+    op.create_foreign_key(
+        "fk_import_jobs_duplicate_of_id_import_jobs",
+        "import_jobs",
+        "import_jobs",
+        ["duplicate_of_id"],
+        ["id"],
+        ondelete="SET NULL",
+    )
+    op.create_index(
+        "ix_import_jobs_user_id_content_sha256",
+        "import_jobs",
+        ["user_id", "content_sha256"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_import_jobs_user_id_content_sha256",
+                  table_name="import_jobs")
+    op.drop_constraint(
+        "fk_import_jobs_duplicate_of_id_import_jobs",
+        "import_jobs",
+        type_="foreignkey",
+    )
+    op.drop_column("import_jobs", "duplicate_of_id")
+    op.drop_column("import_jobs", "content_sha256")
@@ -0,0 +1,36 @@
+"""add customers search indexes
+
+Revision ID: 8b2e5c1f7a93
+Revises: d3f81b6a2c49
+Create Date: 2026-10-20 10:14:37.218904
+
+"""
+from alembic import op
+
+revision = '8b2e5c1f7a93'
+down_revision = 'd3f81b6a2c49'
+branch_labels = None
+depends_on = None
+
+# CONCURRENTLY: таблица большая, обычный CREATE INDEX заблокирует запись
+# импортов на всё время построения
+INDEXES = {
+    'ix_customers_created_at_id': '(created_at, id)',
+    'ix_customers_email_lower_pattern': '(lower(email) text_pattern_ops)',
+    'ix_customers_last_name_lower_pattern':
+        '(lower(last_name) text_pattern_ops)',
+    'ix_customers_city_lower_created_at_id': '(lower(city), created_at, id)',
+}
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES.items():
+            op.execute(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} '
+                       f'ON customers {columns}')
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
@@ -0,0 +1,26 @@
+"""customers.id server default
+
+Revision ID: 9374cd5419cf
+Revises: 1380f78acb9c
+Create Date: 2026-10-19 10:12:04.318274
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '9374cd5419cf'
+down_revision = '1380f78acb9c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.alter_column(
+        "customers",
+        "id",
+        server_default=sa.text("gen_random_uuid()"),
+    )
+
+
+def downgrade() -> None:
+    op.alter_column("customers", "id", server_default=None)
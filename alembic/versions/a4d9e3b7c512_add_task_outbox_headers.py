@@ -0,0 +1,26 @@
+"""add task_outbox headers
+
+Revision ID: a4d9e3b7c512
+Revises: 2f7c4a9e1b68
+Create Date: 2026-10-20 15:06:22.419530
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = 'a4d9e3b7c512'
+down_revision = '2f7c4a9e1b68'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('task_outbox',
+                  sa.Column('headers',
+                            postgresql.JSONB(astext_type=sa.Text()),
+                            nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('task_outbox', 'headers')
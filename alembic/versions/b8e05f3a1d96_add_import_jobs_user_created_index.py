@@ -0,0 +1,28 @@
+"""add import_jobs (user_id, created_at, id) index
+
+Revision ID: b8e05f3a1d96
+Revises: 7ad3c15e62f8
+Create Date: 2026-10-19 18:30:12.664021
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'b8e05f3a1d96'
+down_revision = '7ad3c15e62f8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_import_jobs_user_id_created_at_id",
+        "import_jobs",
+        ["user_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_import_jobs_user_id_created_at_id",
+                  table_name="import_jobs")
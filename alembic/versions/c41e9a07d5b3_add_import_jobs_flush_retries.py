@@ -0,0 +1,27 @@
+"""add import_jobs flush_retries
+
+Revision ID: c41e9a07d5b3
+Revises: 3d0c8be41f72
+Create Date: 2026-10-19 13:05:51.442190
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'c41e9a07d5b3'
+down_revision = '3d0c8be41f72'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "import_jobs",
+        sa.Column("flush_retries", sa.Integer(),
+                  nullable=False, server_default="0"),
+    )
+    op.alter_column("import_jobs", "flush_retries", server_default=None)
+
+
+def downgrade() -> None:
+    op.drop_column("import_jobs", "flush_retries")
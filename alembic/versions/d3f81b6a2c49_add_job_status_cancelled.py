@@ -0,0 +1,22 @@
+"""add job_status cancelled
+
+Revision ID: d3f81b6a2c49
+Revises: 6e1d0a9c3f75
+Create Date: 2026-10-19 23:18:40.552913
+
+"""
+from alembic import op
+
+revision = 'd3f81b6a2c49'
+down_revision = '6e1d0a9c3f75'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TYPE job_status ADD VALUE IF NOT EXISTS 'cancelled'")
+
+
+def downgrade() -> None:
+    # значение enum в Postgres удалить нельзя, оставляем 'cancelled'
+    pass
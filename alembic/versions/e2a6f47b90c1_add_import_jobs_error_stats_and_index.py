@@ -0,0 +1,33 @@
+"""add import_jobs error stats and report index
+
+Revision ID: e2a6f47b90c1
+Revises: 5b7f2d9c8e14
+Create Date: 2026-10-19 15:48:33.501726
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = 'e2a6f47b90c1'
+down_revision = '5b7f2d9c8e14'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "import_jobs",
+        sa.Column("error_report_index_key",
+                  sa.String(length=1024), nullable=True),
+    )
+    op.add_column(
+        "import_jobs",
+        sa.Column("error_stats",
+                  postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("import_jobs", "error_stats")
+    op.drop_column("import_jobs", "error_report_index_key")
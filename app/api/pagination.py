@@ -0,0 +1,28 @@
+"""Keyset-пагинация по (created_at, id).
+
+cursor — base64 от последней отданной строки; следующий запрос продолжает
+строго после неё по индексу, без OFFSET.
+"""
+import base64
+import binascii
+import uuid
+from datetime import datetime
+from http import HTTPStatus
+
+from fastapi import HTTPException
+
+
+def encode_cursor(created_at: datetime, row_id: uuid.UUID) -> str:
+    raw = f'{created_at.isoformat()}|{row_id}'
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """Ошибки: HTTPStatus.BAD_REQUEST (400) для битого cursor."""
+    try:
+        created_at, row_id = (
+            base64.urlsafe_b64decode(cursor.encode()).decode().split('|'))
+        return datetime.fromisoformat(created_at), uuid.UUID(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST,
+                            detail='invalid cursor')
@@ -0,0 +1,73 @@
+from http import HTTPStatus
+
+import sqlalchemy as sa
+from fastapi import APIRouter, Depends, HTTPException, Query
+from psycopg.errors import QueryCanceled
+from sqlalchemy import select, tuple_
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_current_user
+from app.api.pagination import decode_cursor, encode_cursor
+from app.api.routers.serializers import customer_to_dict
+from app.core.config import settings
+from app.core.customer_search import filter_customers
+from app.db.session import get_db
+from app.models.customer import Customer
+from app.models.user import User
+
+router = APIRouter(prefix='/customers', tags=['customers'])
+
+
+def _set_query_budget(db: Session) -> None:
+    # custom plan: с generic-планом LIKE по параметру не использует индекс
+    db.execute(sa.text(
+        "SELECT set_config('statement_timeout', :timeout, true), "
+        "set_config('plan_cache_mode', 'force_custom_plan', true)"),
+        {'timeout': str(settings.customers_query_timeout_ms)})
+
+
+@router.get('')
+def list_customers(email_prefix: str | None = Query(None, max_length=320),
+                   last_name: str | None = Query(None, max_length=150),
+                   city: str | None = Query(None, max_length=128),
+                   cursor: str | None = Query(None),
+                   limit: int = Query(50, ge=1, le=500),
+                   user: User = Depends(get_current_user),
+                   db: Session = Depends(get_db)) -> dict:
+    """Поиск клиентов, новые первыми.
+
+    email_prefix и last_name — префикс без учёта регистра, city — точное
+    совпадение без учёта регистра; фильтры объединяются через AND.
+    Keyset-пагинация по (created_at, id), как в GET /imports.
+    Ошибки: HTTPStatus.SERVICE_UNAVAILABLE (503), если запрос не уложился
+    в CUSTOMERS_QUERY_TIMEOUT_MS — нужно сузить фильтры.
+    """
+    stmt = filter_customers(
+        select(Customer)
+        .order_by(Customer.created_at.desc(), Customer.id.desc())
+        .limit(limit + 1),
+        email_prefix=email_prefix, last_name=last_name, city=city)
+    if cursor:
+        stmt = stmt.where(
+            tuple_(Customer.created_at, Customer.id)
+            < tuple_(*decode_cursor(cursor)))
+
+    _set_query_budget(db)
+    try:
+        customers = db.execute(stmt).scalars().all()
+    except OperationalError as error:
+        if not isinstance(error.orig, QueryCanceled):
+            raise
+        raise HTTPException(status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+                            detail='query timeout, narrow the filters')
+
+    next_cursor = None
+    if len(customers) > limit:
+        last = customers[limit - 1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return {
+        'items': [customer_to_dict(customer)
+                  for customer in customers[:limit]],
+        'next_cursor': next_cursor,
+    }
@@ -0,0 +1,86 @@
+import uuid
+from http import HTTPStatus
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_current_user
+from app.api.routers.serializers import export_to_dict
+from app.api.schemas import ExportIn
+from app.core.celery_client import EXPORTS_QUEUE
+from app.core.ids import uuid7
+from app.core.outbox import enqueue_task
+from app.db.session import get_db
+from app.models.export_job import ExportJob
+from app.models.import_job import JobStatus
+from app.models.user import User
+from app.storage.s3 import presign_get
+
+router = APIRouter(prefix='/exports', tags=['exports'])
+
+
+def _get_export(db: Session, job_id: uuid.UUID, user: User) -> ExportJob:
+    job = db.get(ExportJob, job_id)
+    if job is None or job.user_id != user.id:
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND,
+                            detail='not found')
+    return job
+
+
+@router.post('', status_code=HTTPStatus.CREATED)
+def create_export(data: ExportIn,
+                  user: User = Depends(get_current_user),
+                  db: Session = Depends(get_db)) -> dict:
+    """Создаёт export job; файл собирает воркер (worker.exports).
+
+    Фильтры те же, что у GET /customers; пустые не сохраняются.
+    Задача ставится через outbox в одной транзакции с job.
+    """
+    filters = data.model_dump(exclude={'gzip'}, exclude_none=True)
+    job = ExportJob(id=uuid7(),
+                    user_id=user.id,
+                    status=JobStatus.pending,
+                    filters=filters,
+                    gzip=data.gzip,
+                    exported_rows=0,
+                    bytes_written=0)
+    db.add(job)
+    enqueue_task(db, 'process_export', args=[str(job.id)],
+                 queue=EXPORTS_QUEUE)
+    db.commit()
+    db.refresh(job)
+    return jsonable_encoder(export_to_dict(job))
+
+
+@router.get('/{job_id}')
+def get_export(job_id: uuid.UUID,
+               user: User = Depends(get_current_user),
+               db: Session = Depends(get_db)) -> dict:
+    """Состояние export job; exported_rows/bytes_written растут по ходу."""
+    return jsonable_encoder(export_to_dict(_get_export(db, job_id, user)))
+
+
+@router.get('/{job_id}/download')
+def download_export(job_id: uuid.UUID,
+                    user: User = Depends(get_current_user),
+                    db: Session = Depends(get_db)) -> dict:
+    """Возвращает presigned URL на файл экспорта.
+
+    - HTTPStatus.CONFLICT (409), если экспорт ещё не завершён,
+    - HTTPStatus.NOT_FOUND (404), если job чужой или файла нет (failed),
+    - HTTPStatus.OK (200) + url.
+    """
+    job = _get_export(db, job_id, user)
+    if job.status in (JobStatus.pending, JobStatus.processing):
+        raise HTTPException(status_code=HTTPStatus.CONFLICT,
+                            detail='Not ready.')
+    if not job.object_key:
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND,
+                            detail='Export file.')
+
+    filename = job.object_key.rsplit('/', 1)[-1]
+    url = presign_get(job.object_key,
+                      expires_seconds=3600,
+                      download_filename=f'customers_{filename}')
+    return {'url': url}
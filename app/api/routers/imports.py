@@ -1,5 +1,8 @@
+import asyncio
+import json
 import uuid
 from http import HTTPStatus
+from typing import AsyncIterator
 
 from fastapi import (
     APIRouter,
@@ -11,74 +14,213 @@ from fastapi import (
     Response,
     UploadFile,
 )
+from fastapi.concurrency import run_in_threadpool
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy import select
+from fastapi.responses import StreamingResponse
+from opentelemetry.trace import SpanKind
+from sqlalchemy import select, tuple_, update
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only
 
 from app.api.deps import get_current_user
-from app.api.routers.serializers import job_to_dict
-from app.core.celery_client import celery_client
-from app.db.session import get_db
+from app.api.pagination import decode_cursor, encode_cursor
+from app.api.routers.serializers import JOB_DICT_COLUMNS, job_to_dict
+from app.api.schemas import JobStatusIn
+from app.api.sync_import import (
+    fallback_delay_seconds,
+    is_sync_import,
+    run_sync_import,
+)
+from app.core.admission import AdmissionRejected, admit_import
+from app.core.cancellation import request_cancel
+from app.core.celery_client import import_queue
+from app.core.config import settings
+from app.core.events import (
+    EVENT_FIELDS,
+    TERMINAL_STATUSES,
+    job_events,
+    publish_job_event,
+)
+from app.core.ids import uuid7
+from app.core.outbox import discard_job_tasks, enqueue_task
+from app.core.tracing import tracer
+from app.db.session import SessionLocal, get_db
 from app.models.import_job import ImportJob, ImportMode, JobStatus
 from app.models.user import User
-from app.storage.s3 import presign_get, put_bytes
+from app.storage.errors_index import read_error_rows
+from app.storage.s3 import object_size, presign_get, presign_post, put_fileobj
+from app.storage.uploads import (
+    UploadTooLarge,
+    content_key,
+    direct_upload_key,
+    hash_fileobj,
+    lock_upload_key,
+)
 
 router = APIRouter(prefix='/imports', tags=['imports'])
 
 
-@router.post('', status_code=HTTPStatus.CREATED)
-def create_import(
-    response: Response,
-    mode: ImportMode = Query(ImportMode.insert_only),
-    file: UploadFile = File(...),
-    idempotency_key: str | None = Header(
-        default=None,
-        alias='Idempotency-Key'),
-    user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-) -> dict:
-    """Создает задачу импорта CSV и ставит ее в очередб Selery.
+def _find_imported_duplicate(db: Session,
+                             *,
+                             user_id: uuid.UUID,
+                             content_sha256: str,
+                             mode: ImportMode) -> ImportJob | None:
+    """Последний успешный job пользователя с тем же файлом и режимом."""
+    return db.execute(
+        select(ImportJob)
+        .where(
+            ImportJob.user_id == user_id,
+            ImportJob.content_sha256 == content_sha256,
+            ImportJob.mode == mode,
+            ImportJob.status == JobStatus.done,
+        )
+        .order_by(ImportJob.created_at.desc())
+        .limit(1)
+    ).scalar_one_or_none()
 
-    Контракт:
-      - Требует заголовок Idempotency-key: повтрный запрос тем же ключем
-        (для текущего user_id) возвращает то же import job (200),
-        первый запрос создает новый (201).
-      - Файл читается целиком в памяти и загружается в S3;
-        worker обрабатывает асинхронно.
+
+def _finish_if_duplicate(db: Session, job: ImportJob) -> bool:
+    """Применяет DUPLICATE_UPLOAD_POLICY к новому job.
+
+    При policy=skip и наличии успешного импорта того же файла job сразу
+    получает его результат (status=done, duplicate_of_id) и True.
     """
+    if (settings.duplicate_upload_policy != 'skip'
+            or job.content_sha256 is None):
+        return False
+    source = _find_imported_duplicate(db,
+                                      user_id=job.user_id,
+                                      content_sha256=job.content_sha256,
+                                      mode=job.mode)
+    if source is None:
+        return False
+
+    job.status = JobStatus.done
+    job.duplicate_of_id = source.id
+    job.total_rows = source.total_rows
+    job.processed_rows = source.processed_rows
+    job.would_insert_rows = source.would_insert_rows
+    job.would_update_rows = source.would_update_rows
+    return True
+
+
+def _admit(user_id: uuid.UUID) -> None:
+    """HTTPStatus.TOO_MANY_REQUESTS (429) с Retry-After, если не допущен."""
+    try:
+        admit_import(user_id)
+    except AdmissionRejected as rejected:
+        raise HTTPException(
+            status_code=HTTPStatus.TOO_MANY_REQUESTS,
+            detail=rejected.reason,
+            headers={'Retry-After': str(rejected.retry_after)})
+
+
+def _store_upload(db: Session, file: UploadFile) -> tuple[str, str, int]:
+    """Хэширует и загружает файл в S3, возвращает (sha256, s3_key, size).
+
+    До commit job держит shared lock ключа: GC не удалит уже лежащий
+    объект, который мы решили не перезаливать.
+    Ошибки: HTTPStatus.REQUEST_ENTITY_TOO_LARGE (413) больше
+    MAX_UPLOAD_BYTES, HTTPStatus.BAD_REQUEST (400) для пустого файла.
+    """
+    try:
+        with tracer.start_as_current_span('import.upload') as span:
+            sha256, size = hash_fileobj(file.file,
+                                        max_bytes=settings.max_upload_bytes)
+            span.set_attribute('import.file_size', size)
+    except UploadTooLarge as error:
+        raise HTTPException(
+            status_code=HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+            detail=str(error))
+    if not size:
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST,
+                            detail='empty file')
+
+    s3_key = content_key(sha256)
+    lock_upload_key(db, s3_key, shared=True)
+    with tracer.start_as_current_span('s3.put'):
+        return sha256, put_fileobj(file.file, key=s3_key), size
+
+
+def _require_idempotency_key(idempotency_key: str | None) -> str:
+    """Ошибки: HTTPStatus.BAD_REQUEST (400) без Idempotency-Key."""
     if not idempotency_key or not idempotency_key.strip():
         raise HTTPException(
             status_code=HTTPStatus.BAD_REQUEST,
             detail='Idempotency-Key header required')
-    idem = idempotency_key.strip()
+    return idempotency_key.strip()
+
 
-    existing = db.execute(
+def _job_by_idempotency_key(db: Session,
+                            user_id: uuid.UUID,
+                            idem: str) -> ImportJob | None:
+    return db.execute(
         select(ImportJob).where(
-            ImportJob.user_id == user.id,
+            ImportJob.user_id == user_id,
             ImportJob.idempotency_key == idem,
         )
     ).scalar_one_or_none()
 
-    if existing:
-        response.status_code = HTTPStatus.OK
-        return jsonable_encoder(job_to_dict(existing))
 
-    data = file.file.read()
-    if not data:
-        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST,
-                            detail='empty file')
+def _submit_job(db: Session,
+                response: Response,
+                job: ImportJob,
+                *,
+                source: bytes | None = None) -> dict:
+    """Сохраняет новый job и ставит его задачу в outbox одной транзакцией.
 
-    filename = file.filename or 'upload.csv'
-    s3_key = put_bytes(data, filename=filename)
+    С source импорт выполняется синхронно (см. app.api.sync_import), а
+    задача в outbox остаётся отложенной страховкой; не уложился в
+    SYNC_IMPORT_TIMEOUT_SECONDS или у пользователя заняты все слоты
+    импорта — HTTPStatus.ACCEPTED (202) и текущее состояние job. Гонка
+    по Idempotency-Key (IntegrityError) отдаёт существующий job со
+    статусом HTTPStatus.OK (200).
+    """
+    db.add(job)
+    task = None
+    with tracer.start_as_current_span('import.enqueue',
+                                      attributes={'job_id': str(job.id)}):
+        if not _finish_if_duplicate(db, job):
+            delay = fallback_delay_seconds() if source is not None else 0
+            task = enqueue_task(db, 'process_import',
+                                args=[str(job.id)],
+                                queue=import_queue(job.file_size),
+                                delay_seconds=delay)
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            existing = _job_by_idempotency_key(db, job.user_id,
+                                               job.idempotency_key)
+            response.status_code = HTTPStatus.OK
+            return jsonable_encoder(job_to_dict(existing))
 
-    job = ImportJob(
+    if source is not None and task is not None:
+        if not run_sync_import(job.id, job.user_id, job.s3_key, job.mode,
+                               task.id, source):
+            response.status_code = HTTPStatus.ACCEPTED
+    db.refresh(job)
+    return jsonable_encoder(job_to_dict(job))
+
+
+def _new_job(*,
+             user: User,
+             idem: str,
+             mode: ImportMode,
+             filename: str,
+             s3_key: str,
+             size: int,
+             sha256: str | None = None) -> ImportJob:
+    return ImportJob(
+        id=uuid7(),
         user_id=user.id,
         idempotency_key=idem,
         status=JobStatus.pending,
         mode=mode,
         filename=filename,
         s3_key=s3_key,
+        content_sha256=sha256,
+        file_size=size,
         total_rows=0,
         processed_rows=0,
         error=None,
@@ -86,32 +228,206 @@ def create_import(
         error_report_object_key=None,
     )
 
-    db.add(job)
-    try:
-        db.commit()
-    except IntegrityError:
-        db.rollback()
-        existing = db.execute(
-            select(ImportJob).where(
-                ImportJob.user_id == user.id,
-                ImportJob.idempotency_key == idem,
-            )
-        ).scalar_one()
+
+@router.post('', status_code=HTTPStatus.CREATED)
+def create_import(
+    response: Response,
+    mode: ImportMode = Query(ImportMode.insert_only),
+    sync: bool = Query(False),
+    file: UploadFile = File(...),
+    idempotency_key: str | None = Header(
+        default=None,
+        alias='Idempotency-Key'),
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> dict:
+    """Создает задачу импорта CSV и ставит ее в очередб Selery.
+
+    Задача пишется в task_outbox в одной транзакции с job и отправляется
+    в брокер relay-процессом: ответ не ждёт брокер и не теряет задачу
+    при его недоступности.
+
+    Контракт:
+      - Требует заголовок Idempotency-key: повтрный запрос тем же ключем
+        (для текущего user_id) возвращает то же import job (200),
+        первый запрос создает новый (201).
+      - Файл читается потоково: считается SHA-256 и он загружается в S3
+        под content-addressed ключом; worker обрабатывает асинхронно.
+      - Больше MAX_UPLOAD_BYTES: HTTPStatus.REQUEST_ENTITY_TOO_LARGE (413).
+      - Превышен rate limit пользователя или очередь импортов переполнена:
+        HTTPStatus.TOO_MANY_REQUESTS (429) с Retry-After, файл в S3 не
+        загружается. Повтор по существующему Idempotency-Key не лимитируется.
+      - При DUPLICATE_UPLOAD_POLICY=skip повтор уже успешно
+        импортированного файла (тот же user/mode) сразу завершается как
+        done с duplicate_of, без постановки в очередь.
+      - sync=true (до SYNC_IMPORT_MAX_BYTES) или файл не больше
+        SYNC_IMPORT_AUTO_BYTES: импорт выполняется в запросе, в ответе уже
+        завершённый job; дольше SYNC_IMPORT_TIMEOUT_SECONDS —
+        HTTPStatus.ACCEPTED (202), импорт доделывается в фоне. Синхронный
+        импорт тоже ограничен TENANT_MAX_CONCURRENT_IMPORTS: без
+        свободного слота — HTTPStatus.ACCEPTED (202), job уходит воркеру.
+    """
+    idem = _require_idempotency_key(idempotency_key)
+    existing = _job_by_idempotency_key(db, user.id, idem)
+    if existing:
         response.status_code = HTTPStatus.OK
         return jsonable_encoder(job_to_dict(existing))
 
-    db.refresh(job)
+    with tracer.start_as_current_span(
+            'create_import', kind=SpanKind.SERVER,
+            attributes={'import.mode': mode.value, 'import.sync': sync}):
+        _admit(user.id)
+        sha256, s3_key, size = _store_upload(db, file)
+        job = _new_job(user=user,
+                       idem=idem,
+                       mode=mode,
+                       filename=file.filename or 'upload.csv',
+                       s3_key=s3_key,
+                       size=size,
+                       sha256=sha256)
+        source = None
+        if is_sync_import(sync, size):
+            file.file.seek(0)
+            source = file.file.read()
+        return _submit_job(db, response, job, source=source)
 
-    try:
-        celery_client.send_task('process_import', args=[str(job.id)])
-    except Exception as errors:
-        job.status = JobStatus.failed
-        job.error = f'enqueue_failed: {type(errors).__name__}: {errors}'
-        db.commit()
-        raise HTTPException(status_code=HTTPStatus.SERVICE_UNAVAILABLE,
-                            detail='queue unavailable')
 
-    return jsonable_encoder(job_to_dict(job))
+@router.post('/uploads', status_code=HTTPStatus.CREATED)
+def create_upload(user: User = Depends(get_current_user)) -> dict:
+    """Выдаёт presigned POST для загрузки файла напрямую в S3.
+
+    Ключ объекта выбирает сервер (uploads/direct/<user_id>/<upload_id>),
+    размер ограничен политикой POST (1..MAX_UPLOAD_BYTES). Клиент шлёт
+    multipart/form-data на url с полями fields и файлом в поле file,
+    затем вызывает POST /imports/{upload_id}/start.
+    Rate limit и глубина очереди проверяются здесь, до передачи файла:
+    HTTPStatus.TOO_MANY_REQUESTS (429) с Retry-After.
+    """
+    _admit(user.id)
+    upload_id = uuid7()
+    expires_in = settings.s3_presign_ttl_seconds
+    post = presign_post(direct_upload_key(user.id, upload_id),
+                        max_bytes=settings.max_upload_bytes,
+                        expires_seconds=expires_in)
+    return {
+        'upload_id': str(upload_id),
+        'url': post['url'],
+        'fields': post['fields'],
+        'max_bytes': settings.max_upload_bytes,
+        'expires_in': expires_in,
+    }
+
+
+@router.post('/{upload_id}/start', status_code=HTTPStatus.CREATED)
+def start_upload_import(
+    upload_id: uuid.UUID,
+    response: Response,
+    mode: ImportMode = Query(ImportMode.insert_only),
+    filename: str | None = Query(None, max_length=255),
+    idempotency_key: str | None = Header(
+        default=None,
+        alias='Idempotency-Key'),
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> dict:
+    """Создает import job для файла, загруженного через /imports/uploads.
+
+    Объект проверяется head_object: нет объекта (или он чужой — ключ
+    строится от текущего пользователя) — HTTPStatus.NOT_FOUND (404),
+    пустой — HTTPStatus.BAD_REQUEST (400), больше MAX_UPLOAD_BYTES —
+    HTTPStatus.REQUEST_ENTITY_TOO_LARGE (413). Idempotency-Key — как у
+    POST /imports. Файл не хэшируется (API его не читает), поэтому
+    content_sha256 пуст и DUPLICATE_UPLOAD_POLICY не применяется.
+    """
+    idem = _require_idempotency_key(idempotency_key)
+    existing = _job_by_idempotency_key(db, user.id, idem)
+    if existing:
+        response.status_code = HTTPStatus.OK
+        return jsonable_encoder(job_to_dict(existing))
+
+    s3_key = direct_upload_key(user.id, upload_id)
+    lock_upload_key(db, s3_key, shared=True)
+    size = object_size(s3_key)
+    if size is None:
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND,
+                            detail='upload not found')
+    if size > settings.max_upload_bytes:
+        raise HTTPException(status_code=HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                            detail='upload is too large')
+    if not size:
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST,
+                            detail='empty file')
+
+    job = _new_job(user=user,
+                   idem=idem,
+                   mode=mode,
+                   filename=filename or 'upload.csv',
+                   s3_key=s3_key,
+                   size=size)
+    with tracer.start_as_current_span(
+            'start_upload_import', kind=SpanKind.SERVER,
+            attributes={'import.mode': mode.value}):
+        return _submit_job(db, response, job)
+
+
+@router.get('')
+def list_imports(status: JobStatus | None = Query(None),
+                 cursor: str | None = Query(None),
+                 limit: int = Query(50, ge=1, le=500),
+                 user: User = Depends(get_current_user),
+                 db: Session = Depends(get_db)) -> dict:
+    """Список job текущего пользователя, новые первыми.
+
+    Keyset-пагинация по (created_at, id) через индекс
+    (user_id, created_at, id): next_cursor из ответа передаётся в cursor
+    следующего запроса, null — страниц больше нет.
+    """
+    stmt = (
+        select(ImportJob)
+        .options(load_only(*JOB_DICT_COLUMNS))
+        .where(ImportJob.user_id == user.id)
+        .order_by(ImportJob.created_at.desc(), ImportJob.id.desc())
+        .limit(limit + 1)
+    )
+    if status is not None:
+        stmt = stmt.where(ImportJob.status == status)
+    if cursor:
+        stmt = stmt.where(
+            tuple_(ImportJob.created_at, ImportJob.id)
+            < tuple_(*decode_cursor(cursor)))
+
+    jobs = db.execute(stmt).scalars().all()
+    next_cursor = None
+    if len(jobs) > limit:
+        last = jobs[limit - 1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return {
+        'items': [jsonable_encoder(job_to_dict(job)) for job in jobs[:limit]],
+        'next_cursor': next_cursor,
+    }
+
+
+@router.post('/status')
+def get_imports_status(data: JobStatusIn,
+                       user: User = Depends(get_current_user),
+                       db: Session = Depends(get_db)) -> dict:
+    """Состояние нескольких job одним запросом.
+
+    Чужие и несуществующие id в ответ не попадают (items), их список —
+    в not_found.
+    """
+    jobs = db.execute(
+        select(ImportJob)
+        .options(load_only(*JOB_DICT_COLUMNS))
+        .where(ImportJob.user_id == user.id,
+               ImportJob.id.in_(set(data.ids)))
+    ).scalars().all()
+
+    found = {job.id for job in jobs}
+    return {
+        'items': [jsonable_encoder(job_to_dict(job)) for job in jobs],
+        'not_found': [str(i) for i in data.ids if i not in found],
+    }
 
 
 @router.get('/{job_id}')
@@ -130,6 +446,65 @@ def get_import(job_id: uuid.UUID,
     return jsonable_encoder(job_to_dict(job=job))
 
 
+@router.post('/{job_id}/cancel')
+def cancel_import(job_id: uuid.UUID,
+                  response: Response,
+                  user: User = Depends(get_current_user),
+                  db: Session = Depends(get_db)) -> dict:
+    """Отменяет import job.
+
+    - pending: job сразу получает status=cancelled, его задача удаляется
+      из outbox, а уже отправленная воркером не выполняется (claim
+      берёт только pending) — 200;
+    - processing: ставится флаг отмены, воркер останавливается на
+      ближайшем батче и завершает job как cancelled с частичными
+      счётчиками и errors.csv (в т.ч. job в общих батчах
+      COALESCE_SMALL_IMPORTS) — HTTPStatus.ACCEPTED (202);
+    - завершённый job: HTTPStatus.CONFLICT (409);
+    - чужой или несуществующий: HTTPStatus.NOT_FOUND (404).
+    """
+    fields = {'status': JobStatus.cancelled}
+    cancelled = db.execute(
+        update(ImportJob)
+        .where(ImportJob.id == job_id,
+               ImportJob.user_id == user.id,
+               ImportJob.status == JobStatus.pending)
+        .values(**fields)
+        .returning(ImportJob.id)
+    ).scalar_one_or_none()
+    if cancelled is not None:
+        discard_job_tasks(db, 'process_import', job_id)
+        db.commit()
+        publish_job_event(job_id, fields)
+        return jsonable_encoder(job_to_dict(db.get(ImportJob, job_id)))
+
+    job = db.get(ImportJob, job_id)
+    if job is None or job.user_id != user.id:
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND,
+                            detail='not found')
+    if job.status != JobStatus.processing:
+        raise HTTPException(status_code=HTTPStatus.CONFLICT,
+                            detail=f'job is {job.status.value}')
+
+    request_cancel(job.id)
+    response.status_code = HTTPStatus.ACCEPTED
+    return jsonable_encoder(job_to_dict(job))
+
+
+def _require_error_report(job: ImportJob) -> None:
+    """Проверяет, что у завершённого job есть errors.csv.
+
+    - HTTPStatus.CONFLICT (409), если job ещё не завершён или отчёт не готов,
+    - HTTPStatus.NOT_FOUND (404), если отчёта нет.
+    """
+    if not job.error_report_object_key:
+        if job.status in (JobStatus.pending, JobStatus.processing):
+            raise HTTPException(status_code=HTTPStatus.CONFLICT,
+                                detail='Not ready.')
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND,
+                            detail='Error report.')
+
+
 @router.get('/{job_id}/errors')
 def get_import_errors(job_id: uuid.UUID,
                       user: User = Depends(get_current_user),
@@ -146,12 +521,7 @@ def get_import_errors(job_id: uuid.UUID,
         raise HTTPException(status_code=HTTPStatus.NOT_FOUND,
                             detail='Not found.')
 
-    if not job.error_report_object_key:
-        if job.status in (JobStatus.pending, JobStatus.processing):
-            raise HTTPException(status_code=HTTPStatus.CONFLICT,
-                                detail='Not ready.')
-        raise HTTPException(status_code=HTTPStatus.NOT_FOUND,
-                            detail='Error report.')
+    _require_error_report(job)
 
     url = presign_get(
         job.error_report_object_key,
@@ -159,3 +529,102 @@ def get_import_errors(job_id: uuid.UUID,
         download_filename=f'errors_{job.id}.csv'
     )
     return {'url': url}
+
+
+@router.get('/{job_id}/errors/rows')
+def get_import_error_rows(job_id: uuid.UUID,
+                          offset: int = Query(0, ge=0),
+                          limit: int = Query(100, ge=1, le=1000),
+                          user: User = Depends(get_current_user),
+                          db=Depends(get_db)) -> dict:
+    """Возвращает страницу строк errors.csv.
+
+    Читает только нужный диапазон байт отчёта по индексу смещений,
+    без скачивания всего файла. Коды ответов те же, что у /errors;
+    для отчётов без индекса (старые job) — HTTPStatus.NOT_FOUND (404).
+    """
+    job = db.get(ImportJob, job_id)
+    if job is None or job.user_id != user.id:
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND,
+                            detail='Not found.')
+
+    _require_error_report(job)
+    if not job.error_report_index_key:
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND,
+                            detail='Error report index.')
+
+    rows = []
+    if offset < job.error_count:
+        rows = read_error_rows(
+            job.error_report_object_key,
+            job.error_report_index_key,
+            offset=offset,
+            limit=min(limit, job.error_count - offset),
+        )
+    return {
+        'total': job.error_count,
+        'offset': offset,
+        'limit': limit,
+        'rows': rows,
+    }
+
+
+def _load_job_state(job_id: uuid.UUID, user_id: uuid.UUID) -> dict | None:
+    with SessionLocal() as db:
+        job = db.get(ImportJob, job_id)
+        if job is None or job.user_id != user_id:
+            return None
+        snapshot = job_to_dict(job)
+    return {name: snapshot.get(name) for name in EVENT_FIELDS}
+
+
+def _sse(state: dict) -> str:
+    return f'event: job\ndata: {json.dumps(state)}\n\n'
+
+
+async def _job_event_stream(job_id: uuid.UUID,
+                            state: dict,
+                            queue: asyncio.Queue) -> AsyncIterator[str]:
+    try:
+        yield _sse(state)
+        while state.get('status') not in TERMINAL_STATUSES:
+            try:
+                event = await asyncio.wait_for(
+                    queue.get(), timeout=settings.sse_heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield ': ping\n\n'
+                continue
+            state.update(event)
+            yield _sse(state)
+    finally:
+        await job_events.unsubscribe(job_id, queue)
+
+
+@router.get('/{job_id}/events')
+async def stream_import_events(
+        job_id: uuid.UUID,
+        user: User = Depends(get_current_user)) -> StreamingResponse:
+    """SSE-стрим прогресса job (text/event-stream).
+
+    Первое событие — текущее состояние (status/processed_rows/total_rows/
+    error_count/error), дальше — при каждом изменении, которое воркер
+    публикует в Redis pub/sub. Стрим закрывается после done/failed.
+    БД читается один раз при подключении (после подписки, чтобы не
+    потерять изменения между чтением и подпиской).
+    """
+    queue = await job_events.subscribe(job_id)
+    try:
+        state = await run_in_threadpool(_load_job_state, job_id, user.id)
+    except Exception:
+        await job_events.unsubscribe(job_id, queue)
+        raise
+    if state is None:
+        await job_events.unsubscribe(job_id, queue)
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND,
+                            detail='not found')
+
+    return StreamingResponse(
+        _job_event_stream(job_id, state, queue),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
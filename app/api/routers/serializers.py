@@ -1,5 +1,29 @@
+from app.models.customer import Customer
+from app.models.export_job import ExportJob
 from app.models.import_job import ImportJob
 
+# колонки, которые читает job_to_dict: списки job грузят только их
+# (load_only), без s3/idempotency и прочих служебных полей.
+JOB_DICT_COLUMNS = (
+    ImportJob.id,
+    ImportJob.status,
+    ImportJob.mode,
+    ImportJob.filename,
+    ImportJob.file_size,
+    ImportJob.content_sha256,
+    ImportJob.duplicate_of_id,
+    ImportJob.total_rows,
+    ImportJob.processed_rows,
+    ImportJob.error,
+    ImportJob.error_count,
+    ImportJob.error_stats,
+    ImportJob.flush_retries,
+    ImportJob.timings,
+    ImportJob.would_insert_rows,
+    ImportJob.would_update_rows,
+    ImportJob.created_at,
+)
+
 
 def job_to_dict(job: ImportJob) -> dict:
     return {
@@ -10,10 +34,46 @@ def job_to_dict(job: ImportJob) -> dict:
         'mode': (
             job.mode.value if hasattr(job.mode, 'value') else str(job.mode)),
         'filename': job.filename,
+        'file_size': job.file_size,
+        'content_sha256': job.content_sha256,
+        'duplicate_of': (
+            str(job.duplicate_of_id) if job.duplicate_of_id else None),
         'total_rows': job.total_rows,
         'processed_rows': job.processed_rows,
         'error': job.error,
+        'error_count': job.error_count,
+        'error_stats': job.error_stats,
+        'flush_retries': job.flush_retries,
+        'timings': job.timings,
+        'would_insert_rows': job.would_insert_rows,
+        'would_update_rows': job.would_update_rows,
         'created_at': job.created_at.isoformat() if getattr(job,
                                                             'created_at',
                                                             None) else None,
     }
+
+
+def customer_to_dict(customer: Customer) -> dict:
+    return {
+        'id': str(customer.id),
+        'email': customer.email,
+        'first_name': customer.first_name,
+        'last_name': customer.last_name,
+        'phone': customer.phone,
+        'city': customer.city,
+        'created_at': customer.created_at.isoformat(),
+        'updated_at': customer.update_at.isoformat(),
+    }
+
+
+def export_to_dict(job: ExportJob) -> dict:
+    return {
+        'id': str(job.id),
+        'status': job.status.value,
+        'filters': job.filters,
+        'gzip': job.gzip,
+        'exported_rows': job.exported_rows,
+        'bytes_written': job.bytes_written,
+        'error': job.error,
+        'created_at': job.created_at.isoformat(),
+    }
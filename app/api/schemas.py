@@ -1,4 +1,6 @@
-from pydantic import BaseModel, EmailStr
+import uuid
+
+from pydantic import BaseModel, EmailStr, Field
 
 
 class RegisterIn(BaseModel):
@@ -14,3 +16,14 @@ class LoginIn(BaseModel):
 class TokenOut(BaseModel):
     access_token: str
     token_type: str = 'bearer'
+
+
+class JobStatusIn(BaseModel):
+    ids: list[uuid.UUID] = Field(min_length=1, max_length=1000)
+
+
+class ExportIn(BaseModel):
+    email_prefix: str | None = Field(None, max_length=320)
+    last_name: str | None = Field(None, max_length=150)
+    city: str | None = Field(None, max_length=128)
+    gzip: bool = False
@@ -0,0 +1,111 @@
+"""Синхронный импорт маленьких файлов прямо в процессе API.
+
+Импорт идёт тем же execute_import (app.services.importing), что и в
+воркере (claim → process_csv → errors.csv → финальное обновление job),
+поэтому job и отчёт не отличаются от асинхронных. Выполняется в
+отдельном пуле потоков: запрос ждёт не дольше
+SYNC_IMPORT_TIMEOUT_SECONDS, после этого отвечает текущим состоянием
+job, а импорт доделывается в фоне.
+
+Синхронный импорт занимает слот пользователя (app.core.fairness), как
+задача воркера. Если слотов нет, job остаётся pending и уходит
+асинхронным путём: страховочная задача отправляется в брокер сразу.
+
+На случай падения API до начала импорта job страхуется отложенной
+задачей в outbox; после claim она удаляется.
+"""
+import logging
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from opentelemetry.context import Context, attach, detach, get_current
+
+from app.core.config import settings
+from app.core.fairness import tenant_slot
+from app.core.outbox import discard_task, release_task
+from app.db.session import SessionLocal
+from app.models.import_job import ImportMode
+from app.services.importing import claim_job, execute_import
+
+logger = logging.getLogger(__name__)
+
+# запас сверх таймаута: за это время синхронный импорт должен стартовать
+FALLBACK_GRACE_SECONDS = 60
+
+_executor = ThreadPoolExecutor(max_workers=settings.sync_import_workers,
+                               thread_name_prefix='sync-import')
+
+
+def fallback_delay_seconds() -> float:
+    """Через сколько страховочная задача уйдёт в брокер."""
+    return settings.sync_import_timeout_seconds + FALLBACK_GRACE_SECONDS
+
+
+def is_sync_import(requested: bool, size: int) -> bool:
+    """Идёт ли импорт файла size байт синхронно.
+
+    ?sync=true — до SYNC_IMPORT_MAX_BYTES, без него — до
+    SYNC_IMPORT_AUTO_BYTES (0 — автоматически не включается).
+    """
+    limit = (settings.sync_import_max_bytes if requested
+             else settings.sync_import_auto_bytes)
+    return size <= limit
+
+
+def _import(job_id: uuid.UUID,
+            s3_key: str,
+            mode: ImportMode,
+            fallback_task_id: uuid.UUID,
+            data: bytes) -> None:
+    with SessionLocal() as db:
+        if not claim_job(db, job_id):
+            return
+        discard_task(db, fallback_task_id)
+        db.commit()
+        execute_import(db, job_id, s3_key, mode, source=data, claimed=True)
+
+
+def _run(job_id: uuid.UUID,
+         user_id: uuid.UUID,
+         s3_key: str,
+         mode: ImportMode,
+         fallback_task_id: uuid.UUID,
+         data: bytes,
+         trace_context: Context) -> bool:
+    # span'ы фаз импорта — дочерние к span'у запроса, а не новый trace
+    token = attach(trace_context)
+    try:
+        with tenant_slot(user_id, job_id) as acquired:
+            if acquired:
+                _import(job_id, s3_key, mode, fallback_task_id, data)
+                return True
+        with SessionLocal() as db:
+            release_task(db, fallback_task_id)
+            db.commit()
+        return False
+    finally:
+        detach(token)
+
+
+def run_sync_import(job_id: uuid.UUID,
+                    user_id: uuid.UUID,
+                    s3_key: str,
+                    mode: ImportMode,
+                    fallback_task_id: uuid.UUID,
+                    data: bytes) -> bool:
+    """Запускает импорт и ждёт его.
+
+    False — импорт не уложился в таймаут или отдан воркеру (у
+    пользователя заняты все слоты).
+    """
+    future = _executor.submit(_run, job_id, user_id, s3_key, mode,
+                              fallback_task_id, data, get_current())
+    try:
+        return future.result(timeout=settings.sync_import_timeout_seconds)
+    except FutureTimeout:
+        return False
+    except Exception:
+        # ошибка уже записана в job (failed) — отдаём его как есть
+        logger.warning('Sync import failed: %s', job_id)
+    return True
@@ -0,0 +1,109 @@
+"""Допуск новых импортов: rate limit пользователя и глубина очереди.
+
+Проверки делаются до загрузки файла в S3: клиент получает 429 с
+Retry-After и повторяет позже, а не ждёт часами в очереди с уже
+сохранённым файлом. При недоступном Redis запросы пропускаются (fail
+open) — лимиты защищают от перегрузки, а не гарантируют квоту.
+"""
+import logging
+import math
+import uuid
+
+import redis
+
+from app.core.celery_client import LARGE_IMPORTS_QUEUE, SMALL_IMPORTS_QUEUE
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# token bucket в hash {tokens, ts}; время берётся из Redis, чтобы реплики
+# API с разными часами делили одно ведро. Возвращает {1, 0} или
+# {0, секунды до появления токена} (строкой: Lua-числа режутся до int).
+_TAKE_TOKEN = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+if wait > 0 then
+    return {0, tostring(wait)}
+end
+return {1, '0'}
+"""
+
+_client: redis.Redis | None = None
+
+
+def _redis() -> redis.Redis:
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(settings.redis_url)
+    return _client
+
+
+class AdmissionRejected(Exception):
+    """Импорт сейчас не принимается; retry_after — секунды до повтора."""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+def _rate_key(user_id: uuid.UUID) -> str:
+    return f'import_rate:{user_id}'
+
+
+def take_import_token(user_id: uuid.UUID) -> float:
+    """Берёт токен из ведра пользователя.
+
+    Возвращает 0, если токен взят, иначе секунды до следующего токена.
+    """
+    per_second = settings.import_rate_per_minute / 60
+    allowed, wait = _redis().eval(_TAKE_TOKEN, 1, _rate_key(user_id),
+                                  per_second,
+                                  max(1, settings.import_rate_burst))
+    return 0.0 if allowed else float(wait)
+
+
+def import_queue_depth() -> int:
+    """Сообщений в очередях импорта у брокера (Redis list на очередь)."""
+    pipe = _redis().pipeline(transaction=False)
+    for queue in (SMALL_IMPORTS_QUEUE, LARGE_IMPORTS_QUEUE):
+        pipe.llen(queue)
+    return sum(pipe.execute())
+
+
+def admit_import(user_id: uuid.UUID) -> None:
+    """Проверяет, можно ли принять импорт пользователя.
+
+    Raises:
+        AdmissionRejected: очередь глубже IMPORT_QUEUE_MAX_DEPTH или
+            пользователь исчерпал IMPORT_RATE_PER_MINUTE.
+    """
+    try:
+        max_depth = settings.import_queue_max_depth
+        if max_depth > 0 and import_queue_depth() >= max_depth:
+            raise AdmissionRejected(
+                'import queue is full',
+                settings.import_queue_retry_after_seconds)
+
+        if settings.import_rate_per_minute > 0:
+            wait = take_import_token(user_id)
+            if wait:
+                raise AdmissionRejected('import rate limit exceeded',
+                                        max(1, math.ceil(wait)))
+    except redis.RedisError:
+        logger.warning('Admission check skipped: redis unavailable',
+                       exc_info=True)
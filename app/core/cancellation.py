@@ -0,0 +1,35 @@
+"""Флаг отмены выполняющегося импорта в Redis.
+
+API ставит ключ import_cancel:<job_id>, воркер проверяет его между
+батчами (один EXISTS на батч) и останавливает импорт. Ключ живёт
+CANCEL_FLAG_TTL_SECONDS и не снимается: завершённый job повторно не
+запускается, так что флаг просто истекает.
+"""
+import uuid
+
+import redis
+
+from app.core.config import settings
+
+CANCEL_FLAG_TTL_SECONDS = 24 * 60 * 60
+
+_client: redis.Redis | None = None
+
+
+def _redis() -> redis.Redis:
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(settings.redis_url)
+    return _client
+
+
+def _cancel_key(job_id: uuid.UUID | str) -> str:
+    return f'import_cancel:{job_id}'
+
+
+def request_cancel(job_id: uuid.UUID | str) -> None:
+    _redis().set(_cancel_key(job_id), 1, ex=CANCEL_FLAG_TTL_SECONDS)
+
+
+def is_cancel_requested(job_id: uuid.UUID | str) -> bool:
+    return bool(_redis().exists(_cancel_key(job_id)))
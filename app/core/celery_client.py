@@ -11,3 +11,16 @@ def make_celery_client() -> Celery:
 
 
 celery_client = make_celery_client()
+
+# у каждой очереди свой пул воркеров (см. docker-compose.yml), поэтому
+# многогигабайтные загрузки не задерживают маленькие.
+SMALL_IMPORTS_QUEUE = 'imports.small'
+LARGE_IMPORTS_QUEUE = 'imports.large'
+# экспорт читает всю таблицу — его обслуживают воркеры больших импортов
+EXPORTS_QUEUE = LARGE_IMPORTS_QUEUE
+
+
+def import_queue(size_bytes: int | None) -> str:
+    if size_bytes is not None and size_bytes >= settings.large_upload_bytes:
+        return LARGE_IMPORTS_QUEUE
+    return SMALL_IMPORTS_QUEUE
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -8,6 +10,23 @@ class Settings(BaseSettings):
     database_url: str
     redis_url: str
 
+    # пул соединений API (на процесс uvicorn)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30
+    db_pool_recycle: int = 1800
+    # пул на дочерний процесс воркера: задача держит одно соединение
+    worker_db_pool_size: int = 1
+    worker_db_max_overflow: int = 2
+    worker_db_pool_timeout: int = 30
+    worker_db_pool_recycle: int = 1800
+    # psycopg готовит запрос после N выполнений на соединении;
+    # 0 — без prepared statements (PgBouncer transaction pooling)
+    db_prepare_threshold: int = 2
+    db_prepared_max: int = 100
+    # бюджет одного запроса GET /customers (statement_timeout), мс
+    customers_query_timeout_ms: int = 500
+
     s3_endpoint_url: str
     s3_access_key: str
     s3_secret_key: str
@@ -15,16 +34,89 @@ class Settings(BaseSettings):
     s3_region: str = 'us-east-1'
     s3_public_endpoint_url: str | None = None
     s3_presign_ttl_seconds: int = 3600
+    s3_download_part_bytes: int = 8 * 1024 * 1024
+    s3_download_concurrency: int = 8
+    # размер part при потоковой записи в S3 (экспорт), не меньше 5 MiB
+    s3_upload_part_bytes: int = 8 * 1024 * 1024
 
     jwt_secret: str
     jwt_alg: str = 'HS256'
     jwt_access_ttl_seconds: int = 3600
 
     batch_size: int = 500
+    adaptive_batch: bool = True
+    batch_size_min: int = 100
+    batch_size_max: int = 20000
+    batch_target_ms: int = 250
     progress_every: int = 50
     import_slow_ms: int = 0
+    flush_max_retries: int = 5
+    flush_retry_base_ms: int = 50
+    flush_retry_max_ms: int = 2000
+    worker_spool_dir: str | None = None
+
+    sse_heartbeat_seconds: int = 15
+
+    # загрузки от этого размера уходят в очередь imports.large
+    large_upload_bytes: int = 10 * 1024 * 1024
+    # одновременных импортов на пользователя (0 — без ограничения);
+    # импорт сверх лимита откладывается на tenant_defer_seconds
+    tenant_max_concurrent_imports: int = 2
+    tenant_slot_lease_seconds: int = 300
+    tenant_defer_seconds: int = 5
+
+    # token bucket на пользователя для POST /imports (0 — без лимита)
+    import_rate_per_minute: int = 60
+    import_rate_burst: int = 20
+    # глубина очередей импорта, после которой POST /imports отвечает 429
+    # (0 — не проверять)
+    import_queue_max_depth: int = 1000
+    import_queue_retry_after_seconds: int = 30
+
+    # relay transactional outbox (worker.outbox_relay)
+    outbox_batch_size: int = 100
+    outbox_poll_seconds: float = 1.0
+    outbox_retry_max_seconds: int = 60
+
+    # синхронный импорт в API: ?sync=true до sync_import_max_bytes,
+    # автоматически до sync_import_auto_bytes (0 — только по запросу)
+    sync_import_max_bytes: int = 1024 * 1024
+    sync_import_auto_bytes: int = 0
+    sync_import_timeout_seconds: float = 5.0
+    sync_import_workers: int = 4
+
+    # воркер пишет маленькие импорты общими батчами по нескольку job
+    coalesce_small_imports: bool = False
+    coalesce_max_bytes: int = 64 * 1024
+    coalesce_max_jobs: int = 50
+
+    # retention import job по статусу, дней (0 — хранить всегда);
+    # pending/processing не удаляются
+    retention_done_days: int = 30
+    retention_failed_days: int = 90
+    retention_cancelled_days: int = 7
+    # GC (worker.retention): job за пачку и пачек за один запуск beat
+    gc_batch_size: int = 1000
+    gc_max_batches: int = 10
+    gc_interval_seconds: int = 3600
+    # прямые загрузки без job старше этого срока удаляются (0 — никогда)
+    direct_upload_ttl_hours: int = 24
+
+    # экспорт customers (worker.exports): уровень сжатия при gzip=true,
+    # срок хранения файла и job (0 — хранить всегда)
+    export_gzip_level: int = 6
+    retention_export_days: int = 7
+
+    # трассировка OpenTelemetry: otlp — OTLP/HTTP по стандартным
+    # OTEL_EXPORTER_OTLP_*, file — JSON lines в tracing_file_path
+    tracing_exporter: Literal['none', 'otlp', 'file'] = 'none'
+    tracing_file_path: str = 'traces.jsonl'
 
     max_upload_bytes: int = 50 * 1024 * 1024
+    # run: всегда импортировать; skip: если такой же файл (sha256) уже
+    # успешно импортирован этим пользователем в том же режиме, job сразу
+    # завершается как done без запуска воркера.
+    duplicate_upload_policy: Literal['run', 'skip'] = 'run'
 
 
 settings = Settings()
@@ -0,0 +1,33 @@
+"""Фильтры поиска клиентов: общие для GET /customers и экспорта.
+
+Условия построены под индексы customers: lower(email)/lower(last_name)
+с text_pattern_ops для префикса и (lower(city), created_at, id).
+"""
+import sqlalchemy as sa
+
+from app.models.customer import Customer
+
+
+def prefix_pattern(prefix: str) -> str:
+    """LIKE-шаблон префикса в нижнем регистре; % и _ экранируются."""
+    escaped = (prefix.lower()
+               .replace('\\', '\\\\')
+               .replace('%', '\\%')
+               .replace('_', '\\_'))
+    return escaped + '%'
+
+
+def filter_customers(stmt: sa.Select,
+                     *,
+                     email_prefix: str | None = None,
+                     last_name: str | None = None,
+                     city: str | None = None) -> sa.Select:
+    if email_prefix:
+        stmt = stmt.where(sa.func.lower(Customer.email)
+                          .like(prefix_pattern(email_prefix)))
+    if last_name:
+        stmt = stmt.where(sa.func.lower(Customer.last_name)
+                          .like(prefix_pattern(last_name)))
+    if city:
+        stmt = stmt.where(sa.func.lower(Customer.city) == city.lower())
+    return stmt
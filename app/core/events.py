@@ -0,0 +1,129 @@
+"""События прогресса import job через Redis pub/sub.
+
+Воркер публикует изменившиеся поля job в канал import_jobs:<id>
+(publish_job_event), API раздаёт их SSE-клиентам через JobEventHub:
+одно pub/sub соединение на процесс API, подписка на канал job живёт, пока
+его смотрит хотя бы один клиент. Стрим не ходит в БД.
+"""
+import asyncio
+import json
+import logging
+import uuid
+from typing import Any
+
+import redis
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+EVENT_FIELDS = ('status', 'processed_rows', 'total_rows', 'error_count',
+                'error')
+TERMINAL_STATUSES = frozenset({'done', 'failed', 'cancelled'})
+
+_publisher: redis.Redis | None = None
+
+
+def job_channel(job_id: uuid.UUID | str) -> str:
+    return f'import_jobs:{job_id}'
+
+
+def _event_value(value: Any) -> Any:
+    return value.value if hasattr(value, 'value') else value
+
+
+def publish_job_event(job_id: uuid.UUID | str, fields: dict) -> None:
+    """Публикует изменившиеся поля job (только EVENT_FIELDS).
+
+    Ошибки Redis не пробрасываются: прогресс — best effort, импорт из-за
+    него падать не должен.
+    """
+    global _publisher
+
+    payload = {
+        name: _event_value(value)
+        for name, value in fields.items() if name in EVENT_FIELDS
+    }
+    if not payload:
+        return
+    try:
+        if _publisher is None:
+            _publisher = redis.Redis.from_url(settings.redis_url)
+        _publisher.publish(job_channel(job_id), json.dumps(payload))
+    except redis.RedisError:
+        logger.warning('Cannot publish job event: %s', job_id,
+                       exc_info=True)
+
+
+class JobEventHub:
+    """Разводит сообщения одного pub/sub соединения по очередям клиентов."""
+
+    def __init__(self, redis_url: str):
+        self._redis_url = redis_url
+        self._redis: aioredis.Redis | None = None
+        self._pubsub = None
+        self._reader: asyncio.Task | None = None
+        self._queues: dict[str, set[asyncio.Queue]] = {}
+
+    async def subscribe(self, job_id: uuid.UUID | str) -> asyncio.Queue:
+        channel = job_channel(job_id)
+        queue: asyncio.Queue = asyncio.Queue()
+        if self._pubsub is None:
+            self._redis = aioredis.Redis.from_url(self._redis_url)
+            self._pubsub = self._redis.pubsub()
+
+        queues = self._queues.setdefault(channel, set())
+        queues.add(queue)
+        if len(queues) == 1:
+            await self._pubsub.subscribe(channel)
+        if self._reader is None or self._reader.done():
+            self._reader = asyncio.create_task(self._read())
+        return queue
+
+    async def unsubscribe(self,
+                          job_id: uuid.UUID | str,
+                          queue: asyncio.Queue) -> None:
+        channel = job_channel(job_id)
+        queues = self._queues.get(channel)
+        if not queues:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._queues[channel]
+            await self._pubsub.unsubscribe(channel)
+
+    async def _read(self) -> None:
+        while self._queues:
+            try:
+                message = await self._pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=1.0)
+            except aioredis.RedisError:
+                logger.warning('Job events reader error', exc_info=True)
+                await asyncio.sleep(1.0)
+                continue
+            if not message or message.get('type') != 'message':
+                continue
+
+            channel = message['channel']
+            if isinstance(channel, bytes):
+                channel = channel.decode()
+            try:
+                event = json.loads(message['data'])
+            except ValueError:
+                continue
+            for queue in tuple(self._queues.get(channel, ())):
+                queue.put_nowait(event)
+
+    async def close(self) -> None:
+        if self._reader is not None:
+            self._reader.cancel()
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+        if self._redis is not None:
+            await self._redis.aclose()
+        self._pubsub = self._redis = self._reader = None
+        self._queues.clear()
+
+
+job_events = JobEventHub(settings.redis_url)
@@ -0,0 +1,107 @@
+"""Ограничение одновременных импортов на пользователя (Redis семафор).
+
+Слоты пользователя — sorted set tenant_slots:<user_id>: job_id -> время
+последнего продления. Занятый слот держится lease-ом: пока импорт идёт,
+фоновый поток продлевает его раз в треть TENANT_SLOT_LEASE_SECONDS; если
+процесс (воркер или API с синхронным импортом) умер, слот освобождается
+сам по истечении lease.
+"""
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Iterator
+
+import redis
+
+from app.core.config import settings
+
+# снимает протухшие слоты и занимает свободный атомарно; слот, уже
+# занятый тем же job (повторная доставка задачи), второй раз не выдаётся
+_ACQUIRE = """
+local now = tonumber(ARGV[1])
+local lease = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - lease)
+if not redis.call('ZSCORE', KEYS[1], ARGV[2])
+        and redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[4]) then
+    redis.call('ZADD', KEYS[1], now, ARGV[2])
+    redis.call('EXPIRE', KEYS[1], lease)
+    return 1
+end
+return 0
+"""
+
+_client: redis.Redis | None = None
+
+
+def _redis() -> redis.Redis:
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(settings.redis_url)
+    return _client
+
+
+def _slots_key(user_id: uuid.UUID) -> str:
+    return f'tenant_slots:{user_id}'
+
+
+class TenantSlot:
+    """Слот пользователя под один импорт."""
+
+    __slots__ = ('key', 'holder', 'limit', 'lease', '_stop', '_thread')
+
+    def __init__(self, user_id: uuid.UUID, job_id: uuid.UUID):
+        self.key = _slots_key(user_id)
+        self.holder = str(job_id)
+        self.limit = settings.tenant_max_concurrent_imports
+        self.lease = settings.tenant_slot_lease_seconds
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def try_acquire(self) -> bool:
+        if self.limit <= 0:
+            return True
+        return bool(_redis().eval(
+            _ACQUIRE, 1, self.key,
+            time.time(), self.holder, self.lease, self.limit))
+
+    def _keep_alive(self) -> None:
+        client = _redis()
+        while not self._stop.wait(self.lease / 3):
+            try:
+                client.zadd(self.key, {self.holder: time.time()}, xx=True)
+                client.expire(self.key, self.lease)
+            except redis.RedisError:
+                pass
+
+    def start_keep_alive(self) -> None:
+        if self.limit <= 0:
+            return
+        self._thread = threading.Thread(target=self._keep_alive,
+                                        name=f'slot-{self.holder}',
+                                        daemon=True)
+        self._thread.start()
+
+    def release(self) -> None:
+        self._stop.set()
+        if self.limit > 0:
+            _redis().zrem(self.key, self.holder)
+
+
+@contextmanager
+def tenant_slot(user_id: uuid.UUID,
+                job_id: uuid.UUID) -> Iterator[bool]:
+    """Пытается занять слот пользователя под job.
+
+    Отдаёт True, если слот занят (и держит его до выхода из контекста),
+    False — лимит пользователя исчерпан, импорт нужно отложить.
+    """
+    slot = TenantSlot(user_id, job_id)
+    if not slot.try_acquire():
+        yield False
+        return
+    slot.start_keep_alive()
+    try:
+        yield True
+    finally:
+        slot.release()
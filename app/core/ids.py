@@ -0,0 +1,25 @@
+"""Генерация первичных ключей.
+
+UUIDv7 (RFC 9562) начинается с unix-времени в миллисекундах, поэтому
+новые ключи монотонно растут и вставки идут в правый край B-tree индекса,
+а не разбрасываются по всем страницам, как случайный uuid4.
+"""
+import os
+import time
+import uuid
+
+_RAND_BITS = 74
+_RAND_MASK = (1 << _RAND_BITS) - 1
+
+
+def uuid7() -> uuid.UUID:
+    ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), 'big') & _RAND_MASK
+    value = (
+        (ms & 0xFFFF_FFFF_FFFF) << 80
+        | 0x7 << 76
+        | (rand >> 62) << 64
+        | 0b10 << 62
+        | rand & ((1 << 62) - 1)
+    )
+    return uuid.UUID(int=value)
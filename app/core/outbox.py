@@ -0,0 +1,62 @@
+"""Постановка задач Celery через transactional outbox.
+
+enqueue_task добавляет запись task_outbox в текущую транзакцию сессии:
+задача появится в брокере только если транзакция закоммичена, и
+обязательно появится, даже если процесс API упадёт сразу после commit.
+Отправку делает relay (worker.outbox_relay); pg_notify будит его сразу
+после commit, не дожидаясь очередного опроса. Вместе с задачей
+сохраняется контекст trace (app.core.tracing).
+"""
+import uuid
+from datetime import timedelta
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.ids import uuid7
+from app.core.tracing import trace_headers
+from app.models.task_outbox import TaskOutbox
+
+OUTBOX_CHANNEL = 'task_outbox'
+
+
+def enqueue_task(db: Session,
+                 task_name: str,
+                 *,
+                 args: list,
+                 queue: str | None = None,
+                 delay_seconds: float = 0) -> TaskOutbox:
+    """Добавляет задачу в outbox; отправится после db.commit().
+
+    delay_seconds откладывает отправку: так синхронный импорт страхуется
+    задачей, которая уйдёт в брокер, только если API не успел её удалить.
+    """
+    message = TaskOutbox(id=uuid7(), task_name=task_name, args=args,
+                         queue=queue, headers=trace_headers())
+    if delay_seconds:
+        message.available_at = func.now() + timedelta(seconds=delay_seconds)
+    db.add(message)
+    if not delay_seconds:
+        db.execute(select(func.pg_notify(OUTBOX_CHANNEL, '')))
+    return message
+
+
+def discard_task(db: Session, message_id: uuid.UUID) -> None:
+    """Удаляет ещё не отправленную задачу из outbox."""
+    db.execute(delete(TaskOutbox).where(TaskOutbox.id == message_id))
+
+
+def release_task(db: Session, message_id: uuid.UUID) -> None:
+    """Отправляет отложенную задачу сейчас, не дожидаясь available_at."""
+    db.execute(update(TaskOutbox)
+               .where(TaskOutbox.id == message_id)
+               .values(available_at=func.now()))
+    db.execute(select(func.pg_notify(OUTBOX_CHANNEL, '')))
+
+
+def discard_job_tasks(db: Session, task_name: str, job_id: uuid.UUID) -> None:
+    """Удаляет неотправленные задачи task_name для job (args[0] — id)."""
+    db.execute(delete(TaskOutbox).where(
+        TaskOutbox.task_name == task_name,
+        TaskOutbox.args[0].astext == str(job_id),
+    ))
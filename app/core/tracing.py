@@ -0,0 +1,141 @@
+"""Трассировка OpenTelemetry: POST /imports -> outbox -> брокер -> воркер.
+
+init_tracing вызывается в каждом процессе (API, дочерний процесс воркера,
+relay) и настраивает exporter по TRACING_EXPORTER:
+    - otlp: OTLP/HTTP, адрес и заголовки — стандартные переменные SDK
+      (OTEL_EXPORTER_OTLP_ENDPOINT и т.п.);
+    - file: span'ы JSON-строками в TRACING_FILE_PATH (тесты, локальный
+      разбор);
+    - none: без exporter'а, span'ы не записываются.
+
+Контекст едет вместе с задачей: enqueue_task сохраняет traceparent в
+заголовки записи outbox (trace_headers), relay продолжает trace span'ом
+публикации и кладёт заголовки в сообщение Celery, воркер открывает span
+задачи (task_span) дочерним к нему. Время от постановки задачи до начала
+выполнения — атрибут queue.wait_seconds.
+"""
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from celery.exceptions import Retry
+from opentelemetry import propagate, trace
+from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+    OTLPSpanExporter,
+)
+from opentelemetry.sdk.resources import SERVICE_NAME, Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    ConsoleSpanExporter,
+    SpanExporter,
+)
+from opentelemetry.trace import SpanKind, Status, StatusCode
+
+from app.core.config import settings
+
+tracer = trace.get_tracer('bulk_import')
+
+ENQUEUED_AT_HEADER = 'enqueued_at'
+
+_provider: TracerProvider | None = None
+
+
+def _exporter() -> SpanExporter:
+    if settings.tracing_exporter == 'otlp':
+        return OTLPSpanExporter()
+    out = open(settings.tracing_file_path, 'a', encoding='utf-8')
+    return ConsoleSpanExporter(
+        out=out,
+        formatter=lambda span: span.to_json(indent=None) + os.linesep)
+
+
+def init_tracing(service_name: str) -> None:
+    """Настраивает провайдер span'ов процесса (один раз на процесс)."""
+    global _provider
+
+    if settings.tracing_exporter == 'none' or _provider is not None:
+        return
+    _provider = TracerProvider(
+        resource=Resource.create({SERVICE_NAME: service_name}))
+    _provider.add_span_processor(BatchSpanProcessor(_exporter()))
+    trace.set_tracer_provider(_provider)
+
+
+def shutdown_tracing() -> None:
+    """Отправляет накопленные span'ы (дочерний процесс Celery без atexit)."""
+    if _provider is not None:
+        _provider.shutdown()
+
+
+def trace_headers() -> dict | None:
+    """Заголовки текущего trace для задачи; None вне span'а."""
+    headers: dict = {}
+    propagate.inject(headers)
+    if not headers:
+        return None
+    headers[ENQUEUED_AT_HEADER] = time.time()
+    return headers
+
+
+@contextmanager
+def publish_span(headers: dict | None,
+                 task_name: str) -> Iterator[dict | None]:
+    """Span отправки задачи relay'ем; отдаёт заголовки для сообщения."""
+    if not headers:
+        yield headers
+        return
+    with tracer.start_as_current_span(
+            'outbox.publish',
+            context=propagate.extract(headers),
+            kind=SpanKind.PRODUCER,
+            attributes={'celery.task_name': task_name}) as span:
+        if not span.get_span_context().is_valid:
+            # трассировка relay выключена: trace продолжит воркер
+            yield headers
+            return
+        published = {ENQUEUED_AT_HEADER: headers.get(ENQUEUED_AT_HEADER)}
+        propagate.inject(published)
+        yield published
+
+
+def _request_headers(request) -> dict:
+    # пользовательские заголовки Celery попадают и в request.headers, и
+    # атрибутами request (зависит от версии протокола)
+    headers = dict(getattr(request, 'headers', None) or {})
+    for name in (*propagate.get_global_textmap().fields,
+                 ENQUEUED_AT_HEADER):
+        value = getattr(request, name, None)
+        if value is not None:
+            headers.setdefault(name, value)
+    return headers
+
+
+@contextmanager
+def task_span(name: str, request, **attributes) -> Iterator[trace.Span]:
+    """Span выполнения задачи Celery, продолжающий trace отправителя.
+
+    self.retry (Retry) ошибкой не считается: задача отложена.
+    """
+    headers = _request_headers(request)
+    with tracer.start_as_current_span(
+            name,
+            context=propagate.extract(headers),
+            kind=SpanKind.CONSUMER,
+            attributes=attributes,
+            record_exception=False,
+            set_status_on_exception=False) as span:
+        enqueued_at = headers.get(ENQUEUED_AT_HEADER)
+        if enqueued_at:
+            span.set_attribute('queue.wait_seconds',
+                               round(time.time() - float(enqueued_at), 3))
+        try:
+            yield span
+        except Retry:
+            span.set_attribute('celery.retry', True)
+            raise
+        except Exception as error:
+            span.record_exception(error)
+            span.set_status(Status(StatusCode.ERROR, str(error)))
+            raise
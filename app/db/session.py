@@ -1,14 +1,96 @@
-from sqlalchemy import create_engine
+"""Engine и фабрика сессий.
+
+Engine создаётся не при импорте, а в процессе, который будет им
+пользоваться: API — в lifespan, воркер Celery — в worker_process_init
+каждого дочернего процесса prefork (соединения пула не переживают
+fork()). SessionLocal создаёт engine лениво, если процесс не вызвал
+init_engine сам (solo-пул, скрипты).
+
+Пулы API и воркера настраиваются отдельно (DB_* и WORKER_DB_*).
+Повторяющиеся запросы (запись батча, прогресс job) psycopg готовит на
+соединении после DB_PREPARE_THRESHOLD выполнений и дальше шлёт только
+параметры; DB_PREPARE_THRESHOLD=0 отключает prepared statements (PgBouncer
+в режиме transaction без max_prepared_statements).
+"""
+from typing import Literal
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
 
-engine = create_engine(
-    settings.database_url,
-    pool_pre_ping=True
-)
-SessionLocal = sessionmaker(
-    bind=engine,
+EngineRole = Literal['api', 'worker']
+
+_engine: Engine | None = None
+_role: EngineRole = 'api'
+
+
+def _pool_options(role: EngineRole) -> dict:
+    if role == 'worker':
+        return {
+            'pool_size': settings.worker_db_pool_size,
+            'max_overflow': settings.worker_db_max_overflow,
+            'pool_timeout': settings.worker_db_pool_timeout,
+            'pool_recycle': settings.worker_db_pool_recycle,
+        }
+    return {
+        'pool_size': settings.db_pool_size,
+        'max_overflow': settings.db_max_overflow,
+        'pool_timeout': settings.db_pool_timeout,
+        'pool_recycle': settings.db_pool_recycle,
+    }
+
+
+def _configure_connection(dbapi_connection, connection_record) -> None:
+    threshold = settings.db_prepare_threshold
+    dbapi_connection.prepare_threshold = threshold or None
+    dbapi_connection.prepared_max = settings.db_prepared_max
+
+
+def set_engine_role(role: EngineRole) -> None:
+    """Роль, с которой SessionLocal лениво создаст engine."""
+    global _role
+    _role = role
+
+
+def init_engine(role: EngineRole | None = None) -> Engine:
+    """Создаёт engine процесса и привязывает к нему SessionLocal.
+
+    Унаследованный через fork() engine не закрывает соединения родителя
+    (dispose(close=False)), а просто забывает их.
+    """
+    global _engine
+    if role is not None:
+        set_engine_role(role)
+    if _engine is not None:
+        _engine.dispose(close=False)
+
+    _engine = create_engine(settings.database_url,
+                            pool_pre_ping=True,
+                            **_pool_options(_role))
+    event.listen(_engine, 'connect', _configure_connection)
+    SessionLocal.configure(bind=_engine)
+    return _engine
+
+
+def get_engine() -> Engine:
+    if _engine is None:
+        return init_engine()
+    return _engine
+
+
+class _LazySessionMaker(sessionmaker):
+    """sessionmaker, создающий engine при первой сессии процесса."""
+
+    def __call__(self, **local_kw):
+        """Создаёт сессию, при необходимости сначала engine."""
+        if self.kw.get('bind') is None:
+            get_engine()
+        return super().__call__(**local_kw)
+
+
+SessionLocal = _LazySessionMaker(
     autoflush=False,
     autocommit=False
 )
@@ -1,13 +1,29 @@
+from contextlib import asynccontextmanager
+
 import sqlalchemy as sa
 from fastapi import Depends, FastAPI, HTTPException
 from sqlalchemy.orm import Session
 
-from app.api.routers import auth, imports
-from app.db.session import get_db
+from app.api.routers import auth, customers, exports, imports
+from app.core.events import job_events
+from app.core.tracing import init_tracing, shutdown_tracing
+from app.db.session import get_db, init_engine
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_engine('api')
+    init_tracing('bulk-import-api')
+    yield
+    await job_events.close()
+    shutdown_tracing()
+
 
-app = FastAPI(title='Bulk Import Service')
+app = FastAPI(title='Bulk Import Service', lifespan=lifespan)
 app.include_router(auth.router)
 app.include_router(imports.router)
+app.include_router(customers.router)
+app.include_router(exports.router)
 app.router.redirect_slashes = False
 
 
@@ -9,12 +9,19 @@ from app.db.base import Base
 
 
 class Customer(Base):
+    """Клиент, загруженный импортом.
+
+    Индексы под GET /customers: поиск по префиксу email/last_name
+    (lower(...) text_pattern_ops — LIKE 'abc%' без учёта collation),
+    city — равенство с порядком (created_at, id) для keyset-пагинации.
+    """
+
     __tablename__ = 'customers'
 
     id: Mapped[uuid.UUID] = mapped_column(
         sa.Uuid(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4
+        server_default=sa.text('uuid_generate_v7()')
     )
     email: Mapped[str] = mapped_column(
         String(320),
@@ -43,3 +50,12 @@ class Customer(Base):
         onupdate=sa.func.now(),
         nullable=False
     )
+    __table_args__ = (
+        sa.Index('ix_customers_created_at_id', 'created_at', 'id'),
+        sa.Index('ix_customers_email_lower_pattern',
+                 sa.text('lower(email) text_pattern_ops')),
+        sa.Index('ix_customers_last_name_lower_pattern',
+                 sa.text('lower(last_name) text_pattern_ops')),
+        sa.Index('ix_customers_city_lower_created_at_id',
+                 sa.func.lower(city), 'created_at', 'id'),
+    )
@@ -0,0 +1,68 @@
+import uuid
+from datetime import datetime
+
+import sqlalchemy as sa
+from sqlalchemy import BigInteger, Boolean, DateTime, Enum, String, Text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.ids import uuid7
+from app.db.base import Base
+from app.models.import_job import JobStatus
+
+
+class ExportJob(Base):
+    """Задача экспорта customers в CSV.
+
+    filters — фильтры как у GET /customers; воркер стримит выборку через
+    COPY TO STDOUT в S3 (object_key), прогресс — exported_rows и
+    bytes_written.
+    """
+
+    __tablename__ = 'export_jobs'
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        sa.Uuid(as_uuid=True),
+        primary_key=True,
+        default=uuid7,
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        sa.Uuid(as_uuid=True),
+        sa.ForeignKey('users.id', ondelete='CASCADE'),
+        nullable=False,
+    )
+    status: Mapped[JobStatus] = mapped_column(
+        Enum(JobStatus, name='job_status'),
+        default=JobStatus.pending,
+        nullable=False,
+    )
+    filters: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    gzip: Mapped[bool] = mapped_column(
+        Boolean,
+        default=False,
+        nullable=False
+    )
+    object_key: Mapped[str | None] = mapped_column(
+        String(1024),
+        nullable=True
+    )
+    exported_rows: Mapped[int] = mapped_column(
+        BigInteger,
+        default=0,
+        nullable=False
+    )
+    bytes_written: Mapped[int] = mapped_column(
+        BigInteger,
+        default=0,
+        nullable=False
+    )
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=sa.func.now(),
+        nullable=False,
+    )
+    __table_args__ = (
+        sa.Index('ix_export_jobs_user_id_created_at_id',
+                 'user_id', 'created_at', 'id'),
+    )
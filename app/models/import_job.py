@@ -4,8 +4,10 @@ from datetime import datetime
 
 import sqlalchemy as sa
 from sqlalchemy import DateTime, Enum, Integer, String, Text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
+from app.core.ids import uuid7
 from app.db.base import Base
 
 
@@ -14,17 +16,19 @@ class JobStatus(str, enum.Enum):
     processing = 'processing'
     done = 'done'
     failed = 'failed'
+    cancelled = 'cancelled'
 
 
 class ImportMode(str, enum.Enum):
     insert_only = 'insert_only'
     upsert = 'upsert'
+    validate = 'validate'
 
 
 class ImportJob(Base):
     """Сущьность задачи импорта.
 
-    Хранит статус и прогресс выполнения, режим (insert_only/upsert),
+    Хранит статус и прогресс выполнения, режим (insert_only/upsert/validate),
       а также ключи лбьктов в S3 (исходный файл и error.csv).
     """
 
@@ -33,8 +37,8 @@ class ImportJob(Base):
     id: Mapped[uuid.UUID] = mapped_column(
         sa.Uuid(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4
-
+        default=uuid7,
+        server_default=sa.text('uuid_generate_v7()'),
     )
     status: Mapped[JobStatus] = mapped_column(
         Enum(JobStatus, name='job_status'),
@@ -43,6 +47,19 @@ class ImportJob(Base):
     )
     filename: Mapped[str] = mapped_column(String(255), nullable=False)
     s3_key: Mapped[str] = mapped_column(String(1024), nullable=False)
+    file_size: Mapped[int | None] = mapped_column(
+        sa.BigInteger,
+        nullable=True
+    )
+    content_sha256: Mapped[str | None] = mapped_column(
+        String(64),
+        nullable=True
+    )
+    duplicate_of_id: Mapped[uuid.UUID | None] = mapped_column(
+        sa.Uuid(as_uuid=True),
+        sa.ForeignKey('import_jobs.id', ondelete='SET NULL'),
+        nullable=True
+    )
 
     total_rows: Mapped[int] = mapped_column(
         Integer,
@@ -67,11 +84,36 @@ class ImportJob(Base):
         String(1024),
         nullable=True
     )
+    error_report_index_key: Mapped[str | None] = mapped_column(
+        String(1024),
+        nullable=True
+    )
+    error_stats: Mapped[dict | None] = mapped_column(
+        JSONB,
+        nullable=True
+    )
     error_count: Mapped[int] = mapped_column(
         Integer,
         default=0,
         nullable=False
     )
+    timings: Mapped[dict | None] = mapped_column(
+        JSONB,
+        nullable=True
+    )
+    flush_retries: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        nullable=False
+    )
+    would_insert_rows: Mapped[int | None] = mapped_column(
+        Integer,
+        nullable=True
+    )
+    would_update_rows: Mapped[int | None] = mapped_column(
+        Integer,
+        nullable=True
+    )
     user_id = sa.Column(
         sa.UUID(as_uuid=True),
         sa.ForeignKey("users.id", ondelete="CASCADE"),
@@ -83,4 +125,12 @@ class ImportJob(Base):
         sa.UniqueConstraint('user_id',
                             'idempotency_key',
                             name='uq_import_jobs_user_id_idempotency_key'
-                            ),)
+                            ),
+        sa.Index('ix_import_jobs_user_id_content_sha256',
+                 'user_id',
+                 'content_sha256'),
+        sa.Index('ix_import_jobs_user_id_created_at_id',
+                 'user_id',
+                 'created_at',
+                 'id'),
+    )
@@ -0,0 +1,51 @@
+import uuid
+from datetime import datetime
+
+import sqlalchemy as sa
+from sqlalchemy import DateTime, Integer, String, Text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.ids import uuid7
+from app.db.base import Base
+
+
+class TaskOutbox(Base):
+    """Задача Celery, ожидающая отправки в брокер.
+
+    Пишется в одной транзакции с ImportJob; relay (worker.outbox_relay)
+    отправляет записи в брокер и удаляет их. Неудачная отправка
+    откладывает запись до available_at.
+    """
+
+    __tablename__ = 'task_outbox'
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        sa.Uuid(as_uuid=True),
+        primary_key=True,
+        default=uuid7,
+    )
+    task_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    args: Mapped[list] = mapped_column(JSONB, nullable=False)
+    queue: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    # заголовки сообщения Celery: контекст trace отправителя
+    headers: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=sa.func.now(),
+        nullable=False,
+    )
+    available_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=sa.func.now(),
+        nullable=False,
+    )
+    attempts: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        nullable=False
+    )
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    __table_args__ = (
+        sa.Index('ix_task_outbox_available_at_id', 'available_at', 'id'),
+    )
@@ -0,0 +1,86 @@
+"""Адаптивный размер батча записи в БД.
+
+Оптимальный размер зависит от ширины строк, нагрузки на БД и режима
+(insert_only возвращает вставленные email, upsert обновляет строки),
+поэтому один глобальный BATCH_SIZE не подходит всем. Контроллер меряет
+каждый flush и подгоняет размер так, чтобы время записи батча держалось
+около BATCH_TARGET_MS.
+"""
+import math
+
+from app.core.config import settings
+
+# размер меняется не больше чем в MAX_STEP раз за один flush
+MAX_STEP = 2.0
+
+
+class AdaptiveBatchSize:
+    """Размер батча по времени flush, в пределах [min_size, max_size].
+
+    После каждого полного батча размер умножается на
+    sqrt(target / elapsed) (корень гасит колебания), шаг ограничен MAX_STEP.
+    Неполный (последний) батч учитывается в статистике, но размер не
+    меняет. Со статистикой размеров и скорости — timings() для job.
+    """
+
+    __slots__ = ('size', 'initial', 'min_size', 'max_size', 'target_s',
+                 'enabled', 'flushes', 'rows', 'seconds', 'smallest',
+                 'largest')
+
+    def __init__(self,
+                 size: int,
+                 *,
+                 min_size: int,
+                 max_size: int,
+                 target_ms: int,
+                 enabled: bool = True):
+        self.min_size = max(1, min_size)
+        self.max_size = max(self.min_size, max_size)
+        self.size = min(self.max_size, max(self.min_size, size))
+        self.initial = self.size
+        self.target_s = target_ms / 1000
+        self.enabled = enabled
+        self.flushes = 0
+        self.rows = 0
+        self.seconds = 0.0
+        self.smallest = self.size
+        self.largest = self.size
+
+    @classmethod
+    def from_settings(cls) -> 'AdaptiveBatchSize':
+        return cls(
+            settings.batch_size,
+            min_size=settings.batch_size_min,
+            max_size=settings.batch_size_max,
+            target_ms=settings.batch_target_ms,
+            enabled=settings.adaptive_batch,
+        )
+
+    def observe(self, rows: int, seconds: float) -> int:
+        """Учитывает flush батча из rows строк, возвращает новый размер."""
+        if not rows:
+            return self.size
+        self.flushes += 1
+        self.rows += rows
+        self.seconds += seconds
+
+        if self.enabled and rows >= self.size and seconds > 0:
+            factor = math.sqrt(self.target_s / seconds)
+            factor = min(MAX_STEP, max(1 / MAX_STEP, factor))
+            self.size = min(self.max_size,
+                            max(self.min_size, int(self.size * factor)))
+            self.smallest = min(self.smallest, self.size)
+            self.largest = max(self.largest, self.size)
+        return self.size
+
+    def timings(self) -> dict:
+        return {
+            'batch_size_initial': self.initial,
+            'batch_size_min': self.smallest,
+            'batch_size_max': self.largest,
+            'batch_size_last': self.size,
+            'flushes': self.flushes,
+            'flush_seconds': round(self.seconds, 3),
+            'flush_rows_per_sec': (
+                round(self.rows / self.seconds) if self.seconds else None),
+        }
@@ -0,0 +1,144 @@
+import csv
+import enum
+import io
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+REPORT_HEADER = ['row', 'error', 'raw']
+SUMMARY_LIMIT = 3
+
+
+class ErrorCode(str, enum.Enum):
+    empty_row = 'empty_row'
+    empty_email = 'empty_email'
+    invalid_email = 'invalid_email'
+    duplicate_in_file = 'duplicate_in_file'
+    already_exists = 'already_exists'
+    db_error = 'db_error'
+
+
+ERROR_CODES = tuple(ErrorCode)
+_CODE_INDEX = {code: i for i, code in enumerate(ERROR_CODES)}
+
+
+def describe_error(code: ErrorCode, email: str | None) -> str:
+    """Текст ошибки для errors.csv и краткой сводки job.error."""
+    if code == ErrorCode.empty_row:
+        return 'empty row'
+    if code == ErrorCode.empty_email:
+        return 'empty email'
+    if code == ErrorCode.invalid_email:
+        return f'invalid email "{email}"'
+    if code == ErrorCode.duplicate_in_file:
+        return f'duplicate email "{email}" in file'
+    if code == ErrorCode.already_exists:
+        return f'email already exists "{email}"'
+    return 'db error'
+
+
+@dataclass(frozen=True, slots=True)
+class ErrorRow:
+    row: int
+    error: str
+    raw: str
+
+
+def _raw_line(source, start: int, end: int) -> str:
+    """Исходная запись CSV байт-в-байт (без завершающего перевода строки)."""
+    raw = bytes(source[start:end])
+    if raw.endswith(b'\r\n'):
+        raw = raw[:-2]
+    elif raw.endswith((b'\n', b'\r')):
+        raw = raw[:-1]
+    return raw.decode('utf-8', errors='replace')
+
+
+def _raw_email(raw: str) -> str | None:
+    fields = next(csv.reader([raw]), None)
+    return fields[0].strip() if fields else None
+
+
+class ErrorCollector:
+    """Ошибки одного импорта в компактном виде.
+
+    На ошибочную строку хранится только (row, start, end, code) в array:
+    start/end — байтовые границы записи в исходном файле. Текст ошибки и
+    raw собираются из исходника только при построении отчёта (iter_rows).
+    head: первые SUMMARY_LIMIT сообщений для job.error,
+    counts: гистограмма по ErrorCode (сохраняется в job.error_stats).
+    """
+
+    __slots__ = ('row_nums', 'starts', 'ends', 'codes', 'head', 'counts')
+
+    def __init__(self):
+        self.row_nums = array('q')
+        self.starts = array('q')
+        self.ends = array('q')
+        self.codes = array('B')
+        self.head: list[str] = []
+        self.counts: Counter[str] = Counter()
+
+    def __len__(self) -> int:
+        """Общее число ошибочных строк."""
+        return len(self.row_nums)
+
+    def add(self,
+            row_num: int,
+            code: ErrorCode,
+            email: str | None,
+            start: int,
+            end: int) -> None:
+        self.counts[code.value] += 1
+        if len(self.head) < SUMMARY_LIMIT:
+            self.head.append(
+                f'row {row_num}: {describe_error(code, email)}')
+        self.row_nums.append(row_num)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.codes.append(_CODE_INDEX[code])
+
+    def entries(self) -> Iterator[tuple[int, ErrorCode, int, int]]:
+        """(row, code, start, end) в порядке добавления."""
+        for i in range(len(self)):
+            yield (self.row_nums[i], ERROR_CODES[self.codes[i]],
+                   self.starts[i], self.ends[i])
+
+    def stats(self) -> dict[str, int]:
+        return dict(self.counts)
+
+    def iter_rows(self, source) -> Iterator[ErrorRow]:
+        """Строки отчёта по номеру строки, raw — срез source."""
+        order = sorted(range(len(self)), key=self.row_nums.__getitem__)
+        for i in order:
+            raw = _raw_line(source, self.starts[i], self.ends[i])
+            code = ERROR_CODES[self.codes[i]]
+            yield ErrorRow(row=self.row_nums[i],
+                           error=describe_error(code, _raw_email(raw)),
+                           raw=raw)
+
+
+def build_errors_report(rows: Iterable[ErrorRow]) -> tuple[bytes, array]:
+    """Собирает errors.csv и индекс смещений строк.
+
+    offsets[i] — байтовое смещение i-й строки отчёта (без заголовка),
+    последний элемент — длина файла. По индексу API читает страницу
+    отчёта ranged GET'ом, не скачивая файл целиком.
+    """
+    out = bytearray()
+    offsets = array('q')
+    line = io.StringIO(newline='')
+    write = csv.writer(line)
+
+    write.writerow(REPORT_HEADER)
+    for r in rows:
+        out += line.getvalue().encode('utf-8')
+        offsets.append(len(out))
+        line.seek(0)
+        line.truncate()
+        write.writerow([r.row, r.error, r.raw])
+
+    out += line.getvalue().encode('utf-8')
+    offsets.append(len(out))
+    return bytes(out), offsets
@@ -0,0 +1,693 @@
+"""Конвейер импорта CSV: разбор → батчи в customers → errors.csv → job.
+
+Общий для задачи воркера (worker.celery_app) и синхронного импорта в API
+(app.api.sync_import): оба забирают job через claim_job и выполняют его
+execute_import, поэтому job и отчёт об ошибках у них не отличаются.
+Модуль не зависит от Celery.
+"""
+import csv
+import logging
+import random
+import re
+import time
+import uuid
+from array import array
+from contextlib import ExitStack, contextmanager, nullcontext
+from typing import Iterator
+
+import redis
+import sqlalchemy as sa
+from opentelemetry.trace import Span
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import DataError, DBAPIError, IntegrityError
+
+from app.core.cancellation import is_cancel_requested
+from app.core.config import settings
+from app.core.events import publish_job_event
+from app.core.tracing import tracer
+from app.models.customer import Customer
+from app.models.import_job import ImportJob, ImportMode, JobStatus
+from app.services.batching import AdaptiveBatchSize
+from app.services.errors_report import (
+    ErrorCode,
+    ErrorCollector,
+    build_errors_report,
+)
+from app.services.spool import SourceBuffer, spooled_upload
+from app.storage.errors_index import encode_offsets
+from app.storage.s3 import put_bytes
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_EVERY = settings.progress_every
+IMPORT_SLOW_MS = settings.import_slow_ms
+FLUSH_MAX_RETRIES = settings.flush_max_retries
+FLUSH_RETRY_BASE_MS = settings.flush_retry_base_ms
+FLUSH_RETRY_MAX_MS = settings.flush_retry_max_ms
+
+# deadlock_detected / serialization_failure: батч можно просто повторить.
+RETRYABLE_SQLSTATES = frozenset({'40P01', '40001'})
+
+
+# перевод строки: \r\n, \n или одиночный \r (как universal newlines)
+LINE_END = re.compile(rb'\r\n?|\n')
+
+
+def iter_csv_records(
+        data: SourceBuffer) -> Iterator[tuple[list[str], int, int]]:
+    """Записи CSV (без header) с байтовыми границами [start, end) в data.
+
+    Строки режутся регулярным выражением прямо по bytes/mmap, без копии
+    файла. csv.reader получает исходник построчно и не читает вперёд,
+    поэтому после каждой выданной записи end — ровно конец её последней
+    строки (записи с переводами строк внутри кавычек занимают несколько
+    строк).
+    """
+    end = 0
+
+    def lines() -> Iterator[str]:
+        nonlocal end
+        for match in LINE_END.finditer(data):
+            line, end = data[end:match.end()], match.end()
+            yield line.decode('utf-8', errors='replace')
+        if end < len(data):
+            line, end = data[end:], len(data)
+            yield line.decode('utf-8', errors='replace')
+
+    reader = csv.reader(lines())
+    next(reader, None)
+    start = end
+    for row in reader:
+        yield row, start, end
+        start = end
+
+
+def count_csv_rows(data: SourceBuffer) -> int:
+    """Число записей тем же разбором, что и при импорте."""
+    return sum(1 for _ in iter_csv_records(data))
+
+
+def _update_job(db, job_uuid: uuid.UUID, **fields) -> None:
+    db.execute(
+        update(ImportJob)
+        .where(ImportJob.id == job_uuid)
+        .values(**fields)
+    )
+    db.commit()
+    publish_job_event(job_uuid, fields)
+
+
+def _norm(s: str | None) -> str | None:
+    if s is None:
+        return None
+    s = s.strip()
+    return s or None
+
+
+CustomerFields = tuple[str, str | None, str | None, str | None, str | None]
+
+CUSTOMER_COLUMNS = ('email', 'first_name', 'last_name', 'phone', 'city')
+
+
+def parse_customer_row(
+        row: list[str]) -> tuple[CustomerFields | None, ErrorCode | None]:
+    """Разбирает строку CSV в кортеж полей (см. CUSTOMER_COLUMNS).
+
+    Кортеж вместо dict: в горячем цикле это одна аллокация на строку,
+    id генерирует БД (server_default).
+    """
+    if not row:
+        return None, ErrorCode.empty_row
+
+    email = _norm(row[0])
+    if not email:
+        return None, ErrorCode.empty_email
+
+    if '@' not in email or '.' not in email.split('@')[-1]:
+        return None, ErrorCode.invalid_email
+
+    size = len(row)
+    return (
+        email,
+        _norm(row[1]) if size > 1 else None,
+        _norm(row[2]) if size > 2 else None,
+        _norm(row[3]) if size > 3 else None,
+        _norm(row[4]) if size > 4 else None,
+    ), None
+
+
+class BatchBuffer:
+    """Колоночный буфер строк для пакетной записи в БД.
+
+    email/first_name/last_name/phone/city: по списку на колонку customers,
+    row_nums: номера строк исходного CSV (для errors.csv) в array('q'),
+    starts/ends: байтовые границы строк в исходнике (raw для errors.csv).
+    Flusher передаёт колонки в БД целиком, без dict на каждую строку.
+    """
+
+    __slots__ = ('size', 'email', 'first_name', 'last_name', 'phone',
+                 'city', 'row_nums', 'starts', 'ends')
+
+    def __init__(self, size: int):
+        self.size = size
+        self.email: list[str] = []
+        self.first_name: list[str | None] = []
+        self.last_name: list[str | None] = []
+        self.phone: list[str | None] = []
+        self.city: list[str | None] = []
+        self.row_nums = array('q')
+        self.starts = array('q')
+        self.ends = array('q')
+
+    def __len__(self) -> int:
+        """Количество строк в буфере."""
+        return len(self.row_nums)
+
+    def add(self,
+            fields: CustomerFields,
+            row_num: int,
+            start: int,
+            end: int) -> None:
+        email, first_name, last_name, phone, city = fields
+        self.email.append(email)
+        self.first_name.append(first_name)
+        self.last_name.append(last_name)
+        self.phone.append(phone)
+        self.city.append(city)
+        self.row_nums.append(row_num)
+        self.starts.append(start)
+        self.ends.append(end)
+
+    def columns(self) -> dict[str, list]:
+        return {name: getattr(self, name) for name in CUSTOMER_COLUMNS}
+
+    def full(self) -> bool:
+        return len(self.row_nums) >= self.size
+
+    def part(self, start: int, stop: int) -> 'BatchBuffer':
+        """Строки [start, stop) отдельным буфером (копии колонок)."""
+        part = BatchBuffer(self.size)
+        for name in (*CUSTOMER_COLUMNS, 'row_nums', 'starts', 'ends'):
+            setattr(part, name, getattr(self, name)[start:stop])
+        return part
+
+    def clear(self) -> None:
+        for name in CUSTOMER_COLUMNS:
+            getattr(self, name).clear()
+        del self.row_nums[:]
+        del self.starts[:]
+        del self.ends[:]
+
+
+def _text_array(name: str, values: list) -> sa.BindParameter:
+    return sa.bindparam(f'{name}_col', values, type_=ARRAY(sa.Text))
+
+
+def insert_customers_from_columns(columns: dict[str, list]):
+    """Строит INSERT ... SELECT FROM unnest(...) по колонкам батча.
+
+    Каждая колонка уходит в БД одним массивом, поэтому число bind
+    параметров не зависит от размера батча. Строки вставляются в порядке
+    email: конкурентные импорты берут блокировки уникального индекса в
+    одном и том же порядке и не упираются в deadlock.
+    """
+    rows = sa.func.unnest(
+        *(_text_array(name, values) for name, values in columns.items())
+    ).table_valued(*columns).render_derived()
+    return pg_insert(Customer).from_select(
+        list(columns),
+        select(*(rows.c[name] for name in columns)).order_by(rows.c.email),
+        include_defaults=False,
+    )
+
+
+def existing_emails_query(emails: list[str]) -> sa.Select:
+    return select(Customer.email).where(
+        Customer.email == sa.any_(_text_array('email', emails)))
+
+
+class UpsertFlusher:
+    """Запись в режиме upsert.
+
+    Реализован через PostgreSQL INSERT ... ON CONFLICT(email) DO UPDATE.
+    Дубли в файле могут считаться ошибками.
+    """
+
+    __slots__ = ()
+
+    def flush(
+        self,
+        db,
+        buffer: BatchBuffer,
+        errors: ErrorCollector,
+    ) -> None:
+        if not len(buffer):
+            return
+
+        stmt = insert_customers_from_columns(buffer.columns())
+
+        # обновляем поля, но НЕ трогаем id/email
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Customer.email],
+            set_={
+                'first_name': stmt.excluded.first_name,
+                'last_name': stmt.excluded.last_name,
+                'phone': stmt.excluded.phone,
+                'city': stmt.excluded.city,
+            },
+        )
+
+        db.execute(stmt)
+        db.commit()
+
+
+class InsertOnlyFlusher:
+    """Запись в режиме Insert_only.
+
+    Правило: если email уже есть в БД или повторяется в самом файле:
+      строка попадает в errors, остальные строки вставляются.
+    INSERT ... ON CONFLICT (email) DO NOTHING RETURNING email: строки,
+    которые не вернулись, уже есть в БД (в т.ч. вставлены параллельным
+    импортом после начала батча) — already_exists, без unique violation.
+    """
+
+    __slots__ = ()
+
+    def flush(
+        self,
+        db,
+        buffer: BatchBuffer,
+        errors: ErrorCollector,
+    ) -> None:
+        if not len(buffer):
+            return
+
+        columns = buffer.columns()
+        stmt = insert_customers_from_columns(columns).on_conflict_do_nothing(
+            index_elements=[Customer.email],
+        ).returning(Customer.email)
+        inserted = set(db.execute(stmt).scalars().all())
+        db.commit()
+
+        # ошибки фиксируем только после commit: повтор батча после
+        # deadlock не должен задваивать их в отчёте.
+        if len(inserted) == len(buffer):
+            return
+        for i, email in enumerate(columns['email']):
+            if email in inserted:
+                continue
+            errors.add(buffer.row_nums[i], ErrorCode.already_exists, email,
+                       buffer.starts[i], buffer.ends[i])
+
+
+class ValidateFlusher:
+    """Dry-run режим validate: в customers ничего не пишется.
+
+    На батч выполняется один read-only SELECT по email = ANY(...):
+    существующие email считаются как would_update, новые как would_insert.
+    Транзакция READ ONLY не берёт блокировок на запись и не пишет WAL.
+    """
+
+    __slots__ = ('would_insert', 'would_update')
+
+    def __init__(self):
+        self.would_insert = 0
+        self.would_update = 0
+
+    def flush(
+        self,
+        db,
+        buffer: BatchBuffer,
+        errors: ErrorCollector,
+    ) -> None:
+        if not len(buffer):
+            return
+
+        db.execute(sa.text('SET TRANSACTION READ ONLY'))
+        existing = db.execute(
+            select(sa.func.count()).select_from(
+                existing_emails_query(buffer.email).subquery())
+        ).scalar_one()
+        db.commit()
+
+        self.would_update += existing
+        self.would_insert += len(buffer) - existing
+
+
+def get_flusher(mode: ImportMode):
+    if mode == ImportMode.validate:
+        return ValidateFlusher()
+    if mode == ImportMode.insert_only:
+        return InsertOnlyFlusher()
+    return UpsertFlusher()
+
+
+def _retry_delay(attempt: int) -> float:
+    """Full jitter: случайная пауза до base * 2^attempt (с потолком)."""
+    cap_ms = min(FLUSH_RETRY_MAX_MS, FLUSH_RETRY_BASE_MS * 2 ** attempt)
+    return random.uniform(0, cap_ms) / 1000
+
+
+def flush_with_retry(db,
+                     flusher,
+                     buffer: BatchBuffer,
+                     errors: ErrorCollector) -> int:
+    """Пишет батч, повторяя его при deadlock/serialization failure.
+
+    Батч коммитится целиком, поэтому после rollback его можно безопасно
+    записать ещё раз. Возвращает число сделанных повторов.
+    """
+    attempt = 0
+    with tracer.start_as_current_span(
+            'import.flush',
+            attributes={'import.batch_rows': len(buffer)}) as span:
+        while True:
+            try:
+                flusher.flush(db, buffer, errors)
+                span.set_attribute('import.flush_retries', attempt)
+                return attempt
+            except DBAPIError as error:
+                db.rollback()
+                sqlstate = getattr(error.orig, 'sqlstate', None)
+                if (sqlstate not in RETRYABLE_SQLSTATES
+                        or attempt >= FLUSH_MAX_RETRIES):
+                    raise
+                attempt += 1
+                logger.warning('Batch flush retry %s (sqlstate=%s)',
+                               attempt, sqlstate)
+                time.sleep(_retry_delay(attempt))
+
+
+def _reject_batch(buffer: BatchBuffer,
+                  errors: ErrorCollector,
+                  error: DBAPIError) -> None:
+    """Помечает все строки батча, отвергнутого БД, как db_error."""
+    logger.warning('Batch rejected by DB: %s', type(error.orig).__name__)
+    for i, rn in enumerate(buffer.row_nums):
+        errors.add(rn, ErrorCode.db_error, buffer.email[i],
+                   buffer.starts[i], buffer.ends[i])
+
+
+def flush_with_bisect(db,
+                      flusher,
+                      buffer: BatchBuffer,
+                      errors: ErrorCollector) -> int:
+    """Пишет батч; отвергнутый БД батч пишется половинами.
+
+    IntegrityError/DataError одной строки откатывает весь батч, поэтому
+    он делится пополам, пока плохие строки не останутся поодиночке:
+    db_error получают только они, остальные строки записываются.
+    k плохих строк стоят O(k * log(len(buffer))) лишних транзакций.
+    Возвращает число повторов flush_with_retry.
+    """
+    try:
+        return flush_with_retry(db, flusher, buffer, errors)
+    except (IntegrityError, DataError) as error:
+        if len(buffer) == 1:
+            _reject_batch(buffer, errors, error)
+            return 0
+    middle = len(buffer) // 2
+    return (flush_with_bisect(db, flusher, buffer.part(0, middle), errors)
+            + flush_with_bisect(db, flusher,
+                                buffer.part(middle, len(buffer)), errors))
+
+
+def _flush_batch(db,
+                 job_uuid: uuid.UUID,
+                 flusher,
+                 buffer: BatchBuffer,
+                 errors: ErrorCollector,
+                 batch_size: AdaptiveBatchSize) -> None:
+    """Пишет батч; строки, которые БД не принимает, уходят в отчёт.
+
+    Ошибки данных (IntegrityError/DataError) разбираются делением батча
+    (flush_with_bisect), остальные ошибки БД (соединение и т.п.)
+    пробрасываются и валят job. Время записи передаётся в batch_size,
+    который задаёт размер следующего батча.
+    """
+    started = time.perf_counter()
+    retries = flush_with_bisect(db, flusher, buffer, errors)
+    buffer.size = batch_size.observe(len(buffer),
+                                     time.perf_counter() - started)
+    buffer.clear()
+    if retries:
+        _update_job(db, job_uuid,
+                    flush_retries=ImportJob.flush_retries + retries)
+
+
+def _short_error_summary(errors_head: list[str],
+                         total: int,
+                         limit: int = 3) -> str:
+    if total == 0:
+        return ''
+    head = ' | '.join(errors_head[:limit])
+    if total > limit:
+        return f'errors: {total}; first: {head} ...'
+    return f'errors: {total}; first: {head}'
+
+
+JobMeta = tuple[str, ImportMode, uuid.UUID, JobStatus, int | None]
+
+
+def load_job_meta(db, job_uuid: uuid.UUID) -> JobMeta | None:
+    row = db.execute(
+        select(ImportJob.s3_key, ImportJob.mode, ImportJob.user_id,
+               ImportJob.status, ImportJob.file_size)
+        .where(ImportJob.id == job_uuid)
+    ).one_or_none()
+    if row is None:
+        return None
+    return row[0], row[1], row[2], row[3], row[4]
+
+
+def mark_failed(db, job_uuid: uuid.UUID, err: Exception) -> None:
+    db.rollback()
+    _update_job(
+        db,
+        job_uuid,
+        status=JobStatus.failed,
+        error=f'{type(err).__name__}: {err}',
+    )
+
+
+def row_email(row: list[str]) -> str | None:
+    return row[0].strip() if row else None
+
+
+def cancel_requested(job_uuid: uuid.UUID) -> bool:
+    try:
+        return is_cancel_requested(job_uuid)
+    except redis.RedisError:
+        logger.warning('Cannot check cancel flag: %s', job_uuid)
+        return False
+
+
+def process_csv(db,
+                job_uuid: uuid.UUID,
+                data: SourceBuffer,
+                flusher) -> tuple[int, ErrorCollector, dict, bool]:
+    """Разбирает CSV и пишет строки батчами.
+
+    Флаг отмены проверяется перед записью батча и на отметках прогресса.
+    При отмене незаписанный батч отбрасывается, его строки не входят в
+    processed. Возвращает (processed, errors, timings, cancelled).
+    """
+    processed = 0
+    errors = ErrorCollector()
+    seen_emails: set[str] = set()
+    batch_size = AdaptiveBatchSize.from_settings()
+    buffer = BatchBuffer(batch_size.size)
+
+    records = iter_csv_records(data)
+    for row_num, (row, start, end) in enumerate(records, start=1):
+        processed += 1
+        fields, code = parse_customer_row(row)
+
+        if code is None and fields[0] in seen_emails:
+            code = ErrorCode.duplicate_in_file
+
+        if code is not None:
+            errors.add(row_num, code, row_email(row), start, end)
+        else:
+            seen_emails.add(fields[0])
+            buffer.add(fields, row_num, start, end)
+
+        if IMPORT_SLOW_MS:
+            time.sleep(IMPORT_SLOW_MS / 1000)
+
+        at_progress = processed % PROGRESS_EVERY == 0
+        if at_progress:
+            _update_job(db, job_uuid, processed_rows=processed)
+
+        if (at_progress or buffer.full()) and cancel_requested(job_uuid):
+            return (processed - len(buffer), errors, batch_size.timings(),
+                    True)
+
+        if buffer.full():
+            _flush_batch(db, job_uuid, flusher, buffer, errors, batch_size)
+
+    _flush_batch(db, job_uuid, flusher, buffer, errors, batch_size)
+
+    return processed, errors, batch_size.timings(), False
+
+
+def upload_errors_report(job_uuid: uuid.UUID,
+                         errors: ErrorCollector,
+                         source: SourceBuffer) -> dict:
+    """Загружает errors.csv и его индекс строк, возвращает поля job.
+
+    raw-строки берутся срезами source, поэтому отчёт собирается, пока
+    исходник ещё отображён в память.
+    """
+    with tracer.start_as_current_span('import.report.build'):
+        report, offsets = build_errors_report(errors.iter_rows(source))
+    with tracer.start_as_current_span('import.report.upload'):
+        report_key = put_bytes(report, filename=f'errors_{job_uuid}.csv')
+        index_key = put_bytes(encode_offsets(offsets),
+                              filename=f'errors_{job_uuid}.idx')
+    return {
+        'error_report_object_key': report_key,
+        'error_report_index_key': index_key,
+    }
+
+
+CLAIM_FIELDS = {'status': JobStatus.processing, 'error': None,
+                'processed_rows': 0}
+
+
+def claim_job(db, job_uuid: uuid.UUID) -> bool:
+    """Переводит job из pending в processing; False — уже взят.
+
+    Outbox доставляет задачу at-least-once: повторное сообщение для job,
+    который уже обрабатывается или завершён, не запускает импорт снова.
+    """
+    claimed = db.execute(
+        update(ImportJob)
+        .where(ImportJob.id == job_uuid,
+               ImportJob.status == JobStatus.pending)
+        .values(**CLAIM_FIELDS)
+        .returning(ImportJob.id)
+    ).scalar_one_or_none()
+    db.commit()
+    if claimed is None:
+        return False
+    publish_job_event(job_uuid, CLAIM_FIELDS)
+    return True
+
+
+def run_import(db,
+               job_uuid: uuid.UUID,
+               s3_key: str,
+               mode: ImportMode,
+               *,
+               source: SourceBuffer | None = None) -> None:
+    """Импортирует файл job; source — уже прочитанный файл (без S3)."""
+    timings = {}
+
+    @contextmanager
+    def phase(name: str) -> Iterator[Span]:
+        # фаза импорта: span import.<name> и <name>_seconds в timings
+        started = time.perf_counter()
+        with tracer.start_as_current_span(f'import.{name}') as span:
+            yield span
+        timings[f'{name}_seconds'] = round(time.perf_counter() - started, 3)
+
+    opened = nullcontext(source) if source is not None else spooled_upload(
+        s3_key)
+    with ExitStack() as stack:
+        with phase('download'):
+            data = stack.enter_context(opened)
+        with phase('count') as span:
+            total = count_csv_rows(data=data)
+            span.set_attribute('import.total_rows', total)
+            _update_job(db, job_uuid, total_rows=total, processed_rows=0)
+
+        flusher = get_flusher(mode)
+        with phase('process'):
+            processed, errors, batch_timings, cancelled = process_csv(
+                db, job_uuid, data, flusher)
+        timings.update(batch_timings)
+
+        with phase('report'):
+            extra = errors_report_fields(job_uuid, errors, data)
+
+    if mode == ImportMode.validate:
+        extra.update(
+            would_insert_rows=flusher.would_insert,
+            would_update_rows=flusher.would_update,
+        )
+
+    finish_job(db, job_uuid, processed=processed, errors=errors,
+               timings=timings, cancelled=cancelled, **extra)
+
+
+def errors_report_fields(job_uuid: uuid.UUID,
+                         errors: ErrorCollector,
+                         source: SourceBuffer) -> dict:
+    """Поля отчёта об ошибках для финального обновления job."""
+    if not len(errors):
+        return {
+            'error_report_object_key': None,
+            'error_report_index_key': None,
+        }
+    return upload_errors_report(job_uuid, errors, source)
+
+
+def finish_job(db,
+               job_uuid: uuid.UUID,
+               *,
+               processed: int,
+               errors: ErrorCollector,
+               timings: dict,
+               cancelled: bool = False,
+               **extra) -> None:
+    """Финальное обновление job: статус, счётчики, сводка ошибок.
+
+    cancelled: импорт остановлен по запросу — статус cancelled, счётчики
+    и отчёт об ошибках частичные.
+    """
+    error_count = len(errors)
+    final_status = JobStatus.done if error_count == 0 else JobStatus.failed
+    if cancelled:
+        final_status = JobStatus.cancelled
+    final_error = None if error_count == 0 else _short_error_summary(
+        errors.head, total=error_count)
+
+    _update_job(
+        db,
+        job_uuid,
+        processed_rows=processed,
+        status=final_status,
+        error=final_error,
+        error_count=error_count,
+        error_stats=errors.stats(),
+        timings=timings,
+        **extra,
+    )
+
+
+def execute_import(db,
+                   job_uuid: uuid.UUID,
+                   s3_key: str,
+                   mode: ImportMode,
+                   *,
+                   source: SourceBuffer | None = None,
+                   claimed: bool = False) -> str:
+    """Забирает job и выполняет импорт; ошибка помечает job failed.
+
+    Общая часть задачи process_import и синхронного импорта в API;
+    claimed=True — claim_job уже сделан вызывающим.
+    """
+    if not claimed and not claim_job(db, job_uuid):
+        logger.info('ImportJob already claimed: %s', job_uuid)
+        return 'already_claimed'
+
+    try:
+        run_import(db, job_uuid, s3_key, mode, source=source)
+        return 'ok'
+    except Exception as e:
+        mark_failed(db, job_uuid, e)
+        logger.exception('Import failed: %s', job_uuid)
+        raise
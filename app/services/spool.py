@@ -0,0 +1,43 @@
+"""Локальный spool загрузок для воркера.
+
+Файл из S3 скачивается во временный файл на диске и отображается в память
+через mmap (только чтение). Парсинг идёт прямо по отображению, поэтому
+резидентная память воркера не растёт с размером файла: страницы держит
+и вытесняет page cache ОС.
+"""
+import mmap
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator
+
+from app.core.config import settings
+from app.storage.s3 import download_to_file
+
+SourceBuffer = bytes | mmap.mmap
+
+
+@contextmanager
+def spooled_upload(key: str) -> Iterator[SourceBuffer]:
+    """Скачивает объект S3 во временный файл и отдаёт его mmap.
+
+    Файл удаляется при выходе из контекста (и ОС при падении процесса:
+    TemporaryFile не имеет имени в файловой системе).
+    """
+    with tempfile.TemporaryFile(prefix='import_',
+                                dir=settings.worker_spool_dir) as spool:
+        download_to_file(key, spool)
+        spool.flush()
+        if os.fstat(spool.fileno()).st_size == 0:
+            yield b''
+            return
+        mm = mmap.mmap(spool.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield mm
+        finally:
+            try:
+                mm.close()
+            except BufferError:
+                # недочитанный генератор строк (падение посреди импорта)
+                # ещё держит буфер mmap; отображение освободит GC.
+                pass
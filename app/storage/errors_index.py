@@ -0,0 +1,55 @@
+"""Индекс строк errors.csv для постраничного чтения отчёта.
+
+Индекс — массив int64 (little-endian) байтовых смещений строк отчёта
+без заголовка, последний элемент — длина файла. Страница [offset, limit)
+читается двумя ranged GET: кусок индекса и ровно нужные байты отчёта.
+"""
+import csv
+import io
+import sys
+from array import array
+
+from app.storage.s3 import get_range
+
+OFFSET_SIZE = array('q').itemsize
+
+
+def encode_offsets(offsets: array) -> bytes:
+    if sys.byteorder != 'little':
+        offsets = array('q', offsets)
+        offsets.byteswap()
+    return offsets.tobytes()
+
+
+def decode_offsets(data: bytes) -> array:
+    offsets = array('q')
+    offsets.frombytes(data)
+    if sys.byteorder != 'little':
+        offsets.byteswap()
+    return offsets
+
+
+def read_error_rows(report_key: str,
+                    index_key: str,
+                    *,
+                    offset: int,
+                    limit: int) -> list[dict]:
+    """Читает строки отчёта [offset, offset + limit).
+
+    offset должен быть меньше числа строк отчёта (job.error_count).
+    """
+    offsets = decode_offsets(get_range(
+        index_key,
+        offset * OFFSET_SIZE,
+        (offset + limit + 1) * OFFSET_SIZE - 1,
+    ))
+    if len(offsets) < 2:
+        return []
+
+    data = get_range(report_key, offsets[0], offsets[-1] - 1)
+    reader = csv.reader(io.StringIO(data.decode('utf-8', errors='replace'),
+                                    newline=''))
+    return [
+        {'row': int(row), 'error': error, 'raw': raw}
+        for row, error, raw in reader
+    ]
@@ -11,7 +11,13 @@
 Также put/get не полагаются на minio_init:
     bucket гарантируется через ensure_bucket().
 """
+import os
 import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from itertools import islice
+from typing import Callable, Iterator
 
 import boto3
 from botocore.config import Config
@@ -21,6 +27,8 @@ from app.core.config import settings
 
 _NOT_FOUND = {'404', 'NoSuchBucket', 'NotFound'}
 _IGNORE_CREATE = {'BucketAlreadyOwnedByYou', 'BucketAlreadyExists'}
+# минимальный размер part multipart upload (кроме последнего) в S3
+MIN_PART_BYTES = 5 * 1024 * 1024
 
 
 def get_s3_client(*, public: bool = False):
@@ -34,7 +42,10 @@ def get_s3_client(*, public: bool = False):
         aws_access_key_id=settings.s3_access_key,
         aws_secret_access_key=settings.s3_secret_key,
         region_name=settings.s3_region,
-        config=Config(signature_version='s3v4'),
+        config=Config(
+            signature_version='s3v4',
+            max_pool_connections=max(10, settings.s3_download_concurrency),
+        ),
     )
 
 
@@ -86,6 +97,115 @@ def put_bytes(data: bytes,
     return key
 
 
+def object_exists(key: str) -> bool:
+    s3 = get_s3_client()
+    try:
+        s3.head_object(Bucket=settings.s3_bucket, Key=key)
+    except ClientError as e:
+        if _error_code(e) not in _NOT_FOUND:
+            raise
+        return False
+    return True
+
+
+def object_size(key: str) -> int | None:
+    """Размер объекта по head_object; None, если объекта нет."""
+    s3 = get_s3_client()
+    try:
+        head = s3.head_object(Bucket=settings.s3_bucket, Key=key)
+    except ClientError as e:
+        if _error_code(e) not in _NOT_FOUND:
+            raise
+        return None
+    return head['ContentLength']
+
+
+def put_fileobj(fileobj, *, key: str) -> str:
+    """Потоково загружает файл под заданным ключом (multipart для больших).
+
+    Если объект с таким ключом уже есть (content-addressed ключ), повторно
+    не загружает. Побочные эффекты: может создать bucket.
+    """
+    s3 = get_s3_client()
+    ensure_bucket(s3, settings.s3_bucket)
+    if not object_exists(key):
+        s3.upload_fileobj(fileobj, settings.s3_bucket, key)
+    return key
+
+
+class MultipartWriter:
+    """Потоковая запись объекта через S3 multipart upload.
+
+    write() копит данные до S3_UPLOAD_PART_BYTES и отправляет part, так что
+    в памяти не больше одного part. close() завершает загрузку, abort() —
+    отменяет (незавершённые part не остаются в bucket). on_part(total)
+    вызывается после каждого отправленного part.
+    """
+
+    def __init__(self,
+                 key: str,
+                 *,
+                 content_type: str = 'application/octet-stream',
+                 on_part: Callable[[int], None] | None = None) -> None:
+        self.key = key
+        self.bytes_written = 0
+        self.on_part = on_part
+        self._part_size = max(MIN_PART_BYTES, settings.s3_upload_part_bytes)
+        self._buffer = bytearray()
+        self._parts: list[dict] = []
+        self._s3 = get_s3_client()
+        ensure_bucket(self._s3, settings.s3_bucket)
+        self._upload_id = self._s3.create_multipart_upload(
+            Bucket=settings.s3_bucket, Key=key, ContentType=content_type,
+        )['UploadId']
+
+    def __enter__(self) -> 'MultipartWriter':
+        """Возвращает writer; загрузка уже начата в __init__."""
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        """Завершает загрузку, а при исключении — отменяет её."""
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def write(self, data: bytes) -> None:
+        self._buffer += data
+        if len(self._buffer) >= self._part_size:
+            self._upload_part()
+
+    def _upload_part(self) -> None:
+        number = len(self._parts) + 1
+        part = self._s3.upload_part(
+            Bucket=settings.s3_bucket, Key=self.key,
+            UploadId=self._upload_id, PartNumber=number,
+            Body=bytes(self._buffer),
+        )
+        self._parts.append({'ETag': part['ETag'], 'PartNumber': number})
+        self.bytes_written += len(self._buffer)
+        self._buffer.clear()
+        if self.on_part is not None:
+            self.on_part(self.bytes_written)
+
+    def close(self) -> None:
+        # последний part может быть меньше минимума; пустой объект — тоже
+        # один (пустой) part
+        if self._buffer or not self._parts:
+            self._upload_part()
+        self._s3.complete_multipart_upload(
+            Bucket=settings.s3_bucket, Key=self.key,
+            UploadId=self._upload_id,
+            MultipartUpload={'Parts': self._parts},
+        )
+
+    def abort(self) -> None:
+        self._s3.abort_multipart_upload(
+            Bucket=settings.s3_bucket, Key=self.key,
+            UploadId=self._upload_id,
+        )
+
+
 def get_bytes(key: str) -> bytes:
     s3 = get_s3_client()
     ensure_bucket(s3, settings.s3_bucket)
@@ -97,6 +217,135 @@ def get_bytes(key: str) -> bytes:
     return obj['Body'].read()
 
 
+def _part_ranges(size: int, part_size: int) -> list[tuple[int, int]]:
+    return [
+        (start, min(start + part_size, size) - 1)
+        for start in range(0, size, part_size)
+    ]
+
+
+def _get_part(s3, key: str, start: int, end: int) -> bytes:
+    obj = s3.get_object(
+        Bucket=settings.s3_bucket,
+        Key=key,
+        Range=f'bytes={start}-{end}',
+    )
+    return obj['Body'].read()
+
+
+def iter_object_parts(key: str,
+                      *,
+                      part_size: int | None = None,
+                      concurrency: int | None = None) -> Iterator[bytes]:
+    """Отдаёт объект упорядоченными кусками, скачивая их параллельно.
+
+    В полёте не больше concurrency ranged GET'ов, поэтому память
+    ограничена concurrency * part_size независимо от размера объекта.
+    """
+    part_size = part_size or settings.s3_download_part_bytes
+    concurrency = concurrency or settings.s3_download_concurrency
+
+    s3 = get_s3_client()
+    size = s3.head_object(Bucket=settings.s3_bucket, Key=key)['ContentLength']
+    ranges = iter(_part_ranges(size, part_size))
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        pending = deque(
+            pool.submit(_get_part, s3, key, start, end)
+            for start, end in islice(ranges, concurrency)
+        )
+        while pending:
+            part = pending.popleft().result()
+            following = next(ranges, None)
+            if following is not None:
+                pending.append(pool.submit(_get_part, s3, key, *following))
+            yield part
+
+
+def download_to_file(key: str,
+                     fileobj,
+                     *,
+                     part_size: int | None = None,
+                     concurrency: int | None = None) -> None:
+    """Скачивает объект в открытый на запись бинарный файл.
+
+    Объект делится на ranged GET'ы по part_size (S3_DOWNLOAD_PART_BYTES),
+    которые качаются пулом из concurrency потоков
+    (S3_DOWNLOAD_CONCURRENCY) и пишутся сразу на свои смещения через
+    os.pwrite: несколько TCP-соединений вместо одного, без сборки в памяти.
+    Для объектов без fileno() (не файл на диске) куски пишутся по порядку.
+    """
+    part_size = part_size or settings.s3_download_part_bytes
+    concurrency = concurrency or settings.s3_download_concurrency
+
+    try:
+        fd = fileobj.fileno()
+    except (AttributeError, OSError):
+        for part in iter_object_parts(key, part_size=part_size,
+                                      concurrency=concurrency):
+            fileobj.write(part)
+        return
+
+    s3 = get_s3_client()
+    ensure_bucket(s3, settings.s3_bucket)
+    size = s3.head_object(Bucket=settings.s3_bucket, Key=key)['ContentLength']
+    base = fileobj.tell()
+
+    def fetch(part: tuple[int, int]) -> None:
+        start, end = part
+        os.pwrite(fd, _get_part(s3, key, start, end), base + start)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in pool.map(fetch, _part_ranges(size, part_size)):
+            pass
+    fileobj.seek(base + size)
+
+
+DELETE_BATCH = 1000
+
+
+def delete_objects(keys: list[str]) -> int:
+    """Удаляет объекты пачками по DELETE_BATCH (лимит DeleteObjects).
+
+    Отсутствующие ключи ошибкой не считаются. Возвращает число удалённых;
+    ошибки отдельных ключей поднимаются RuntimeError после всех пачек.
+    """
+    s3 = get_s3_client()
+    deleted = 0
+    failed = []
+    for i in range(0, len(keys), DELETE_BATCH):
+        chunk = keys[i:i + DELETE_BATCH]
+        resp = s3.delete_objects(
+            Bucket=settings.s3_bucket,
+            Delete={'Objects': [{'Key': key} for key in chunk],
+                    'Quiet': True},
+        )
+        errors = resp.get('Errors', [])
+        failed.extend(error['Key'] for error in errors)
+        deleted += len(chunk) - len(errors)
+    if failed:
+        raise RuntimeError(f'cannot delete {len(failed)} objects, '
+                           f'first: {failed[0]}')
+    return deleted
+
+
+def iter_objects(prefix: str,
+                 *,
+                 modified_before: datetime) -> Iterator[str]:
+    """Ключи объектов под prefix, изменённых раньше modified_before."""
+    paginator = get_s3_client().get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=settings.s3_bucket,
+                                   Prefix=prefix):
+        for obj in page.get('Contents', ()):
+            if obj['LastModified'] < modified_before:
+                yield obj['Key']
+
+
+def get_range(key: str, start: int, end: int) -> bytes:
+    """Читает байты [start, end] объекта (границы включительно)."""
+    return _get_part(get_s3_client(), key, start, end)
+
+
 def presign_get(
         object_key: str,
         *,
@@ -123,3 +372,23 @@ def presign_get(
         Params=params,
         ExpiresIn=expires_seconds,
     )
+
+
+def presign_post(object_key: str,
+                 *,
+                 max_bytes: int,
+                 expires_seconds: int = 3600) -> dict:
+    """Формирует presigned POST для загрузки ровно в object_key.
+
+    Политика ограничивает размер тела 1..max_bytes: больший файл S3
+    отклонит сам. Возвращает {'url', 'fields'}; подписывается под
+    публичный endpoint, как presign_get.
+    """
+    ensure_bucket(get_s3_client(), settings.s3_bucket)
+    s3 = get_s3_client(public=True)
+    return s3.generate_presigned_post(
+        Bucket=settings.s3_bucket,
+        Key=object_key,
+        Conditions=[['content-length-range', 1, max_bytes]],
+        ExpiresIn=expires_seconds,
+    )
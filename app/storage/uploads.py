@@ -0,0 +1,68 @@
+"""Загрузки CSV: хэш содержимого и content-addressed ключи в S3.
+
+Одинаковые файлы (байт-в-байт) получают один и тот же ключ
+uploads/sha256/<hex>, поэтому повторная загрузка не создаёт новую копию
+объекта, а по content_sha256 job можно найти уже выполненный импорт.
+Файлы, загруженные клиентом напрямую в S3 (presigned POST), лежат под
+uploads/direct/<user_id>/<upload_id>: ключ выбирает сервер.
+
+Объект загрузки может быть общим для нескольких job, поэтому между
+«объект уже есть, не перезаливаем» в API и «на объект больше никто не
+ссылается, удаляем» в GC (worker.retention) стоит advisory lock ключа:
+API держит shared lock до commit job, GC — exclusive на время удаления.
+"""
+import hashlib
+import uuid
+from typing import BinaryIO
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class UploadTooLarge(ValueError):
+    pass
+
+
+def hash_fileobj(fileobj: BinaryIO,
+                 *,
+                 max_bytes: int | None = None) -> tuple[str, int]:
+    """Считает SHA-256 файла потоково, кусками по CHUNK_SIZE.
+
+    Возвращает (hex digest, размер) и перематывает файл в начало.
+    Ошибки: UploadTooLarge, если размер превысил max_bytes.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    while chunk := fileobj.read(CHUNK_SIZE):
+        size += len(chunk)
+        if max_bytes is not None and size > max_bytes:
+            raise UploadTooLarge(f'upload exceeds {max_bytes} bytes')
+        digest.update(chunk)
+    fileobj.seek(0)
+    return digest.hexdigest(), size
+
+
+def content_key(sha256: str, *, prefix: str = 'uploads') -> str:
+    return f'{prefix}/sha256/{sha256}'
+
+
+def direct_upload_key(user_id: uuid.UUID,
+                      upload_id: uuid.UUID,
+                      *,
+                      prefix: str = 'uploads') -> str:
+    return f'{prefix}/direct/{user_id}/{upload_id}'
+
+
+def upload_lock_id(key: str) -> int:
+    """Стабильный bigint для pg_advisory_*lock по ключу объекта."""
+    digest = hashlib.sha256(key.encode()).digest()
+    return int.from_bytes(digest[:8], 'big', signed=True)
+
+
+def lock_upload_key(db: Session, key: str, *, shared: bool) -> None:
+    """Берёт advisory lock ключа до конца текущей транзакции."""
+    lock = (func.pg_advisory_xact_lock_shared if shared
+            else func.pg_advisory_xact_lock)
+    db.execute(select(lock(upload_lock_id(key))))
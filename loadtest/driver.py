@@ -0,0 +1,304 @@
+r"""Нагрузочный прогон: параллельные POST /imports от многих пользователей.
+
+Берёт файлы, подготовленные loadtest.generate, регистрирует --users
+пользователей и загружает файлы в --concurrency потоков (пользователи по
+кругу). Каждый поток опрашивает GET /imports/{id} до завершения job.
+429 от admission control учитывается и повторяется после Retry-After.
+
+Отчёт (JSON, --report):
+    - api_latency_ms: p50/p95/p99/max для POST /imports и GET /imports/{id};
+    - job_latency_seconds: от начала POST до terminal-статуса;
+    - throughput: строк/с по стенду (за время прогона) и на воркер
+      (по timings job);
+    - db: скорость записи в customers и commit'ов из pg_stat_* (если
+      передан --database-url или есть DATABASE_URL).
+
+Пример: python -m loadtest.driver --data-dir /tmp/load --users 20 \
+    --concurrency 20 --report report.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from http import HTTPStatus
+from pathlib import Path
+from statistics import quantiles
+
+import httpx
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+
+TERMINAL = ('done', 'failed', 'cancelled')
+WORKER_SECONDS = ('download_seconds', 'count_seconds', 'process_seconds',
+                  'report_seconds')
+
+DB_STATS_SQL = text("""
+    SELECT d.xact_commit, t.n_tup_ins, t.n_tup_upd
+    FROM pg_stat_database d, pg_stat_user_tables t
+    WHERE d.datname = current_database() AND t.relname = 'customers'
+""")
+
+
+def summarize(values: list[float], scale: float = 1.0) -> dict:
+    """Сводка: count и p50/p95/p99/max (квантили inclusive) * scale."""
+    if not values:
+        return {'count': 0}
+    points = (quantiles(values, n=100, method='inclusive')
+              if len(values) > 1 else [values[0]] * 99)
+    return {
+        'count': len(values),
+        'p50': round(points[49] * scale, 3),
+        'p95': round(points[94] * scale, 3),
+        'p99': round(points[98] * scale, 3),
+        'max': round(max(values) * scale, 3),
+    }
+
+
+@dataclass
+class Stats:
+    post_seconds: list[float] = field(default_factory=list)
+    get_seconds: list[float] = field(default_factory=list)
+    job_seconds: list[float] = field(default_factory=list)
+    worker_seconds: list[float] = field(default_factory=list)
+    statuses: dict[str, int] = field(default_factory=dict)
+    rejected: int = 0
+    rows: int = 0
+    processed_rows: int = 0
+    error_rows: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def add_job(self, job: dict, seconds: float) -> None:
+        timings = job.get('timings') or {}
+        with self.lock:
+            self.job_seconds.append(seconds)
+            self.statuses[job['status']] = (
+                self.statuses.get(job['status'], 0) + 1)
+            self.rows += job.get('total_rows') or 0
+            self.processed_rows += job.get('processed_rows') or 0
+            self.error_rows += job.get('error_count') or 0
+            worker = sum(timings.get(name) or 0 for name in WORKER_SECONDS)
+            if worker:
+                self.worker_seconds.append(worker)
+
+
+def register(client: httpx.Client, tag: str, index: int) -> str:
+    email = f'load_{tag}_{index}@example.com'
+    password = 'load-test-pass'
+    client.post('/auth/register',
+                json={'email': email, 'password': password})
+    resp = client.post('/auth/token',
+                       json={'email': email, 'password': password})
+    resp.raise_for_status()
+    return resp.json()['access_token']
+
+
+def _timed(stats_list: list[float], lock: threading.Lock, call):
+    started = time.perf_counter()
+    resp = call()
+    with lock:
+        stats_list.append(time.perf_counter() - started)
+    return resp
+
+
+def submit(client: httpx.Client,
+           stats: Stats,
+           *,
+           token: str,
+           path: Path,
+           mode: str) -> dict:
+    """POST /imports с повтором после 429; возвращает job."""
+    headers = {'Authorization': f'Bearer {token}',
+               'Idempotency-Key': f'load-{uuid.uuid4().hex}'}
+    while True:
+        with path.open('rb') as file:
+            resp = _timed(stats.post_seconds, stats.lock, lambda: client.post(
+                '/imports', params={'mode': mode}, headers=headers,
+                files={'file': (path.name, file, 'text/csv')}))
+        if resp.status_code != HTTPStatus.TOO_MANY_REQUESTS:
+            resp.raise_for_status()
+            return resp.json()
+        with stats.lock:
+            stats.rejected += 1
+        time.sleep(float(resp.headers.get('Retry-After', 1)))
+
+
+def wait_job(client: httpx.Client,
+             stats: Stats,
+             *,
+             token: str,
+             job: dict,
+             poll_seconds: float,
+             timeout_seconds: float) -> dict:
+    headers = {'Authorization': f'Bearer {token}'}
+    deadline = time.monotonic() + timeout_seconds
+    while job['status'] not in TERMINAL:
+        if time.monotonic() > deadline:
+            raise TimeoutError(f'job {job["id"]} not finished')
+        time.sleep(poll_seconds)
+        resp = _timed(stats.get_seconds, stats.lock, lambda: client.get(
+            f'/imports/{job["id"]}', headers=headers))
+        resp.raise_for_status()
+        job = resp.json()
+    return job
+
+
+def run_file(client: httpx.Client,
+             stats: Stats,
+             args: argparse.Namespace,
+             token: str,
+             path: Path) -> None:
+    started = time.perf_counter()
+    job = submit(client, stats, token=token, path=path, mode=args.mode)
+    job = wait_job(client, stats, token=token, job=job,
+                   poll_seconds=args.poll_seconds,
+                   timeout_seconds=args.job_timeout_seconds)
+    stats.add_job(job, time.perf_counter() - started)
+
+
+def db_snapshot(database_url: str | None) -> tuple[float, ...] | None:
+    if not database_url:
+        return None
+    url = make_url(database_url).set(drivername='postgresql+psycopg')
+    engine = create_engine(url)
+    try:
+        with engine.connect() as conn:
+            row = conn.execute(DB_STATS_SQL).one()
+    finally:
+        engine.dispose()
+    return (time.monotonic(), *row)
+
+
+def db_rates(before: tuple | None, after: tuple | None) -> dict | None:
+    # счётчики pg_stat_* сбрасываются в статистику с задержкой около
+    # секунды; на длинных прогонах это в пределах погрешности
+    if before is None or after is None:
+        return None
+    seconds = after[0] - before[0]
+    commits, inserted, updated = (b - a for a, b in zip(before[1:],
+                                                        after[1:]))
+    return {
+        'commits_per_sec': round(commits / seconds, 1),
+        'customers_inserted_per_sec': round(inserted / seconds, 1),
+        'customers_updated_per_sec': round(updated / seconds, 1),
+        'customers_inserted': inserted,
+        'customers_updated': updated,
+    }
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'],
+                              capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return os.getenv('GIT_SHA')
+
+
+def build_report(args: argparse.Namespace,
+                 stats: Stats,
+                 seconds: float,
+                 db: dict | None,
+                 failures: list[str]) -> dict:
+    rows_per_sec = stats.rows / seconds if seconds else 0
+    worker_seconds = sum(stats.worker_seconds)
+    return {
+        'revision': git_revision(),
+        'started_at': args.started_at,
+        'config': {
+            'base_url': args.base_url,
+            'mode': args.mode,
+            'users': args.users,
+            'concurrency': args.concurrency,
+            'files': len(args.files),
+        },
+        'duration_seconds': round(seconds, 3),
+        'jobs': {**stats.statuses,
+                 'rejected_429': stats.rejected,
+                 'client_errors': len(failures)},
+        'rows': {'total': stats.rows,
+                 'processed': stats.processed_rows,
+                 'errors': stats.error_rows},
+        'api_latency_ms': {
+            'post_imports': summarize(stats.post_seconds, 1000),
+            'get_import': summarize(stats.get_seconds, 1000),
+        },
+        'job_latency_seconds': summarize(stats.job_seconds),
+        'throughput': {
+            'rows_per_sec': round(rows_per_sec, 1),
+            'worker_rows_per_sec': (
+                round(stats.rows / worker_seconds, 1)
+                if worker_seconds else None),
+        },
+        'db': db,
+        'failures': failures[:20],
+    }
+
+
+def run(args: argparse.Namespace) -> dict:
+    client = httpx.Client(base_url=args.base_url,
+                          timeout=httpx.Timeout(args.http_timeout_seconds),
+                          limits=httpx.Limits(
+                              max_connections=args.concurrency * 2))
+    tag = uuid.uuid4().hex[:8]
+    tokens = [register(client, tag, i) for i in range(args.users)]
+    stats = Stats()
+    failures: list[str] = []
+
+    def task(index: int, path: Path) -> None:
+        try:
+            run_file(client, stats, args, tokens[index % len(tokens)], path)
+        except Exception as error:
+            with stats.lock:
+                failures.append(f'{path.name}: {type(error).__name__}: '
+                                f'{error}')
+
+    before = db_snapshot(args.database_url)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(task, range(len(args.files)), args.files))
+    seconds = time.perf_counter() - started
+    db = db_rates(before, db_snapshot(args.database_url))
+    client.close()
+    return build_report(args, stats, seconds, db, failures)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--base-url', default=os.getenv(
+        'LOADTEST_BASE_URL', 'http://localhost:8000'))
+    parser.add_argument('--data-dir', type=Path, required=True)
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--mode', default='insert_only',
+                        choices=('insert_only', 'upsert', 'validate'))
+    parser.add_argument('--poll-seconds', type=float, default=0.5)
+    parser.add_argument('--job-timeout-seconds', type=float, default=3600)
+    parser.add_argument('--http-timeout-seconds', type=float, default=120)
+    parser.add_argument('--database-url', default=os.getenv('DATABASE_URL'))
+    parser.add_argument('--report', type=Path, default=Path('report.json'))
+    args = parser.parse_args(argv)
+    args.files = sorted(args.data_dir.glob('*.csv'))
+    if not args.files:
+        parser.error(f'no *.csv in {args.data_dir}')
+    args.started_at = datetime.now(timezone.utc).isoformat()
+    return args
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    report = run(args)
+    args.report.write_text(json.dumps(report, indent=2))
+    print(json.dumps({key: report[key] for key in (
+        'duration_seconds', 'jobs', 'throughput', 'api_latency_ms')}))
+    if report['failures']:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+r"""Генератор синтетических CSV для нагрузочного теста.
+
+Строки той же формы, что customers_2000.csv
+(email,first_name,last_name,phone,city), с управляемой долей битых строк
+(пустой/невалидный email) и дублей email внутри файла; дубль повторяет
+email, уже записанный в этот файл валидной строкой. Данные пишутся
+потоково, по файлу на загрузку: N строк делятся на --files частей, каждая
+не больше --max-file-bytes (по умолчанию MAX_UPLOAD_BYTES из окружения).
+Без --files число частей считается по этому лимиту. Email уникальны между
+файлами и запусками с разным --run-id, поэтому insert_only не упирается в
+already_exists от прошлых прогонов.
+
+Пример: python -m loadtest.generate --rows 1000000 --files 100 \
+    --error-rate 0.01 --duplicate-rate 0.02 --out-dir /tmp/load
+"""
+import argparse
+import csv
+import io
+import json
+import math
+import os
+import random
+import uuid
+from pathlib import Path
+
+HEADER = ('email', 'first_name', 'last_name', 'phone', 'city')
+CITIES = 50
+BAD_EMAILS = ('', 'not-an-email', 'user@localhost')
+MAX_FILE_BYTES = int(os.getenv('MAX_UPLOAD_BYTES', 50 * 1024 * 1024))
+
+
+def customer_row(run_id: str, n: int) -> tuple[str, ...]:
+    return (
+        f'user{n:08d}.{run_id}@example.com',
+        f'First{n:08d}',
+        f'Last{n:08d}',
+        f'+1-555-{n % 1000:03d}-{n * 7 % 10000:04d}',
+        f'City{n % CITIES:02d}',
+    )
+
+
+def csv_line_bytes(row: tuple[str, ...]) -> int:
+    out = io.StringIO(newline='')
+    csv.writer(out).writerow(row)
+    return len(out.getvalue().encode('utf-8'))
+
+
+def max_file_rows(run_id: str, rows: int, max_bytes: int) -> int:
+    """Сколько строк гарантированно уложится в файл до max_bytes.
+
+    Самая длинная строка — последняя валидная (номера растут), битые и
+    дубли не длиннее её.
+    """
+    room = max_bytes - csv_line_bytes(HEADER)
+    return max(room // csv_line_bytes(customer_row(run_id, rows - 1)), 0)
+
+
+def write_file(path: Path,
+               *,
+               run_id: str,
+               first: int,
+               rows: int,
+               error_rate: float,
+               duplicate_rate: float,
+               rng: random.Random) -> dict:
+    """Пишет rows строк с номерами от first, возвращает счётчики файла.
+
+    Дубль берёт номер из written — только строк, записанных с валидным
+    уникальным email, иначе «дубль» битой строки оказался бы новым email.
+    """
+    errors = duplicates = 0
+    written: list[int] = []
+    with path.open('w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(HEADER)
+        for n in range(first, first + rows):
+            roll = rng.random()
+            if roll < error_rate:
+                row = (rng.choice(BAD_EMAILS),) + customer_row(run_id, n)[1:]
+                errors += 1
+            elif roll < error_rate + duplicate_rate and written:
+                row = customer_row(run_id, rng.choice(written))
+                duplicates += 1
+            else:
+                row = customer_row(run_id, n)
+                written.append(n)
+            writer.writerow(row)
+    return {'file': path.name, 'rows': rows, 'errors': errors,
+            'duplicates': duplicates, 'bytes': path.stat().st_size}
+
+
+def generate(out_dir: Path,
+             *,
+             rows: int,
+             files: int,
+             error_rate: float,
+             duplicate_rate: float,
+             seed: int,
+             run_id: str) -> dict:
+    """Пишет файлы и manifest.json с ожидаемыми счётчиками."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    per_file, extra = divmod(rows, files)
+    first = 0
+    parts = []
+    for index in range(files):
+        count = per_file + (1 if index < extra else 0)
+        parts.append(write_file(out_dir / f'part_{index:05d}.csv',
+                                run_id=run_id,
+                                first=first,
+                                rows=count,
+                                error_rate=error_rate,
+                                duplicate_rate=duplicate_rate,
+                                rng=rng))
+        first += count
+
+    manifest = {
+        'run_id': run_id,
+        'seed': seed,
+        'rows': rows,
+        'error_rate': error_rate,
+        'duplicate_rate': duplicate_rate,
+        'errors': sum(part['errors'] for part in parts),
+        'duplicates': sum(part['duplicates'] for part in parts),
+        'bytes': sum(part['bytes'] for part in parts),
+        'files': parts,
+    }
+    (out_dir / 'manifest.json').write_text(json.dumps(manifest, indent=2))
+    return manifest
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--files', type=int, default=None,
+                        help='число файлов; по умолчанию по --max-file-bytes')
+    parser.add_argument('--max-file-bytes', type=int, default=MAX_FILE_BYTES)
+    parser.add_argument('--error-rate', type=float, default=0.01)
+    parser.add_argument('--duplicate-rate', type=float, default=0.01)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--run-id', default=None,
+                        help='суффикс email; по умолчанию случайный')
+    parser.add_argument('--out-dir', type=Path, required=True)
+    args = parser.parse_args(argv)
+    if args.error_rate + args.duplicate_rate > 1:
+        parser.error('error-rate + duplicate-rate must be <= 1')
+    if args.rows < 1:
+        parser.error('need rows >= 1')
+    args.run_id = args.run_id or uuid.uuid4().hex[:8]
+    limit = max_file_rows(args.run_id, args.rows, args.max_file_bytes)
+    if limit < 1:
+        parser.error('max-file-bytes is too small for a single row')
+    if args.files is None:
+        args.files = math.ceil(args.rows / limit)
+    if not 1 <= args.files <= args.rows:
+        parser.error('need rows >= files >= 1')
+    if math.ceil(args.rows / args.files) > limit:
+        parser.error(f'files over {args.max_file_bytes} bytes; '
+                     f'need --files >= {math.ceil(args.rows / limit)}')
+    return args
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    manifest = generate(args.out_dir,
+                        rows=args.rows,
+                        files=args.files,
+                        error_rate=args.error_rate,
+                        duplicate_rate=args.duplicate_rate,
+                        seed=args.seed,
+                        run_id=args.run_id)
+    print(json.dumps({key: value for key, value in manifest.items()
+                      if key != 'files'}))
+
+
+if __name__ == '__main__':
+    main()
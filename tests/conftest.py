@@ -163,10 +163,11 @@ def wait_job_done(client: httpx.Client,
                   job_id: str,
                   timeout_s: float = 30.0,
                   poll_s: float = 0.5,) -> dict:
-    """Ожидает завершене job, опрашивая GET/imports/{id} до done/failed.
+    """Ожидает завершене job, опрашивая GET/imports/{id} до конца.
 
     Делает polling с интервалом poll_s до timeout_s. Если за timeout job не
-        перешёл в done/failed — падает с AssertionError и последним ответом.
+        перешёл в done/failed/cancelled — падает с AssertionError и
+        последним ответом.
     """
     deadline = time.time() + timeout_s
     last = None
@@ -180,7 +181,7 @@ def wait_job_done(client: httpx.Client,
         data = read.json()
         status = data.get('status')
 
-        if status in ('done', 'failed'):
+        if status in ('done', 'failed', 'cancelled'):
             return data
         last = data
         time.sleep(poll_s)
@@ -227,7 +228,8 @@ def db_engine(db_url: str | None) -> Generator[Engine, None, None]:
 def clean_db(db_engine):
     """Чистим БД перед каждым тестом (DEV ONLY).
 
-    TRUNCATE import_jobs/customers/users с RESTART IDENTITY CASCADE.
+    TRUNCATE import_jobs/customers/users/task_outbox с RESTART IDENTITY
+    CASCADE.
     ВАЖНО: гоняй это на dev-стеке, иначе снесёшь реальные данные.
     """
     env = os.getenv('APP_ENV')
@@ -237,7 +239,8 @@ def clean_db(db_engine):
         conn.execute(
             text(
                 (
-                    "TRUNCATE TABLE import_jobs, customers, users "
+                    "TRUNCATE TABLE import_jobs, customers, users, "
+                    "task_outbox "
                     "RESTART IDENTITY CASCADE"
                 )
             )
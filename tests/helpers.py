@@ -3,6 +3,9 @@ import io
 import uuid
 from http import HTTPStatus
 
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
 from .conftest import (
     create_import,
     get_errors_url,
@@ -119,3 +122,36 @@ def create_two_imports_with_same_idem(client,
         csv_bytes=csv_bytes,
     )
     return job_1, job_2
+
+
+def user_id_by_email(db_engine, email: str) -> uuid.UUID:
+    with db_engine.connect() as conn:
+        return conn.execute(text('SELECT id FROM users WHERE email = :email'),
+                            {'email': email}).scalar_one()
+
+
+def insert_pending_job(db_engine,
+                       *,
+                       email: str,
+                       mode: str,
+                       csv_bytes: bytes) -> tuple[uuid.UUID, str]:
+    """Создаёт pending job прямо в БД, без задачи в outbox.
+
+    Воркер стенда такой job не возьмёт: тест сам вызывает функции
+    импорта. Возвращает (job_id, s3_key).
+    """
+    from app.core.ids import uuid7
+    from app.models.import_job import ImportJob, ImportMode
+    from app.storage.s3 import put_bytes
+
+    job = ImportJob(id=uuid7(),
+                    user_id=user_id_by_email(db_engine, email),
+                    idempotency_key=f'direct-{uuid.uuid4().hex[:8]}',
+                    mode=ImportMode(mode),
+                    filename='customer.csv',
+                    s3_key=put_bytes(csv_bytes, filename='customer.csv'),
+                    file_size=len(csv_bytes))
+    with Session(db_engine) as db:
+        db.add(job)
+        db.commit()
+        return job.id, job.s3_key
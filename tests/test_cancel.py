@@ -0,0 +1,126 @@
+import threading
+import time
+import uuid
+from http import HTTPStatus
+
+from sqlalchemy import text
+
+from .conftest import (
+    auth_headers,
+    create_import,
+    get_import,
+    make_csv_bytes,
+    rand_email,
+    wait_job_done,
+)
+from .helpers import insert_pending_job
+
+ROWS = 3000
+
+
+def _create(client, token: str, rows: int) -> dict:
+    return create_import(
+        client,
+        token=token,
+        idem_key='cn-' + uuid.uuid4().hex[:8],
+        mode='upsert',
+        csv_bytes=make_csv_bytes([[rand_email('cn'), 'C', '', '', 'X']
+                                  for _ in range(rows)]))
+
+
+def _wait_processed(client, token: str, job_id: str, rows: int) -> None:
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        job = get_import(client, token=token, job_id=job_id)['json']
+        if job['processed_rows'] >= rows:
+            return
+        time.sleep(0.05)
+    raise AssertionError(f'job {job_id} did not reach {rows} rows')
+
+
+def test_cancel_stops_import(client, user, db_engine, monkeypatch):
+    """Отмена processing job: импорт идёт в тесте, медленно и с батчами."""
+    from app.core.config import settings
+    from app.db.session import SessionLocal
+    from app.models.import_job import ImportMode
+    from app.services import importing
+
+    monkeypatch.setattr(settings, 'adaptive_batch', False)
+    monkeypatch.setattr(settings, 'batch_size', 100)
+    monkeypatch.setattr(importing, 'IMPORT_SLOW_MS', 2)
+    monkeypatch.setattr(importing, 'PROGRESS_EVERY', 100)
+    job_id, s3_key = insert_pending_job(
+        db_engine,
+        email=user.email,
+        mode='upsert',
+        csv_bytes=make_csv_bytes([[rand_email('cn'), 'C', '', '', 'X']
+                                  for _ in range(ROWS)]))
+
+    def run() -> None:
+        with SessionLocal() as db:
+            importing.execute_import(db, job_id, s3_key, ImportMode.upsert)
+
+    worker = threading.Thread(target=run)
+    worker.start()
+    try:
+        _wait_processed(client, user.token, str(job_id), 300)
+        resp = client.post(f'/imports/{job_id}/cancel',
+                           headers=auth_headers(user.token))
+        assert resp.status_code == HTTPStatus.ACCEPTED, resp.text
+    finally:
+        worker.join(timeout=60)
+
+    final = get_import(client, token=user.token, job_id=str(job_id))['json']
+    assert final['status'] == 'cancelled', final
+    assert final['total_rows'] == ROWS
+    # записаны только целые батчи до отмены
+    assert 0 < final['processed_rows'] < ROWS
+    assert final['processed_rows'] % 100 == 0
+    with db_engine.connect() as conn:
+        written = conn.execute(text(
+            "SELECT count(*) FROM customers WHERE email LIKE 'cn\\_%'"
+        )).scalar_one()
+    assert written == final['processed_rows']
+
+
+def test_cancel_pending_job_discards_outbox_task(client, user, db_engine):
+    from app.core.outbox import enqueue_task
+    from app.db.session import SessionLocal
+
+    job_id, _ = insert_pending_job(
+        db_engine,
+        email=user.email,
+        mode='upsert',
+        csv_bytes=make_csv_bytes([[rand_email('cp'), 'C', '', '', 'X']]))
+    with SessionLocal() as db:
+        # отложенная задача: relay не отправит её до отмены
+        enqueue_task(db, 'process_import', args=[str(job_id)],
+                     delay_seconds=3600)
+        db.commit()
+
+    resp = client.post(f'/imports/{job_id}/cancel',
+                       headers=auth_headers(user.token))
+    assert resp.status_code == HTTPStatus.OK, resp.text
+    assert resp.json()['status'] == 'cancelled'
+    assert resp.json()['processed_rows'] == 0
+
+    with db_engine.connect() as conn:
+        tasks = conn.execute(
+            text("SELECT count(*) FROM task_outbox "
+                 "WHERE args ->> 0 = :id"),
+            {'id': str(job_id)},
+        ).scalar_one()
+    assert tasks == 0
+
+
+def test_cancel_finished_job_conflicts(client, user, other_user):
+    job = _create(client, user.token, 1)
+    wait_job_done(client, token=user.token, job_id=job['id'])
+
+    resp = client.post(f'/imports/{job["id"]}/cancel',
+                       headers=auth_headers(user.token))
+    assert resp.status_code == HTTPStatus.CONFLICT, resp.text
+
+    foreign = client.post(f'/imports/{job["id"]}/cancel',
+                          headers=auth_headers(other_user.token))
+    assert foreign.status_code == HTTPStatus.NOT_FOUND, foreign.text
@@ -0,0 +1,142 @@
+import uuid
+
+from .conftest import (
+    create_import,
+    get_import,
+    make_csv_bytes,
+    rand_email,
+    wait_job_done,
+)
+from .helpers import insert_pending_job, user_id_by_email
+
+
+def test_small_imports_keep_per_job_results(client, user, other_user):
+    """Параллельные импорты с общим email: вставляет его ровно один job."""
+    shared = rand_email('co')
+    jobs = []
+    for i, creds in enumerate((user, other_user, user)):
+        rows = [[rand_email(f'co{i}'), 'C', '', '', 'X'],
+                [shared, 'C', '', '', 'X'],
+                ['broken', '', '', '', '']]
+        jobs.append((creds, create_import(
+            client,
+            token=creds.token,
+            idem_key=f'co{i}-' + uuid.uuid4().hex[:8],
+            mode='insert_only',
+            csv_bytes=make_csv_bytes(rows))))
+
+    finals = [wait_job_done(client, token=creds.token, job_id=job['id'])
+              for creds, job in jobs]
+
+    for final in finals:
+        assert final['processed_rows'] == 3
+        assert final['error_stats'].get('invalid_email') == 1
+    already = [final['error_stats'].get('already_exists', 0)
+               for final in finals]
+    assert sorted(already) == [0, 1, 1]
+
+
+def _coalesce(monkeypatch, job_id, s3_key) -> int:
+    from app.core.config import settings
+    from app.db.session import SessionLocal
+    from app.models.import_job import ImportMode
+    from app.services.importing import claim_job
+    from worker.celery_app import is_coalescable, run_coalesced
+
+    monkeypatch.setattr(settings, 'coalesce_small_imports', True)
+    assert is_coalescable(ImportMode.insert_only, 1024)
+    with SessionLocal() as db:
+        assert claim_job(db, job_id)
+        return run_coalesced(db, job_id, s3_key, ImportMode.insert_only)
+
+
+def test_coalesced_imports_attribute_errors_per_job(client, user, other_user,
+                                                    db_engine, monkeypatch):
+    shared = rand_email('cs')
+    owners = (user, other_user, user)
+    jobs = []
+    for i, creds in enumerate(owners):
+        rows = [[rand_email(f'cs{i}'), 'C', '', '', 'X'],
+                [shared, 'C', '', '', 'X'],
+                ['broken', '', '', '', '']]
+        jobs.append(insert_pending_job(db_engine,
+                                       email=creds.email,
+                                       mode='insert_only',
+                                       csv_bytes=make_csv_bytes(rows)))
+
+    assert _coalesce(monkeypatch, *jobs[0]) == 3
+
+    finals = [get_import(client, token=creds.token,
+                         job_id=str(job_id))['json']
+              for creds, (job_id, _) in zip(owners, jobs)]
+    for final in finals:
+        assert final['status'] == 'failed', final
+        assert final['total_rows'] == final['processed_rows'] == 3
+        assert final['timings']['coalesced_jobs'] == 3
+    # общий email вставляет первый job, остальным он уже существует
+    assert [final['error_stats'] for final in finals] == [
+        {'invalid_email': 1},
+        {'invalid_email': 1, 'already_exists': 1},
+        {'invalid_email': 1, 'already_exists': 1},
+    ]
+
+
+def test_coalescing_respects_tenant_limit(client, user, other_user,
+                                          db_engine, monkeypatch):
+    from app.core.config import settings
+    from app.core.fairness import tenant_slot
+
+    monkeypatch.setattr(settings, 'tenant_max_concurrent_imports', 1)
+    owners = (user, user, other_user)
+    jobs = [insert_pending_job(db_engine,
+                               email=creds.email,
+                               mode='insert_only',
+                               csv_bytes=make_csv_bytes(
+                                   [[rand_email('cl'), 'C', '', '', 'X']]))
+            for creds in owners]
+
+    first_id, first_key = jobs[0]
+    with tenant_slot(user_id_by_email(db_engine, user.email),
+                     first_id) as acquired:
+        assert acquired
+        assert _coalesce(monkeypatch, first_id, first_key) == 2
+
+    statuses = [get_import(client, token=creds.token,
+                           job_id=str(job_id))['json']['status']
+                for creds, (job_id, _) in zip(owners, jobs)]
+    # второй job пользователя не добран: его слот занят первым
+    assert statuses == ['done', 'pending', 'done']
+
+
+def test_coalesced_import_honours_cancel(client, user, other_user,
+                                         db_engine, monkeypatch):
+    from sqlalchemy import text
+
+    from app.core.cancellation import request_cancel
+
+    owners = (user, other_user)
+    emails = [rand_email('cc'), rand_email('cc')]
+    jobs = [insert_pending_job(db_engine,
+                               email=creds.email,
+                               mode='insert_only',
+                               csv_bytes=make_csv_bytes(
+                                   [[email, 'C', '', '', 'X']]))
+            for creds, email in zip(owners, emails)]
+    request_cancel(jobs[1][0])
+
+    assert _coalesce(monkeypatch, *jobs[0]) == 2
+
+    finals = [get_import(client, token=creds.token,
+                         job_id=str(job_id))['json']
+              for creds, (job_id, _) in zip(owners, jobs)]
+    assert finals[0]['status'] == 'done', finals[0]
+    assert finals[0]['processed_rows'] == 1
+    # отменённый job снят до разбора своего файла
+    assert finals[1]['status'] == 'cancelled', finals[1]
+    assert finals[1]['processed_rows'] == 0
+    with db_engine.connect() as conn:
+        written = conn.execute(
+            text('SELECT email FROM customers WHERE email = ANY(:emails)'),
+            {'emails': emails},
+        ).scalars().all()
+    assert written == [emails[0]]
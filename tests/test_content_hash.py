@@ -0,0 +1,91 @@
+import hashlib
+import uuid
+
+from sqlalchemy import text
+
+from .conftest import create_import, make_csv_bytes, rand_email, wait_job_done
+from .helpers import user_id_by_email
+
+
+def test_same_file_has_same_content_sha256(client, user):
+    csv_bytes = make_csv_bytes([[rand_email('h'), 'H', '', '', 'X']])
+
+    job_1 = create_import(client,
+                          token=user.token,
+                          idem_key='h1-' + uuid.uuid4().hex[:8],
+                          mode='validate',
+                          csv_bytes=csv_bytes)
+    job_2 = create_import(client,
+                          token=user.token,
+                          idem_key='h2-' + uuid.uuid4().hex[:8],
+                          mode='validate',
+                          csv_bytes=csv_bytes)
+
+    expected = hashlib.sha256(csv_bytes).hexdigest()
+    assert job_1['id'] != job_2['id']
+    assert job_1['content_sha256'] == expected
+    assert job_2['content_sha256'] == expected
+
+
+def _submit_same_file(creds, db_engine, source: dict, mode: str) -> dict:
+    """Создаёт job на тот же файл в процессе теста, минуя загрузку."""
+    from fastapi import Response
+
+    from app.api.routers.imports import _new_job, _submit_job
+    from app.db.session import SessionLocal
+    from app.models.import_job import ImportMode
+    from app.models.user import User
+
+    user_id = user_id_by_email(db_engine, creds.email)
+    with SessionLocal() as db:
+        job = _new_job(user=db.get(User, user_id),
+                       idem='hs-' + uuid.uuid4().hex[:8],
+                       mode=ImportMode(mode),
+                       filename='customer.csv',
+                       s3_key=source['s3_key'],
+                       size=source['file_size'],
+                       sha256=source['content_sha256'])
+        return _submit_job(db, Response(), job)
+
+
+def _outbox_tasks(db_engine, job_id: str) -> int:
+    with db_engine.connect() as conn:
+        return conn.execute(
+            text('SELECT count(*) FROM task_outbox WHERE args ->> 0 = :id'),
+            {'id': job_id},
+        ).scalar_one()
+
+
+def test_skip_policy_reuses_imported_file(client, user, other_user,
+                                          db_engine, monkeypatch):
+    from app.core.config import settings
+
+    csv_bytes = make_csv_bytes([[rand_email('hs'), 'H', '', '', 'X']])
+    first = create_import(client,
+                          token=user.token,
+                          idem_key='hs-' + uuid.uuid4().hex[:8],
+                          mode='upsert',
+                          csv_bytes=csv_bytes)
+    first = wait_job_done(client, token=user.token, job_id=first['id'])
+    assert first['status'] == 'done', first
+    with db_engine.connect() as conn:
+        first['s3_key'] = conn.execute(
+            text('SELECT s3_key FROM import_jobs WHERE id = :id'),
+            {'id': first['id']},
+        ).scalar_one()
+
+    monkeypatch.setattr(settings, 'duplicate_upload_policy', 'skip')
+    duplicate = _submit_same_file(user, db_engine, first, 'upsert')
+    assert duplicate['id'] != first['id']
+    assert duplicate['status'] == 'done'
+    assert duplicate['duplicate_of'] == first['id']
+    assert duplicate['processed_rows'] == first['processed_rows'] == 1
+    assert _outbox_tasks(db_engine, duplicate['id']) == 0
+
+    # другой пользователь и другой режим — обычный импорт через воркер
+    for creds, mode in ((other_user, 'upsert'), (user, 'validate')):
+        job = _submit_same_file(creds, db_engine, first, mode)
+        assert job['status'] == 'pending', job
+        final = wait_job_done(client, token=creds.token, job_id=job['id'])
+        assert final['status'] == 'done', final
+        assert final['duplicate_of'] is None
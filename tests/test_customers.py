@@ -0,0 +1,65 @@
+import uuid
+from http import HTTPStatus
+
+from .conftest import (
+    auth_headers,
+    create_import,
+    make_csv_bytes,
+    wait_job_done,
+)
+
+
+def _import_rows(client, token: str, rows: list[list[str]]) -> None:
+    job = create_import(client,
+                        token=token,
+                        idem_key='cs-' + uuid.uuid4().hex[:8],
+                        mode='insert_only',
+                        csv_bytes=make_csv_bytes(rows))
+    done = wait_job_done(client, token=token, job_id=job['id'])
+    assert done['status'] == 'done', done
+
+
+def _search(client, token: str, **params) -> list[dict]:
+    items = []
+    cursor = None
+    while True:
+        query = {**params, 'limit': 2}
+        if cursor:
+            query['cursor'] = cursor
+        resp = client.get('/customers', params=query,
+                          headers=auth_headers(token))
+        assert resp.status_code == HTTPStatus.OK, resp.text
+        page = resp.json()
+        items.extend(page['items'])
+        cursor = page['next_cursor']
+        if not cursor:
+            return items
+
+
+def test_customers_search_filters_and_pages(client, user):
+    tag = uuid.uuid4().hex[:6]
+    _import_rows(client, user.token, [
+        [f'ann_{tag}_{i}@test.com', 'A', 'Ivanova', '', 'Kazan']
+        for i in range(5)
+    ] + [
+        [f'bob_{tag}@test.com', 'B', 'Petrov', '', 'Moscow'],
+        [f'Ann_{tag}_x@test.com', 'A', 'Ivanenko', '', 'moscow'],
+    ])
+
+    by_email = _search(client, user.token, email_prefix=f'ANN_{tag}')
+    assert len(by_email) == 6
+    assert len({item['id'] for item in by_email}) == 6
+
+    by_city = _search(client, user.token, city='Moscow')
+    assert {item['last_name'] for item in by_city} == {'Petrov', 'Ivanenko'}
+
+    both = _search(client, user.token, last_name='ivan', city='kazan')
+    assert len(both) == 5
+
+    assert _search(client, user.token, email_prefix=f'ann_{tag}%') == []
+
+
+def test_customers_bad_cursor(client, user):
+    resp = client.get('/customers', params={'cursor': 'nope'},
+                      headers=auth_headers(user.token))
+    assert resp.status_code == HTTPStatus.BAD_REQUEST
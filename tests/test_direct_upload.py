@@ -0,0 +1,58 @@
+import uuid
+from http import HTTPStatus
+
+from .conftest import (
+    auth_headers,
+    make_csv_bytes,
+    rand_email,
+    rewrite_presigned_for_container,
+    wait_job_done,
+)
+
+
+def _upload_direct(client, token: str, csv_bytes: bytes) -> str:
+    resp = client.post('/imports/uploads', headers=auth_headers(token))
+    assert resp.status_code == HTTPStatus.CREATED, resp.text
+    upload = resp.json()
+
+    url, host_header = rewrite_presigned_for_container(upload['url'])
+    put = client.post(url,
+                      data=upload['fields'],
+                      files={'file': ('customer.csv', csv_bytes, 'text/csv')},
+                      headers={'Host': host_header} if host_header else None)
+    assert put.status_code in (HTTPStatus.OK, HTTPStatus.NO_CONTENT), put.text
+    return upload['upload_id']
+
+
+def test_direct_upload_import(client, user):
+    csv_bytes = make_csv_bytes([[rand_email('du'), 'D', '', '', 'X']])
+    upload_id = _upload_direct(client, user.token, csv_bytes)
+
+    idem = 'du-' + uuid.uuid4().hex[:8]
+    resp = client.post(f'/imports/{upload_id}/start',
+                       params={'mode': 'insert_only',
+                               'filename': 'direct.csv'},
+                       headers=auth_headers(user.token, idem_key=idem))
+    assert resp.status_code == HTTPStatus.CREATED, resp.text
+    job = resp.json()
+    assert job['file_size'] == len(csv_bytes)
+
+    again = client.post(f'/imports/{upload_id}/start',
+                        headers=auth_headers(user.token, idem_key=idem))
+    assert again.status_code == HTTPStatus.OK, again.text
+    assert again.json()['id'] == job['id']
+
+    done = wait_job_done(client, token=user.token, job_id=job['id'])
+    assert done['status'] == 'done', done
+    assert done['processed_rows'] == 1
+
+
+def test_start_unknown_or_foreign_upload_is_404(client, user, other_user):
+    upload_id = _upload_direct(client, user.token, make_csv_bytes([]))
+
+    for token, target in ((user.token, str(uuid.uuid4())),
+                          (other_user.token, upload_id)):
+        resp = client.post(
+            f'/imports/{target}/start',
+            headers=auth_headers(token, idem_key=uuid.uuid4().hex))
+        assert resp.status_code == HTTPStatus.NOT_FOUND, resp.text
@@ -0,0 +1,64 @@
+from http import HTTPStatus
+
+from .conftest import auth_headers, make_csv_bytes, rand_email
+from .helpers import (
+    create_and_wait,
+    make_failed_job_with_errors,
+    seed_customer,
+)
+
+
+def test_failed_job_has_error_stats(client, user):
+    email = seed_customer(client=client, user=user)
+    final, _ = make_failed_job_with_errors(client, user, dup_email=email)
+
+    assert final['error_count'] == 2
+    assert final['error_stats'] == {'already_exists': 1, 'invalid_email': 1}
+
+
+def test_error_rows_are_paged(client, user):
+    email = seed_customer(client=client, user=user)
+    final, _ = make_failed_job_with_errors(client, user, dup_email=email)
+
+    resp = client.get(f"/imports/{final['id']}/errors/rows",
+                      params={'offset': 0, 'limit': 1},
+                      headers=auth_headers(user.token))
+    assert resp.status_code == HTTPStatus.OK, resp.text
+    first = resp.json()
+    assert first['total'] == 2
+    assert len(first['rows']) == 1
+
+    resp = client.get(f"/imports/{final['id']}/errors/rows",
+                      params={'offset': 1, 'limit': 10},
+                      headers=auth_headers(user.token))
+    second = resp.json()
+    assert len(second['rows']) == 1
+
+    errors = {first['rows'][0]['error'], second['rows'][0]['error']}
+    assert errors == {f'email already exists "{email}"',
+                      'invalid email "bad_email"'}
+
+    resp = client.get(f"/imports/{final['id']}/errors/rows",
+                      params={'offset': 2},
+                      headers=auth_headers(user.token))
+    assert resp.json()['rows'] == []
+
+
+def test_db_error_marks_only_bad_rows(client, user):
+    rows = [[rand_email('de'), 'D', '', '', 'X'] for _ in range(30)]
+    rows[17][4] = 'X' * 500  # city длиннее varchar(128)
+    final = create_and_wait(client,
+                            token=user.token,
+                            idem_prefix='de',
+                            mode='upsert',
+                            csv_bytes=make_csv_bytes(rows))
+
+    assert final['status'] == 'failed', final
+    assert final['error_stats'] == {'db_error': 1}
+    assert final['error'].startswith('errors: 1; first: row 18:')
+
+    resp = client.get('/customers',
+                      params={'email_prefix': 'de_', 'limit': 100},
+                      headers=auth_headers(user.token))
+    assert resp.status_code == HTTPStatus.OK, resp.text
+    assert len(resp.json()['items']) == 29
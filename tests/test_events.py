@@ -0,0 +1,45 @@
+import json
+import uuid
+
+from .conftest import auth_headers, create_import, make_csv_bytes, rand_email
+
+
+def _read_events(client, token: str, job_id: str) -> list[dict]:
+    events = []
+    with client.stream('GET', f'/imports/{job_id}/events',
+                       headers=auth_headers(token),
+                       timeout=60.0) as resp:
+        assert resp.status_code == 200, resp.read()
+        assert resp.headers['content-type'].startswith('text/event-stream')
+        for line in resp.iter_lines():
+            if line.startswith('data: '):
+                events.append(json.loads(line[len('data: '):]))
+    return events
+
+
+def test_events_stream_ends_with_final_status(client, user):
+    csv_bytes = make_csv_bytes([[rand_email('ev'), 'E', '', '', 'X']])
+    job = create_import(client,
+                        token=user.token,
+                        idem_key='ev-' + uuid.uuid4().hex[:8],
+                        mode='insert_only',
+                        csv_bytes=csv_bytes)
+
+    events = _read_events(client, user.token, job['id'])
+
+    assert events, 'no events'
+    assert events[-1]['status'] == 'done'
+    assert events[-1]['processed_rows'] == 1
+
+
+def test_events_stream_is_scoped_to_user(client, user, other_user):
+    csv_bytes = make_csv_bytes([[rand_email('ev'), 'E', '', '', 'X']])
+    job = create_import(client,
+                        token=user.token,
+                        idem_key='ev-' + uuid.uuid4().hex[:8],
+                        mode='insert_only',
+                        csv_bytes=csv_bytes)
+
+    resp = client.get(f"/imports/{job['id']}/events",
+                      headers=auth_headers(other_user.token))
+    assert resp.status_code == 404, resp.text
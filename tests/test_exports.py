@@ -0,0 +1,73 @@
+import csv
+import gzip
+import io
+import time
+import uuid
+from http import HTTPStatus
+
+import httpx
+
+from .conftest import (
+    auth_headers,
+    create_import,
+    make_csv_bytes,
+    rewrite_presigned_for_container,
+    wait_job_done,
+)
+
+
+def _wait_export(client, token: str, export_id: str,
+                 timeout_s: float = 30.0) -> dict:
+    deadline = time.time() + timeout_s
+    while time.time() < deadline:
+        resp = client.get(f'/exports/{export_id}',
+                          headers=auth_headers(token))
+        assert resp.status_code == HTTPStatus.OK, resp.text
+        data = resp.json()
+        if data['status'] in ('done', 'failed'):
+            return data
+        time.sleep(0.5)
+    raise AssertionError(f'Export not finished in {timeout_s}s')
+
+
+def _download(client, token: str, export_id: str) -> bytes:
+    resp = client.get(f'/exports/{export_id}/download',
+                      headers=auth_headers(token))
+    assert resp.status_code == HTTPStatus.OK, resp.text
+    url, host = rewrite_presigned_for_container(resp.json()['url'])
+    headers = {'Host': host} if host else {}
+    file = httpx.get(url, headers=headers, timeout=30)
+    assert file.status_code == HTTPStatus.OK, file.text
+    return file.content
+
+
+def test_export_filtered_gzip(client, user):
+    tag = uuid.uuid4().hex[:6]
+    rows = [[f'ex_{tag}_{i}@test.com', 'E', 'Exp', '', f'City{tag}']
+            for i in range(3)] + [[f'other_{tag}@test.com', 'O', '', '', 'X']]
+    job = create_import(client, token=user.token,
+                        idem_key='ex-' + tag, mode='insert_only',
+                        csv_bytes=make_csv_bytes(rows))
+    assert wait_job_done(client, token=user.token,
+                         job_id=job['id'])['status'] == 'done'
+
+    resp = client.post('/exports', headers=auth_headers(user.token),
+                       json={'city': f'city{tag}', 'gzip': True})
+    assert resp.status_code == HTTPStatus.CREATED, resp.text
+    export = _wait_export(client, user.token, resp.json()['id'])
+    assert export['status'] == 'done', export
+    assert export['exported_rows'] == 3
+
+    content = gzip.decompress(_download(client, user.token, export['id']))
+    records = list(csv.DictReader(io.StringIO(content.decode())))
+    assert sorted(r['email'] for r in records) == sorted(
+        row[0] for row in rows[:3])
+
+
+def test_export_of_other_user_is_hidden(client, user, other_user):
+    resp = client.post('/exports', headers=auth_headers(user.token),
+                       json={})
+    assert resp.status_code == HTTPStatus.CREATED, resp.text
+    other = client.get(f'/exports/{resp.json()["id"]}',
+                       headers=auth_headers(other_user.token))
+    assert other.status_code == HTTPStatus.NOT_FOUND
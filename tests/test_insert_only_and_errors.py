@@ -90,3 +90,18 @@ def test_errors_endpoint_on_success_job_returns_404(client, user):
     resp = client.get(
         f"/imports/{job['id']}/errors", headers=auth_headers(user.token))
     assert resp.status_code == HTTPStatus.NOT_FOUND, resp.text
+
+
+def test_cr_line_endings_are_parsed(client, user):
+    csv_bytes = make_csv_bytes([[rand_email('cr'), 'C', '', '', 'X'],
+                                [rand_email('cr'), 'C', '', '', 'X'],
+                                ['bad_email', 'C', '', '', 'X']])
+    final = create_and_wait(client,
+                            token=user.token,
+                            idem_prefix='cr',
+                            mode='insert_only',
+                            csv_bytes=csv_bytes.replace(b'\r\n', b'\r'))
+
+    assert final['total_rows'] == 3, final
+    assert final['processed_rows'] == 3
+    assert final['error_stats'] == {'invalid_email': 1}
@@ -0,0 +1,57 @@
+import uuid
+from http import HTTPStatus
+
+from .conftest import auth_headers, create_import, make_csv_bytes, rand_email
+
+
+def _create_jobs(client, token: str, count: int) -> list[str]:
+    return [
+        create_import(client,
+                      token=token,
+                      idem_key=f'ls{i}-' + uuid.uuid4().hex[:8],
+                      mode='validate',
+                      csv_bytes=make_csv_bytes(
+                          [[rand_email('ls'), 'L', '', '', 'X']]))['id']
+        for i in range(count)
+    ]
+
+
+def test_list_imports_keyset_pagination(client, user, other_user):
+    ids = _create_jobs(client, user.token, 3)
+    _create_jobs(client, other_user.token, 1)
+
+    seen = []
+    cursor = None
+    while True:
+        params = {'limit': 2}
+        if cursor:
+            params['cursor'] = cursor
+        resp = client.get('/imports', params=params,
+                          headers=auth_headers(user.token))
+        assert resp.status_code == HTTPStatus.OK, resp.text
+        page = resp.json()
+        seen.extend(item['id'] for item in page['items'])
+        cursor = page['next_cursor']
+        if not cursor:
+            break
+
+    assert seen == list(reversed(ids))
+
+
+def test_list_imports_rejects_bad_cursor(client, user):
+    resp = client.get('/imports', params={'cursor': 'not-a-cursor'},
+                      headers=auth_headers(user.token))
+    assert resp.status_code == HTTPStatus.BAD_REQUEST, resp.text
+
+
+def test_batch_status_is_scoped_to_user(client, user, other_user):
+    mine = _create_jobs(client, user.token, 2)
+    foreign = _create_jobs(client, other_user.token, 1)
+
+    resp = client.post('/imports/status',
+                       json={'ids': mine + foreign},
+                       headers=auth_headers(user.token))
+    assert resp.status_code == HTTPStatus.OK, resp.text
+    data = resp.json()
+    assert sorted(item['id'] for item in data['items']) == sorted(mine)
+    assert data['not_found'] == foreign
@@ -0,0 +1,25 @@
+import uuid
+
+from sqlalchemy import text
+
+from .conftest import create_import, make_csv_bytes, rand_email, wait_job_done
+
+
+def test_import_is_relayed_through_outbox(client, user, db_engine):
+    job = create_import(client,
+                        token=user.token,
+                        idem_key='ob-' + uuid.uuid4().hex[:8],
+                        mode='insert_only',
+                        csv_bytes=make_csv_bytes(
+                            [[rand_email('ob'), 'O', '', '', 'X']]))
+
+    done = wait_job_done(client, token=user.token, job_id=job['id'])
+    assert done['status'] == 'done', done
+
+    with db_engine.connect() as conn:
+        pending = conn.execute(
+            text("SELECT count(*) FROM task_outbox "
+                 "WHERE args->>0 = :job_id"),
+            {'job_id': job['id']},
+        ).scalar_one()
+    assert pending == 0
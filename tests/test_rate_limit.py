@@ -0,0 +1,45 @@
+import os
+import uuid
+from http import HTTPStatus
+
+from .conftest import auth_headers, make_csv_bytes, rand_email
+
+BURST = int(os.getenv('IMPORT_RATE_BURST', '20'))
+
+
+def _post_import(client, token: str, idem_key: str):
+    csv_bytes = make_csv_bytes([[rand_email('rl'), 'R', '', '', 'X']])
+    return client.post(
+        '/imports',
+        params={'mode': 'validate'},
+        headers=auth_headers(token, idem_key=idem_key),
+        files={'file': ('customer.csv', csv_bytes, 'text/csv')},
+    )
+
+
+def test_import_rate_limit_returns_429_with_retry_after(client, user):
+    statuses = []
+    rejected = None
+    for _ in range(BURST + 5):
+        resp = _post_import(client, user.token, 'rl-' + uuid.uuid4().hex)
+        statuses.append(resp.status_code)
+        if resp.status_code == HTTPStatus.TOO_MANY_REQUESTS:
+            rejected = resp
+            break
+
+    assert rejected is not None, statuses
+    assert int(rejected.headers['Retry-After']) >= 1
+    assert statuses.count(HTTPStatus.CREATED) >= BURST
+
+
+def test_idempotent_retry_is_not_rate_limited(client, user):
+    idem = 'rl-same-' + uuid.uuid4().hex[:8]
+    first = _post_import(client, user.token, idem)
+    assert first.status_code == HTTPStatus.CREATED, first.text
+
+    for _ in range(BURST + 1):
+        _post_import(client, user.token, 'rl-' + uuid.uuid4().hex)
+
+    again = _post_import(client, user.token, idem)
+    assert again.status_code == HTTPStatus.OK, again.text
+    assert again.json()['id'] == first.json()['id']
@@ -0,0 +1,57 @@
+import uuid
+from http import HTTPStatus
+
+from sqlalchemy import text
+
+from .conftest import (
+    auth_headers,
+    create_import,
+    make_csv_bytes,
+    rand_email,
+    wait_job_done,
+)
+
+
+def _import(client, token: str, csv_bytes: bytes) -> dict:
+    job = create_import(client,
+                        token=token,
+                        idem_key='rt-' + uuid.uuid4().hex[:8],
+                        mode='validate',
+                        csv_bytes=csv_bytes)
+    return wait_job_done(client, token=token, job_id=job['id'])
+
+
+def test_gc_keeps_upload_shared_with_live_job(client, user, db_engine):
+    from app.storage.s3 import object_exists
+    from worker.retention import gc_expired_imports
+
+    csv_bytes = make_csv_bytes([[rand_email('rt'), 'R', '', '', 'X'],
+                                ['bad-email', 'R', '', '', 'X']])
+    old = _import(client, user.token, csv_bytes)
+    fresh = _import(client, user.token, csv_bytes)
+
+    with db_engine.begin() as conn:
+        conn.execute(
+            text("UPDATE import_jobs "
+                 "SET created_at = now() - interval '400 days' "
+                 "WHERE id = :id"),
+            {'id': old['id']},
+        )
+        upload_key, report_key = conn.execute(
+            text("SELECT s3_key, error_report_object_key "
+                 "FROM import_jobs WHERE id = :id"),
+            {'id': old['id']},
+        ).one()
+
+    stats = gc_expired_imports()
+    assert stats['jobs'] == 1, stats
+
+    gone = client.get(f'/imports/{old["id"]}',
+                      headers=auth_headers(user.token))
+    assert gone.status_code == HTTPStatus.NOT_FOUND
+    kept = client.get(f'/imports/{fresh["id"]}',
+                      headers=auth_headers(user.token))
+    assert kept.status_code == HTTPStatus.OK
+
+    assert object_exists(upload_key)
+    assert report_key and not object_exists(report_key)
@@ -0,0 +1,70 @@
+import uuid
+from contextlib import ExitStack
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy import text
+
+from .conftest import (
+    auth_headers,
+    get_import,
+    make_csv_bytes,
+    rand_email,
+    wait_job_done,
+)
+
+
+def test_sync_import_returns_finished_job(client, user):
+    csv_bytes = make_csv_bytes([
+        [rand_email('sy'), 'S', '', '', 'X'],
+        ['not-an-email', 'S', '', '', 'X'],
+    ])
+    resp = client.post(
+        '/imports',
+        params={'mode': 'insert_only', 'sync': 'true'},
+        headers=auth_headers(user.token,
+                             idem_key='sy-' + uuid.uuid4().hex[:8]),
+        files={'file': ('customer.csv', csv_bytes, 'text/csv')},
+    )
+    assert resp.status_code == HTTPStatus.CREATED, resp.text
+    job = resp.json()
+
+    assert job['status'] == 'failed'
+    assert job['processed_rows'] == 2
+    assert job['error_count'] == 1
+    assert job['error_stats'] == {'invalid_email': 1}
+
+    stored = get_import(client, token=user.token, job_id=job['id'])
+    assert stored['json'] == job
+
+
+def test_sync_import_respects_tenant_limit(client, user, db_engine):
+    from app.core.config import settings
+    from app.core.fairness import tenant_slot
+
+    limit = settings.tenant_max_concurrent_imports
+    if limit <= 0:
+        pytest.skip('TENANT_MAX_CONCURRENT_IMPORTS=0')
+    with db_engine.connect() as conn:
+        user_id = conn.execute(text('SELECT id FROM users WHERE email = :e'),
+                               {'e': user.email}).scalar_one()
+
+    with ExitStack() as slots:
+        for _ in range(limit):
+            assert slots.enter_context(tenant_slot(user_id, uuid.uuid4()))
+        resp = client.post(
+            '/imports',
+            params={'mode': 'insert_only', 'sync': 'true'},
+            headers=auth_headers(user.token,
+                                 idem_key='sl-' + uuid.uuid4().hex[:8]),
+            files={'file': ('customer.csv',
+                            make_csv_bytes([[rand_email('sl'), 'S', '', '',
+                                             'X']]),
+                            'text/csv')},
+        )
+        assert resp.status_code == HTTPStatus.ACCEPTED, resp.text
+        assert resp.json()['status'] == 'pending'
+
+    final = wait_job_done(client, token=user.token, job_id=resp.json()['id'],
+                          timeout_s=60)
+    assert final['status'] == 'done', final
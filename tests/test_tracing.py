@@ -0,0 +1,35 @@
+from types import SimpleNamespace
+
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from sqlalchemy.orm import Session
+
+
+def test_trace_context_survives_outbox(db_engine, monkeypatch):
+    from app.core import tracing
+    from app.core.outbox import enqueue_task
+
+    monkeypatch.setattr(tracing, 'tracer',
+                        TracerProvider().get_tracer('test'))
+    with Session(db_engine) as db:
+        with tracing.tracer.start_as_current_span('create_import') as parent:
+            message = enqueue_task(db, 'ping', args=[])
+        db.rollback()
+    trace_id = parent.get_span_context().trace_id
+
+    with tracing.publish_span(message.headers, 'ping') as headers:
+        pass
+    assert headers['traceparent'] != message.headers['traceparent']
+
+    with tracing.task_span('ping', SimpleNamespace(headers=headers)) as span:
+        assert span.get_span_context().trace_id == trace_id
+        assert trace.get_current_span() is span
+
+
+def test_no_trace_headers_outside_span(db_engine):
+    from app.core.outbox import enqueue_task
+
+    with Session(db_engine) as db:
+        message = enqueue_task(db, 'ping', args=[])
+        db.rollback()
+    assert message.headers is None
@@ -0,0 +1,51 @@
+from sqlalchemy import text
+
+from .conftest import make_csv_bytes, rand_email
+from .helpers import create_and_wait, seed_customer
+
+
+def test_validate_counts_and_writes_nothing(client, user, db_engine):
+    existing = seed_customer(client=client, user=user)
+    new_email = rand_email('val')
+
+    csv_bytes = make_csv_bytes([
+        [existing, 'B', '', '', 'NewCity'],
+        [new_email, 'N', '', '', 'Calgary'],
+        ['bad_email', 'X', '', '', 'Nowhere'],
+    ])
+    final = create_and_wait(
+        client,
+        token=user.token,
+        idem_prefix='val',
+        mode='validate',
+        csv_bytes=csv_bytes,
+    )
+
+    assert final['status'] == 'failed', final
+    assert final['would_update_rows'] == 1
+    assert final['would_insert_rows'] == 1
+
+    with db_engine.connect() as conn:
+        row = conn.execute(
+            text('SELECT city FROM customers WHERE email=:email'),
+            {'email': existing}).one()
+        assert row[0] == 'OldCity'
+
+        cnt = conn.execute(
+            text('SELECT count(*) FROM customers WHERE email=:email'),
+            {'email': new_email}).scalar_one()
+        assert cnt == 0
+
+
+def test_validate_clean_file_is_done(client, user):
+    csv_bytes = make_csv_bytes([[rand_email('val'), 'A', '', '', 'Z']])
+    final = create_and_wait(
+        client,
+        token=user.token,
+        idem_prefix='val-ok',
+        mode='validate',
+        csv_bytes=csv_bytes,
+    )
+    assert final['status'] == 'done', final
+    assert final['would_insert_rows'] == 1
+    assert final['would_update_rows'] == 0
@@ -1,344 +1,431 @@
-import csv
-import io
+import random
 import time
 import uuid
-from typing import Iterator
+from array import array
+from contextlib import ExitStack
+from dataclasses import dataclass, field
 
 from celery import Celery
+from celery.signals import (
+    worker_init,
+    worker_process_init,
+    worker_process_shutdown,
+)
 from celery.utils.log import get_task_logger
 from sqlalchemy import select, update
-from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import DataError, IntegrityError
 
 from app.core.config import settings
-from app.db.session import SessionLocal
-from app.models.customer import Customer
+from app.core.events import publish_job_event
+from app.core.fairness import tenant_slot
+from app.core.tracing import init_tracing, shutdown_tracing, task_span
+from app.db.session import SessionLocal, init_engine, set_engine_role
 from app.models.import_job import ImportJob, ImportMode, JobStatus
-from app.storage.s3 import get_bytes, put_bytes
-from worker.errors_report import ErrorRow, build_errors_csv
+from app.services.batching import AdaptiveBatchSize
+from app.services.errors_report import ErrorCode, ErrorCollector
+from app.services.importing import (
+    CLAIM_FIELDS,
+    BatchBuffer,
+    CustomerFields,
+    cancel_requested,
+    claim_job,
+    count_csv_rows,
+    errors_report_fields,
+    execute_import,
+    finish_job,
+    flush_with_bisect,
+    flush_with_retry,
+    get_flusher,
+    iter_csv_records,
+    load_job_meta,
+    mark_failed,
+    parse_customer_row,
+    row_email,
+)
+from app.storage.s3 import get_bytes
 
 app = Celery(
     'bulk_import',
     broker=settings.redis_url,
     backend=settings.redis_url,
+    include=['worker.retention', 'worker.exports'],
 )
 
 app.conf.broker_connection_retry_on_startup = True
 app.conf.broker_connection_retry = True
+# по одной задаче на процесс: отложенные и большие импорты не копятся
+# в prefetch одного воркера, пока свободны другие
+app.conf.worker_prefetch_multiplier = 1
+app.conf.beat_schedule = {
+    'gc-expired-imports': {
+        'task': 'gc_expired_imports',
+        'schedule': settings.gc_interval_seconds,
+    },
+}
 
 logger = get_task_logger(__name__)
 
-PROGRESS_EVERY = settings.progress_every
-BATCH_SIZE = settings.batch_size
-IMPORT_SLOW_MS = settings.import_slow_ms
 
+@worker_init.connect
+def _use_worker_pool(**kwargs) -> None:
+    # пулы без fork (solo/threads) создадут engine лениво, уже с
+    # настройками воркера
+    set_engine_role('worker')
 
-@app.task(name='ping')
-def ping():
-    return 'pong'
 
+@worker_process_init.connect
+def _init_process_engine(**kwargs) -> None:
+    init_engine('worker')
+    init_tracing('bulk-import-worker')
 
-def iter_csv_rows(data: bytes) -> Iterator[list[str]]:
-    with io.TextIOWrapper(
-        io.BytesIO(data),
-        encoding='utf-8-sig',
-        errors='replace',
-        newline='',
-    ) as text:
-        reader = csv.reader(text)
-        next(reader, None)
-        yield from reader
 
+@worker_process_shutdown.connect
+def _flush_traces(**kwargs) -> None:
+    shutdown_tracing()
 
-def count_csv_rows(data: bytes) -> int:
-    return sum(1 for _ in iter_csv_rows(data))
 
-
-def _update_job(db, job_uuid: uuid.UUID, **fields) -> None:
-    db.execute(
-        update(ImportJob)
-        .where(ImportJob.id == job_uuid)
-        .values(**fields)
-    )
-    db.commit()
+@app.task(name='ping')
+def ping():
+    return 'pong'
 
 
-def _norm(s: str | None) -> str | None:
-    if s is None:
+def parse_job_id(job_id: str) -> uuid.UUID | None:
+    try:
+        return uuid.UUID(job_id)
+    except ValueError:
         return None
-    s = s.strip()
-    return s or None
 
 
-def parse_customer_row(row: list[str],
-                       row_num: int) -> tuple[dict | None, str | None]:
-    if not row:
-        return None, f'row {row_num}: empty row'
+# режимы, которые можно писать общими батчами: validate ничего не
+# пишет, и его счётчики would_* ведутся на flusher, а не на job
+COALESCE_MODES = frozenset({ImportMode.insert_only, ImportMode.upsert})
 
-    email = _norm(row[0])
-    if not email:
-        return None, f'row {row_num}: empty email'
 
-    if '@' not in email or '.' not in email.split('@')[-1]:
-        return None, f'row {row_num}: invalid email "{email}"'
+def is_coalescable(mode: ImportMode, file_size: int | None) -> bool:
+    return (settings.coalesce_small_imports
+            and mode in COALESCE_MODES
+            and file_size is not None
+            and file_size <= settings.coalesce_max_bytes)
 
-    return {
-        'id': uuid.uuid4(),
-        'email': email,
-        'first_name': _norm(row[1]) if len(row) > 1 else None,
-        'last_name': _norm(row[2]) if len(row) > 2 else None,
-        'phone': _norm(row[3]) if len(row) > 3 else None,
-        'city': _norm(row[4]) if len(row) > 4 else None,
-    }, None
 
+@dataclass(slots=True)
+class CoalescedJob:
+    """Маленький job, записываемый общими батчами с другими."""
 
-class BatchBuffer:
-    """Буфер строк для пакетной записи в БД.
+    id: uuid.UUID
+    source: bytes
+    errors: ErrorCollector = field(default_factory=ErrorCollector)
+    processed: int = 0
+    retries: int = 0
+    cancelled: bool = False
 
-    rows: хранит подготовленные payload'ы для INSERT/UPSRT,
-    rows_nums: хранит номер строк исходного CSV (для errors.csv).
-    """
 
-    def __init__(self, size: int):
-        self.size = size
-        self.rows: list[dict] = []
-        self.row_nums: list[int] = []
+class SharedBatchBuffer(BatchBuffer):
+    """BatchBuffer со строками нескольких job.
 
-    def add(self, payload: dict, row_num: int) -> None:
-        self.rows.append(payload)
-        self.row_nums.append(row_num)
+    row_nums здесь — позиция строки в буфере: по ней ошибки flusher
+    (already_exists) возвращаются своему job через owners (индекс job) и
+    job_rows (номер строки в его файле). emails — email в буфере: строка
+    с тем же email из другого job сначала сбрасывает буфер, чтобы job
+    видели записи друг друга в том же порядке, что и поодиночке.
+    """
 
-    def full(self) -> bool:
-        return len(self.rows) >= self.size
+    __slots__ = ('owners', 'job_rows', 'emails')
 
-    def clear(self) -> None:
-        self.rows.clear()
-        self.row_nums.clear()
+    def __init__(self, size: int):
+        super().__init__(size)
+        self.owners = array('I')
+        self.job_rows = array('q')
+        self.emails: set[str] = set()
+
+    def add_job_row(self,
+                    owner: int,
+                    fields: CustomerFields,
+                    row_num: int,
+                    start: int,
+                    end: int) -> None:
+        self.add(fields, len(self), start, end)
+        self.owners.append(owner)
+        self.job_rows.append(row_num)
+        self.emails.add(fields[0])
+
+    def _fields(self, i: int) -> CustomerFields:
+        return (self.email[i], self.first_name[i], self.last_name[i],
+                self.phone[i], self.city[i])
+
+    def job_slice(self, owner: int) -> BatchBuffer:
+        """Строки одного job обычным BatchBuffer (с его номерами строк)."""
+        part = BatchBuffer(self.size)
+        for i, row_owner in enumerate(self.owners):
+            if row_owner == owner:
+                part.add(self._fields(i), self.job_rows[i], self.starts[i],
+                         self.ends[i])
+        return part
+
+    def without(self, owners: set[int]) -> 'SharedBatchBuffer':
+        """Копия буфера без строк job из owners."""
+        rest = SharedBatchBuffer(self.size)
+        for i, owner in enumerate(self.owners):
+            if owner not in owners:
+                rest.add_job_row(owner, self._fields(i), self.job_rows[i],
+                                 self.starts[i], self.ends[i])
+        return rest
 
+    def clear(self) -> None:
+        super().clear()
+        del self.owners[:]
+        del self.job_rows[:]
+        self.emails.clear()
 
-class UpsertFlusher:
-    """Запись в режиме upsert.
 
-    Реализован через PostgreSQL INSERT ... ON CONFLICT(email) DO UPDATE.
-    Дубли в файле могут считаться ошибками.
-    """
-
-    def flush(
-        self,
-        db,
-        buffer: BatchBuffer,
-        errors: list[str],
-        error_rows: list[ErrorRow],
-    ) -> None:
-        if not buffer.rows:
-            return
+ClaimedJob = tuple[uuid.UUID, str]
 
-        stmt = pg_insert(Customer).values(buffer.rows)
 
-        # обновляем поля, но НЕ трогаем id/email
-        stmt = stmt.on_conflict_do_update(
-            index_elements=[Customer.email],
-            set_={
-                'first_name': stmt.excluded.first_name,
-                'last_name': stmt.excluded.last_name,
-                'phone': stmt.excluded.phone,
-                'city': stmt.excluded.city,
-            },
-        )
+def claim_small_jobs(db,
+                     mode: ImportMode,
+                     *,
+                     exclude: uuid.UUID,
+                     limit: int,
+                     slots: ExitStack) -> list[ClaimedJob]:
+    """Забирает до limit ожидающих маленьких job того же режима.
 
-        db.execute(stmt)
-        db.commit()
+    SKIP LOCKED: параллельные воркеры не забирают одни и те же job;
+    их собственные задачи process_import потом увидят не pending.
+    Каждый забранный job держит слот своего пользователя (tenant_slot)
+    в slots, как при импорте по одному: job пользователя без свободного
+    слота остаётся pending и ждёт своей задачи.
+    """
+    if limit <= 0:
+        return []
+    candidates = db.execute(
+        select(ImportJob.id, ImportJob.user_id)
+        .where(ImportJob.status == JobStatus.pending,
+               ImportJob.mode == mode,
+               ImportJob.file_size <= settings.coalesce_max_bytes,
+               ImportJob.id != exclude)
+        .order_by(ImportJob.created_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    ).all()
+    ids = [job_id for job_id, user_id in candidates
+           if slots.enter_context(tenant_slot(user_id, job_id))]
+    rows = []
+    if ids:
+        rows = db.execute(
+            update(ImportJob)
+            .where(ImportJob.id.in_(ids))
+            .values(**CLAIM_FIELDS)
+            .returning(ImportJob.id, ImportJob.s3_key)
+        ).all()
+    db.commit()
+    for job_id, _ in rows:
+        publish_job_event(job_id, CLAIM_FIELDS)
+    return [(job_id, s3_key) for job_id, s3_key in rows]
 
 
-class InsertOnlyFlusher:
-    """Запись в режиме Insert_only.
+def _drop_cancelled(buffer: SharedBatchBuffer,
+                    jobs: list[CoalescedJob]) -> SharedBatchBuffer:
+    """Снимает с батча строки job, для которых запрошена отмена.
 
-    Правило: если email уже есть в БД или повторяется в самом файле:
-      строка попадает в errors, остальные строки вставляются.
+    Флаг отмены проверяется для каждого job батча. Отменённый job больше
+    не разбирается (CoalescedJob.cancelled), его незаписанные строки не
+    входят в processed — как при обычном импорте.
     """
+    dropped = set()
+    for owner in set(buffer.owners):
+        if cancel_requested(jobs[owner].id):
+            jobs[owner].cancelled = True
+            dropped.add(owner)
+    if not dropped:
+        return buffer
+    for owner in buffer.owners:
+        if owner in dropped:
+            jobs[owner].processed -= 1
+    return buffer.without(dropped)
+
+
+def _write_shared(db,
+                  flusher,
+                  batch: SharedBatchBuffer,
+                  jobs: list[CoalescedJob]) -> None:
+    owners = sorted(set(batch.owners))
+    batch_errors = ErrorCollector()
+    try:
+        retries = flush_with_retry(db, flusher, batch, batch_errors)
+    except (IntegrityError, DataError):
+        retries = 0
+        for owner in owners:
+            job = jobs[owner]
+            job.retries += flush_with_bisect(db, flusher,
+                                             batch.job_slice(owner),
+                                             job.errors)
+
+    for pos, code, start, end in batch_errors.entries():
+        jobs[batch.owners[pos]].errors.add(
+            batch.job_rows[pos], code, batch.email[pos], start, end)
+    for owner in owners:
+        jobs[owner].retries += retries
+
+
+def _flush_shared(db,
+                  flusher,
+                  buffer: SharedBatchBuffer,
+                  jobs: list[CoalescedJob],
+                  batch_size: AdaptiveBatchSize) -> None:
+    """Пишет общий батч одной транзакцией и раздаёт ошибки по job.
+
+    Строки job с запрошенной отменой в батч не попадают. Если БД
+    отвергла батч (IntegrityError/DataError), он переписывается по job,
+    а строки job — как при обычном импорте (flush_with_bisect): db_error
+    получают только строки, которые БД не принимает.
+    """
+    if not len(buffer):
+        return
+    started = time.perf_counter()
+    batch = _drop_cancelled(buffer, jobs)
+    if len(batch):
+        _write_shared(db, flusher, batch, jobs)
+    buffer.size = batch_size.observe(len(batch),
+                                     time.perf_counter() - started)
+    buffer.clear()
 
-    def flush(
-        self,
-        db,
-        buffer: BatchBuffer,
-        errors: list[str],
-        error_rows: list[ErrorRow],
-    ) -> None:
-        if not buffer.rows:
-            return
-
-        emails = [row['email'] for row in buffer.rows]
-        existing = set(
-            db.execute(
-                select(Customer.email).where(Customer.email.in_(emails))
-            )
-            .scalars()
-            .all()
-        )
 
-        to_insert: list[dict] = []
+def _read_job(db,
+              flusher,
+              buffer: SharedBatchBuffer,
+              jobs: list[CoalescedJob],
+              owner: int,
+              batch_size: AdaptiveBatchSize) -> None:
+    """Разбирает файл job в общий буфер; останавливается при отмене job."""
+    job = jobs[owner]
+    if cancel_requested(job.id):
+        job.cancelled = True
+        return
 
-        for payload, rn in zip(buffer.rows, buffer.row_nums):
-            email = payload['email']
+    seen_emails: set[str] = set()
+    records = iter_csv_records(job.source)
+    for row_num, (row, start, end) in enumerate(records, start=1):
+        fields, code = parse_customer_row(row)
+        if code is None and fields[0] in seen_emails:
+            code = ErrorCode.duplicate_in_file
+        if code is None and fields[0] in buffer.emails:
+            _flush_shared(db, flusher, buffer, jobs, batch_size)
+        if job.cancelled:
+            return
 
-            if email in existing:
-                msg = f'email already exists "{email}"'
+        job.processed += 1
+        if code is not None:
+            job.errors.add(row_num, code, row_email(row), start, end)
+            continue
+        seen_emails.add(fields[0])
+        buffer.add_job_row(owner, fields, row_num, start, end)
+        if buffer.full():
+            _flush_shared(db, flusher, buffer, jobs, batch_size)
 
-                if len(errors) < 3:
-                    errors.append(f'row {rn}: {msg}')
 
-                raw = ','.join(
-                    [
-                        payload.get('email') or '',
-                        payload.get('first_name') or '',
-                        payload.get('last_name') or '',
-                        payload.get('phone') or '',
-                        payload.get('city') or '',
-                    ]
-                )
-                error_rows.append(ErrorRow(row=rn, error=msg, raw=raw))
-            else:
-                to_insert.append(payload)
+def write_coalesced(db, jobs: list[CoalescedJob], mode: ImportMode) -> dict:
+    """Разбирает файлы jobs и пишет их строки общими батчами.
 
-        if to_insert:
-            db.execute(pg_insert(Customer).values(to_insert))
+    Дубли ищутся внутри каждого файла отдельно, ошибки копятся в
+    CoalescedJob.errors. Флаг отмены job проверяется перед разбором его
+    файла и перед каждым батчем с его строками. Возвращает тайминги
+    батчей.
+    """
+    flusher = get_flusher(mode)
+    batch_size = AdaptiveBatchSize.from_settings()
+    buffer = SharedBatchBuffer(batch_size.size)
 
-        db.commit()
+    for owner in range(len(jobs)):
+        _read_job(db, flusher, buffer, jobs, owner, batch_size)
 
+    _flush_shared(db, flusher, buffer, jobs, batch_size)
+    return batch_size.timings()
 
-def get_flusher(mode: ImportMode):
-    return (
-        InsertOnlyFlusher()
-        if mode == ImportMode.insert_only else UpsertFlusher())
 
+def _load_coalesced(db, claimed: list[ClaimedJob]) -> list[CoalescedJob]:
+    jobs = []
+    for job_id, s3_key in claimed:
+        try:
+            jobs.append(CoalescedJob(id=job_id, source=get_bytes(s3_key)))
+        except Exception as e:
+            mark_failed(db, job_id, e)
+            logger.exception('Import failed: %s', job_id)
+    return jobs
 
-def _short_error_summary(errors_head: list[str],
-                         total: int,
-                         limit: int = 3) -> str:
-    if total == 0:
-        return ''
-    head = ' | '.join(errors_head[:limit])
-    if total > limit:
-        return f'errors: {total}; first: {head} ...'
-    return f'errors: {total}; first: {head}'
 
+def run_coalesced(db,
+                  job_uuid: uuid.UUID,
+                  s3_key: str,
+                  mode: ImportMode) -> int:
+    """Импортирует job вместе с другими ожидающими маленькими job.
 
-def parse_job_id(job_id: str) -> uuid.UUID | None:
+    job_uuid уже забран вызывающим (и держит слот пользователя); к нему
+    добираются до COALESCE_MAX_JOBS - 1 job того же режима, слоты их
+    пользователей держатся до конца. Строки всех файлов пишутся общими
+    батчами (один commit на батч вместо одного на job), а каждый job
+    завершается отдельно — с теми же полями и errors.csv, что и при
+    обычном импорте. Возвращает число импортированных job.
+    """
+    with ExitStack() as slots:
+        return _run_coalesced(db, job_uuid, s3_key, mode, slots)
+
+
+def _run_coalesced(db,
+                   job_uuid: uuid.UUID,
+                   s3_key: str,
+                   mode: ImportMode,
+                   slots: ExitStack) -> int:
+    clock = time.perf_counter()
+    claimed = [(job_uuid, s3_key)] + claim_small_jobs(
+        db, mode, exclude=job_uuid, limit=settings.coalesce_max_jobs - 1,
+        slots=slots)
+    jobs = _load_coalesced(db, claimed)
+    download_seconds = round(time.perf_counter() - clock, 3)
+
+    clock = time.perf_counter()
     try:
-        return uuid.UUID(job_id)
-    except ValueError:
-        return None
-
-
-def load_job_meta(db, job_uuid: uuid.UUID) -> tuple[str, ImportMode] | None:
-    row = db.execute(
-        select(ImportJob.s3_key, ImportJob.mode).where(
-            ImportJob.id == job_uuid)
-    ).one_or_none()
-    if row is None:
-        return None
-    return row[0], row[1]
-
-
-def mark_failed(db, job_uuid: uuid.UUID, err: Exception) -> None:
-    db.rollback()
-    _update_job(
-        db,
-        job_uuid,
-        status=JobStatus.failed,
-        error=f'{type(err).__name__}: {err}',
-    )
-
-
-def process_csv(db,
-                job_uuid: uuid.UUID,
-                data: bytes,
-                flusher) -> tuple[int, list[str], list[ErrorRow], int]:
-    processed = 0
-    errors: list[str] = []
-    error_rows: list[ErrorRow] = []
-    error_count = 0
-    seen_emails: set[str] = set()
-    buffer = BatchBuffer(BATCH_SIZE)
-
-    for row_num, row in enumerate(iter_csv_rows(data), start=1):
-        processed += 1
-        payload, err = parse_customer_row(row, row_num)
-
-        if err:
-            error_count += 1
-
-            if len(errors) < 3:
-                errors.append(err)
-
-            error_rows.append(ErrorRow(row=row_num,
-                                       error=err,
-                                       raw=','.join(row)))
-        else:
-            email = payload['email']
-            if email in seen_emails:
-                msg = f'duplicate email "{email}" in file'
-                error_count += 1
-
-                if len(errors) < 3:
-                    errors.append(f'row {row_num}: {msg}')
-                error_rows.append(ErrorRow(row=row_num,
-                                           error=msg,
-                                           raw=','.join(row)))
-            else:
-                seen_emails.add(email)
-                buffer.add(payload, row_num)
-
-        if IMPORT_SLOW_MS:
-            time.sleep(IMPORT_SLOW_MS / 1000)
-
-        if processed % PROGRESS_EVERY == 0:
-            _update_job(db, job_uuid, processed_rows=processed)
-
-        if buffer.full():
-            flusher.flush(db, buffer, errors, error_rows)
-            buffer.clear()
-
-    flusher.flush(db, buffer, errors, error_rows)
-    buffer.clear()
-
-    error_count = len(error_rows)
-    return processed, errors, error_rows, error_count
-
-
-def run_import(db, job_uuid: uuid.UUID, s3_key: str, mode: ImportMode) -> None:
-    _update_job(db, job_uuid, status=JobStatus.processing,
-                error=None, processed_rows=0)
-
-    data = get_bytes(s3_key)
-    total = count_csv_rows(data=data)
-    _update_job(db, job_uuid, total_rows=total, processed_rows=0)
-
-    flusher = get_flusher(mode)
-    processed, errors, error_rows, error_count = process_csv(
-        db, job_uuid, data, flusher)
-
-    report_key = None
-    if error_rows:
-        errors_bytes = build_errors_csv(error_rows)
-        report_key = put_bytes(errors_bytes, filename=f'errors_{job_uuid}.csv')
+        batch_timings = write_coalesced(db, jobs, mode)
+    except Exception as e:
+        for job in jobs:
+            mark_failed(db, job.id, e)
+        raise
+    timings = {
+        'coalesced_jobs': len(jobs),
+        'download_seconds': download_seconds,
+        'process_seconds': round(time.perf_counter() - clock, 3),
+        **batch_timings,
+    }
+
+    for job in jobs:
+        try:
+            finish_job(db, job.id,
+                       processed=job.processed,
+                       errors=job.errors,
+                       timings=timings,
+                       cancelled=job.cancelled,
+                       total_rows=count_csv_rows(job.source),
+                       flush_retries=ImportJob.flush_retries + job.retries,
+                       **errors_report_fields(job.id, job.errors,
+                                              job.source))
+        except Exception as e:
+            mark_failed(db, job.id, e)
+            logger.exception('Import failed: %s', job.id)
+    return len(jobs)
 
-    final_status = JobStatus.done if error_count == 0 else JobStatus.failed
-    final_error = None if error_count == 0 else _short_error_summary(
-        errors, total=error_count)
 
-    _update_job(
-        db,
-        job_uuid,
-        processed_rows=processed,
-        status=final_status,
-        error=final_error,
-        error_report_object_key=report_key,
-        error_count=error_count,
-    )
+def execute_coalesced(db,
+                      job_uuid: uuid.UUID,
+                      s3_key: str,
+                      mode: ImportMode) -> str:
+    if not claim_job(db, job_uuid):
+        logger.info('ImportJob already claimed: %s', job_uuid)
+        return 'already_claimed'
+    count = run_coalesced(db, job_uuid, s3_key, mode)
+    logger.info('Coalesced import of %s jobs with %s', count, job_uuid)
+    return 'ok'
 
 
-@app.task(name='process_import', bind=True)
-def process_import(self, job_id: str) -> str:
+def _process_import(task, job_id: str) -> str:
     job_uuid = parse_job_id(job_id)
     if not job_uuid:
         logger.error('Invalid job id: %s', job_id)
@@ -350,12 +437,26 @@ def process_import(self, job_id: str) -> str:
             logger.error('ImportJob not found: %s', job_id)
             return 'not_found'
 
-        s3_key, mode = meta
+        s3_key, mode, user_id, status, file_size = meta
+        if status != JobStatus.pending:
+            logger.info('ImportJob already claimed: %s', job_id)
+            return 'already_claimed'
 
-        try:
-            run_import(db, job_uuid, s3_key, mode)
-            return 'ok'
-        except Exception as e:
-            mark_failed(db, job_uuid, e)
-            logger.exception('Import failed: %s', job_id)
-            raise
+        with tenant_slot(user_id, job_uuid) as acquired:
+            if not acquired:
+                # у пользователя уже идёт максимум импортов: job уходит
+                # в конец очереди, воркер берёт задачи других пользователей
+                db.rollback()
+                countdown = settings.tenant_defer_seconds * (
+                    1 + random.random())
+                raise task.retry(countdown=countdown, max_retries=None)
+
+            if is_coalescable(mode, file_size):
+                return execute_coalesced(db, job_uuid, s3_key, mode)
+            return execute_import(db, job_uuid, s3_key, mode)
+
+
+@app.task(name='process_import', bind=True)
+def process_import(self, job_id: str) -> str:
+    with task_span('process_import', self.request, job_id=job_id):
+        return _process_import(self, job_id)
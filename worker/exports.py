@@ -0,0 +1,163 @@
+"""Экспорт customers в CSV: COPY TO STDOUT -> (gzip) -> S3 multipart.
+
+Выборка (фильтры как у GET /customers) стримится из Postgres через
+psycopg COPY кусками и сразу уходит в multipart upload: в памяти воркера
+не больше одного part (S3_UPLOAD_PART_BYTES), файл целиком не собирается
+ни в памяти, ни на диске. COPY идёт одним запросом, поэтому файл —
+согласованный снимок таблицы. Порядок строк не задаётся: полный экспорт
+читает таблицу последовательно, без сортировки.
+
+Прогресс (bytes_written, exported_rows) обновляется после каждого part.
+"""
+import uuid
+import zlib
+
+from celery.utils.log import get_task_logger
+from sqlalchemy import select, update
+
+from app.core.config import settings
+from app.core.customer_search import filter_customers
+from app.core.tracing import task_span
+from app.db.session import SessionLocal, get_engine
+from app.models.customer import Customer
+from app.models.export_job import ExportJob
+from app.models.import_job import JobStatus
+from app.storage.s3 import MultipartWriter
+from worker.celery_app import app, parse_job_id
+
+logger = get_task_logger(__name__)
+
+EXPORT_COLUMNS = (
+    Customer.id,
+    Customer.email,
+    Customer.first_name,
+    Customer.last_name,
+    Customer.phone,
+    Customer.city,
+    Customer.created_at,
+    Customer.update_at.label('updated_at'),
+)
+
+
+def export_key(job_uuid: uuid.UUID, gzip: bool) -> str:
+    return f'exports/{job_uuid}.csv' + ('.gz' if gzip else '')
+
+
+def copy_statement(filters: dict) -> tuple[str, dict]:
+    """COPY для выборки; параметры psycopg подставляет на клиенте."""
+    stmt = filter_customers(select(*EXPORT_COLUMNS), **filters)
+    compiled = stmt.compile(dialect=get_engine().dialect)
+    sql = f'COPY ({compiled}) TO STDOUT WITH (FORMAT csv, HEADER true)'
+    return sql, compiled.params
+
+
+class ExportSink:
+    """Принимает куски CSV из COPY, сжимает (gzip) и пишет в S3."""
+
+    def __init__(self, out: MultipartWriter, *, gzip: bool) -> None:
+        self._out = out
+        self._compressor = (
+            zlib.compressobj(settings.export_gzip_level, zlib.DEFLATED, 31)
+            if gzip else None)
+        # строки CSV с переводом строки внутри поля посчитаются дважды:
+        # это только прогресс, итог берётся из rowcount COPY
+        self.lines = 0
+
+    def write(self, chunk: bytes) -> None:
+        self.lines += chunk.count(b'\n')
+        if self._compressor is not None:
+            chunk = self._compressor.compress(chunk)
+        if chunk:
+            self._out.write(chunk)
+
+    def finish(self) -> None:
+        if self._compressor is not None:
+            self._out.write(self._compressor.flush())
+
+    @property
+    def rows(self) -> int:
+        return max(0, self.lines - 1)
+
+
+def _update_export(db, job_uuid: uuid.UUID, **fields) -> None:
+    db.execute(
+        update(ExportJob)
+        .where(ExportJob.id == job_uuid)
+        .values(**fields)
+    )
+    db.commit()
+
+
+def claim_export(db, job_uuid: uuid.UUID) -> bool:
+    """Переводит export job из pending в processing; False — уже взят."""
+    claimed = db.execute(
+        update(ExportJob)
+        .where(ExportJob.id == job_uuid,
+               ExportJob.status == JobStatus.pending)
+        .values(status=JobStatus.processing, error=None)
+        .returning(ExportJob.id)
+    ).scalar_one_or_none()
+    db.commit()
+    return claimed is not None
+
+
+def run_export(db,
+               job_uuid: uuid.UUID,
+               filters: dict,
+               gzip: bool) -> tuple[str, int, int]:
+    """Стримит выборку в S3, возвращает (key, rows, bytes)."""
+    key = export_key(job_uuid, gzip)
+    sql, params = copy_statement(filters)
+    content_type = 'application/gzip' if gzip else 'text/csv'
+
+    with MultipartWriter(key, content_type=content_type) as out:
+        sink = ExportSink(out, gzip=gzip)
+        out.on_part = lambda total: _update_export(
+            db, job_uuid, bytes_written=total, exported_rows=sink.rows)
+        with get_engine().connect() as conn:
+            raw = conn.connection.driver_connection
+            with raw.cursor() as cursor:
+                with cursor.copy(sql, params) as copy:
+                    for chunk in copy:
+                        sink.write(bytes(chunk))
+                rows = cursor.rowcount
+        sink.finish()
+    return key, rows, out.bytes_written
+
+
+def _process_export(job_id: str) -> str:
+    job_uuid = parse_job_id(job_id)
+    if not job_uuid:
+        logger.error('Invalid export id: %s', job_id)
+        return 'bad_id'
+
+    with SessionLocal() as db:
+        job = db.get(ExportJob, job_uuid)
+        if job is None:
+            logger.error('ExportJob not found: %s', job_id)
+            return 'not_found'
+        filters, gzip = job.filters, job.gzip
+        if not claim_export(db, job_uuid):
+            logger.info('ExportJob already claimed: %s', job_id)
+            return 'already_claimed'
+
+        try:
+            key, rows, size = run_export(db, job_uuid, filters, gzip)
+        except Exception as e:
+            db.rollback()
+            _update_export(db, job_uuid, status=JobStatus.failed,
+                           error=f'{type(e).__name__}: {e}')
+            logger.exception('Export failed: %s', job_id)
+            return 'failed'
+
+        _update_export(db, job_uuid, status=JobStatus.done,
+                       object_key=key, exported_rows=rows,
+                       bytes_written=size)
+    logger.info('Exported %s rows (%s bytes) to %s', rows, size, key)
+    return 'ok'
+
+
+@app.task(name='process_export', bind=True)
+def process_export(self, job_id: str) -> str:
+    with task_span('process_export', self.request, job_id=job_id):
+        return _process_export(job_id)
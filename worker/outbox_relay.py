@@ -0,0 +1,109 @@
+"""Relay transactional outbox -> брокер Celery.
+
+Забирает готовые записи task_outbox пачками (FOR UPDATE SKIP LOCKED —
+несколько relay не отправят одно и то же), публикует их через одно
+соединение с брокером и удаляет в той же транзакции. Запись, которую не
+удалось отправить, откладывается с экспоненциальным backoff.
+
+Доставка at-least-once: если relay упадёт после отправки, но до commit,
+задача уйдёт повторно; process_import это переносит (claim_job).
+
+Запуск: python -m worker.outbox_relay
+"""
+import logging
+import time
+from datetime import timedelta
+
+import psycopg
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.engine import make_url
+
+from app.core.celery_client import celery_client
+from app.core.config import settings
+from app.core.outbox import OUTBOX_CHANNEL
+from app.core.tracing import init_tracing, publish_span
+from app.db.session import SessionLocal, init_engine
+from app.models.task_outbox import TaskOutbox
+
+logger = logging.getLogger(__name__)
+
+
+def _backoff(attempts: int) -> timedelta:
+    seconds = min(settings.outbox_retry_max_seconds, 2 ** attempts)
+    return timedelta(seconds=seconds)
+
+
+def relay_batch(db, limit: int) -> int:
+    """Отправляет до limit готовых записей, возвращает число отправленных."""
+    messages = db.execute(
+        select(TaskOutbox)
+        .where(TaskOutbox.available_at <= func.now())
+        .order_by(TaskOutbox.available_at, TaskOutbox.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    ).scalars().all()
+    if not messages:
+        db.rollback()
+        return 0
+
+    sent = []
+    with celery_client.producer_or_acquire() as producer:
+        for message in messages:
+            try:
+                with publish_span(message.headers,
+                                  message.task_name) as headers:
+                    celery_client.send_task(message.task_name,
+                                            args=message.args,
+                                            queue=message.queue,
+                                            headers=headers,
+                                            producer=producer)
+            except Exception as error:
+                logger.warning('Outbox publish failed: %s', message.id,
+                               exc_info=True)
+                db.execute(
+                    update(TaskOutbox)
+                    .where(TaskOutbox.id == message.id)
+                    .values(attempts=TaskOutbox.attempts + 1,
+                            available_at=func.now() + _backoff(
+                                message.attempts),
+                            last_error=f'{type(error).__name__}: {error}')
+                )
+                continue
+            sent.append(message.id)
+
+    if sent:
+        db.execute(delete(TaskOutbox).where(TaskOutbox.id.in_(sent)))
+    db.commit()
+    return len(sent)
+
+
+def _listen_dsn() -> str:
+    url = make_url(settings.database_url).set(drivername='postgresql')
+    return url.render_as_string(hide_password=False)
+
+
+def run_forever() -> None:
+    """Основной цикл: выгребает outbox и ждёт NOTIFY или poll-интервал."""
+    init_engine('worker')
+    init_tracing('bulk-import-outbox-relay')
+    batch_size = settings.outbox_batch_size
+    with psycopg.connect(_listen_dsn(), autocommit=True) as listener:
+        listener.execute(f'LISTEN {OUTBOX_CHANNEL}')
+        while True:
+            try:
+                with SessionLocal() as db:
+                    while relay_batch(db, batch_size) == batch_size:
+                        pass
+            except Exception:
+                logger.exception('Outbox relay iteration failed')
+                time.sleep(settings.outbox_poll_seconds)
+            # просыпаемся по первому NOTIFY или по таймауту: отложенные
+            # записи (available_at в будущем) подбираются опросом
+            for _ in listener.notifies(timeout=settings.outbox_poll_seconds,
+                                       stop_after=1):
+                pass
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    run_forever()
@@ -0,0 +1,172 @@
+"""Retention: удаление старых import job и их объектов в S3.
+
+Периодическая задача gc_expired_imports (Celery beat) пачками по
+GC_BATCH_SIZE удаляет job старше срока хранения для их статуса
+(RETENTION_*_DAYS, 0 — хранить всегда) и объекты, на которые больше
+никто не ссылается: errors.csv с индексом и файлы загрузок. Файл
+загрузки content-addressed и может быть общим для нескольких job, поэтому
+удаляется только вместе с последней ссылкой (под advisory lock ключа,
+см. app.storage.uploads). Объекты удаляются до commit: при ошибке S3
+строки остаются и подберутся следующим запуском.
+
+Отдельно чистятся прямые загрузки (uploads/direct/), для которых так и не
+создали job за DIRECT_UPLOAD_TTL_HOURS, и завершённые export job старше
+RETENTION_EXPORT_DAYS вместе с файлами экспорта.
+"""
+from datetime import datetime, timedelta, timezone
+
+import sqlalchemy as sa
+from celery.utils.log import get_task_logger
+from sqlalchemy import delete, select
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.export_job import ExportJob
+from app.models.import_job import ImportJob, JobStatus
+from app.storage.s3 import DELETE_BATCH, delete_objects, iter_objects
+from app.storage.uploads import lock_upload_key
+from worker.celery_app import app
+
+logger = get_task_logger(__name__)
+
+DIRECT_UPLOADS_PREFIX = 'uploads/direct/'
+
+
+def retention_days() -> dict[JobStatus, int]:
+    """Срок хранения по статусу; незавершённые job не удаляются."""
+    return {
+        JobStatus.done: settings.retention_done_days,
+        JobStatus.failed: settings.retention_failed_days,
+        JobStatus.cancelled: settings.retention_cancelled_days,
+    }
+
+
+def expired_jobs_condition(now: datetime) -> sa.ColumnElement[bool] | None:
+    conditions = [
+        sa.and_(ImportJob.status == status,
+                ImportJob.created_at < now - timedelta(days=days))
+        for status, days in retention_days().items() if days > 0
+    ]
+    return sa.or_(*conditions) if conditions else None
+
+
+def _unreferenced(db, keys: list[str]) -> list[str]:
+    used = set(db.execute(
+        select(ImportJob.s3_key).where(ImportJob.s3_key.in_(keys)).distinct()
+    ).scalars())
+    return [key for key in keys if key not in used]
+
+
+def purge_expired_jobs(db, now: datetime, limit: int) -> tuple[int, int]:
+    """Удаляет до limit просроченных job, возвращает (jobs, objects)."""
+    expired = expired_jobs_condition(now)
+    if expired is None:
+        return 0, 0
+
+    rows = db.execute(
+        select(ImportJob.id,
+               ImportJob.s3_key,
+               ImportJob.error_report_object_key,
+               ImportJob.error_report_index_key)
+        .where(expired)
+        .order_by(ImportJob.created_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if not rows:
+        db.rollback()
+        return 0, 0
+
+    # сортировка — один порядок захвата lock'ов у параллельных GC
+    upload_keys = sorted({row.s3_key for row in rows})
+    for key in upload_keys:
+        lock_upload_key(db, key, shared=False)
+    db.execute(delete(ImportJob).where(
+        ImportJob.id.in_([row.id for row in rows])))
+
+    keys = _unreferenced(db, upload_keys)
+    for row in rows:
+        keys.extend(key for key in (row.error_report_object_key,
+                                    row.error_report_index_key) if key)
+    deleted = delete_objects(keys) if keys else 0
+    db.commit()
+    return len(rows), deleted
+
+
+def purge_expired_exports(db, now: datetime, limit: int) -> tuple[int, int]:
+    """Удаляет до limit старых export job и их файлы."""
+    if settings.retention_export_days <= 0:
+        return 0, 0
+    rows = db.execute(
+        select(ExportJob.id, ExportJob.object_key)
+        .where(ExportJob.status.in_(retention_days()),
+               ExportJob.created_at
+               < now - timedelta(days=settings.retention_export_days))
+        .order_by(ExportJob.created_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if not rows:
+        db.rollback()
+        return 0, 0
+
+    db.execute(delete(ExportJob).where(
+        ExportJob.id.in_([row.id for row in rows])))
+    keys = [row.object_key for row in rows if row.object_key]
+    deleted = delete_objects(keys) if keys else 0
+    db.commit()
+    return len(rows), deleted
+
+
+def _purge_direct_chunk(db, keys: list[str]) -> int:
+    for key in keys:
+        lock_upload_key(db, key, shared=False)
+    stale = _unreferenced(db, keys)
+    deleted = delete_objects(stale) if stale else 0
+    db.commit()
+    return deleted
+
+
+def purge_stale_direct_uploads(db, now: datetime) -> int:
+    """Удаляет прямые загрузки без job старше DIRECT_UPLOAD_TTL_HOURS."""
+    if settings.direct_upload_ttl_hours <= 0:
+        return 0
+    cutoff = now - timedelta(hours=settings.direct_upload_ttl_hours)
+    deleted = 0
+    chunk: list[str] = []
+    for key in iter_objects(DIRECT_UPLOADS_PREFIX, modified_before=cutoff):
+        chunk.append(key)
+        if len(chunk) == DELETE_BATCH:
+            deleted += _purge_direct_chunk(db, sorted(chunk))
+            chunk.clear()
+    if chunk:
+        deleted += _purge_direct_chunk(db, sorted(chunk))
+    return deleted
+
+
+def _purge_batches(db, purge, now: datetime) -> tuple[int, int]:
+    jobs = objects = 0
+    for _ in range(settings.gc_max_batches):
+        purged, deleted = purge(db, now, settings.gc_batch_size)
+        jobs += purged
+        objects += deleted
+        if purged < settings.gc_batch_size:
+            break
+    return jobs, objects
+
+
+@app.task(name='gc_expired_imports')
+def gc_expired_imports() -> dict:
+    """Один проход retention; не больше GC_MAX_BATCHES пачек job."""
+    now = datetime.now(timezone.utc)
+    with SessionLocal() as db:
+        jobs, objects = _purge_batches(db, purge_expired_jobs, now)
+        exports, export_objects = _purge_batches(db, purge_expired_exports,
+                                                 now)
+        direct = purge_stale_direct_uploads(db, now)
+
+    logger.info('GC: %s jobs, %s objects, %s exports, '
+                '%s stale direct uploads',
+                jobs, objects + export_objects, exports, direct)
+    return {'jobs': jobs, 'objects': objects + export_objects,
+            'exports': exports, 'direct_uploads': direct}